@@ -0,0 +1,176 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from data_loader import prepare_data
+from pca_analyzer import fit_standardize, compute_pca, SOLVERS
+from summary import build_summary
+
+
+def find_input_files(source: str, pattern: str = '*.csv'):
+    if os.path.isdir(source):
+        files = glob.glob(os.path.join(source, pattern))
+    else:
+        files = glob.glob(source, recursive=True)
+    return sorted(f for f in files if os.path.isfile(f))
+
+
+def summary_names(files):
+    names = {}
+    seen = {}
+    for filepath in files:
+        stem = Path(filepath).stem
+        count = seen.get(stem, 0)
+        seen[stem] = count + 1
+        names[filepath] = f"{stem}.json" if count == 0 else f"{stem}-{count}.json"
+    return names
+
+
+def analyze_file(filepath: str, summary_path: str, n_components=None, solver: str = 'auto') -> dict:
+    timings = {}
+    start = time.perf_counter()
+    
+    try:
+        stage = time.perf_counter()
+        numeric_df, label_col, _ = prepare_data(filepath)
+        timings['load'] = time.perf_counter() - stage
+        
+        stage = time.perf_counter()
+        _, standardized_data = fit_standardize(numeric_df)
+        timings['standardize'] = time.perf_counter() - stage
+        
+        stage = time.perf_counter()
+        pca, _ = compute_pca(standardized_data, n_components, solver)
+        timings['pca'] = time.perf_counter() - stage
+        
+        timings['total'] = time.perf_counter() - start
+        summary = build_summary(filepath, numeric_df.columns.tolist(), label_col, len(numeric_df),
+                                pca, pca.svd_solver, timings)
+    except Exception as e:
+        timings['total'] = time.perf_counter() - start
+        summary = {
+            'file': filepath,
+            'status': 'error',
+            'error': f"{type(e).__name__}: {e}",
+            'traceback': traceback.format_exc(),
+            'timings': timings,
+        }
+    
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    
+    return summary
+
+
+def run_batch(files, output_dir: str, n_components=None, solver: str = 'auto', workers=None) -> dict:
+    os.makedirs(output_dir, exist_ok=True)
+    names = summary_names(files)
+    start = time.perf_counter()
+    entries = []
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(analyze_file, filepath, os.path.join(output_dir, names[filepath]),
+                            n_components, solver): filepath
+            for filepath in files
+        }
+        for future in as_completed(futures):
+            filepath = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                summary = {'file': filepath, 'status': 'error', 'error': f"{type(e).__name__}: {e}",
+                           'timings': {}}
+            
+            entries.append({
+                'file': filepath,
+                'summary': names[filepath],
+                'status': summary['status'],
+                'error': summary.get('error'),
+                'seconds': summary['timings'].get('total'),
+            })
+            print(f"[{summary['status']:>5}] {filepath}")
+    
+    entries.sort(key=lambda entry: entry['file'])
+    index = {
+        'files': len(entries),
+        'succeeded': sum(entry['status'] == 'ok' for entry in entries),
+        'failed': sum(entry['status'] != 'ok' for entry in entries),
+        'wall_seconds': time.perf_counter() - start,
+        'entries': entries,
+    }
+    
+    with open(os.path.join(output_dir, 'index.json'), 'w') as f:
+        json.dump(index, f, indent=2)
+    
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PCA Dashboard batch mode: summarize many CSV files in parallel',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python batch_dashboard.py data/ --output outputs/batch
+  python batch_dashboard.py "drops/2024-*/*.csv" --components 10 --workers 8
+        """
+    )
+    
+    parser.add_argument('source',
+                       type=str,
+                       help='Directory of CSV files or a glob pattern (quote it to stop shell expansion)')
+    
+    parser.add_argument('--pattern',
+                       type=str,
+                       default='*.csv',
+                       help='File pattern used when source is a directory (default: *.csv)')
+    
+    parser.add_argument('--output', '-o',
+                       type=str,
+                       default='outputs/batch',
+                       help='Directory for per-file JSON summaries and index.json')
+    
+    parser.add_argument('--components', '-n',
+                       type=int,
+                       default=None,
+                       help='Number of principal components to retain (default: all)')
+    
+    parser.add_argument('--solver',
+                       type=str,
+                       choices=SOLVERS,
+                       default='auto',
+                       help='PCA solver (default: auto, chosen from data shape and --components)')
+    
+    parser.add_argument('--workers', '-j',
+                       type=int,
+                       default=None,
+                       help='Worker processes (default: number of CPUs)')
+    
+    args = parser.parse_args()
+    
+    files = find_input_files(args.source, args.pattern)
+    if not files:
+        print(f"Error: No input files found for {args.source}")
+        sys.exit(1)
+    
+    print(f"Processing {len(files)} files...")
+    index = run_batch(files, args.output, args.components, args.solver, args.workers)
+    
+    print(f"\n{index['succeeded']} succeeded, {index['failed']} failed in {index['wall_seconds']:.2f}s")
+    print(f"Index written to {os.path.join(args.output, 'index.json')}")
+    
+    if index['failed']:
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
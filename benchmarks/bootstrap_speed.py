@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+
+DEFAULT_OUTPUT = 'outputs/benchmarks/bootstrap_speed.json'
+
+
+def refit_ratios(data: np.ndarray, n_resamples: int, seed: int = 0) -> np.ndarray:
+    from pca_analyzer import standardize_data, compute_pca
+    
+    rng = np.random.default_rng(seed)
+    ratios = []
+    for _ in range(n_resamples):
+        sample = data[rng.integers(0, len(data), len(data))]
+        pca, _ = compute_pca(standardize_data(sample))
+        ratios.append(pca.explained_variance_ratio_)
+    return np.array(ratios)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare bootstrap intervals from block reweighting against per-resample PCA refits',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/bootstrap_speed.py
+  python benchmarks/bootstrap_speed.py --rows 500000 --features 50 --resamples 500 --refits 20
+        """
+    )
+    
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--features', type=int, default=30)
+    parser.add_argument('--resamples', type=int, default=200)
+    parser.add_argument('--refits', type=int, default=20,
+                       help='Full refits timed for the baseline; the cost is extrapolated to --resamples')
+    parser.add_argument('--output', '-o', type=str, default=DEFAULT_OUTPUT,
+                       help=f'Write results as JSON to this path (default: {DEFAULT_OUTPUT})')
+    
+    args = parser.parse_args()
+    
+    from bootstrap import bootstrap_variance
+    
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((args.rows, args.features)) @ rng.standard_normal((args.features, args.features))
+    
+    start = time.perf_counter()
+    bootstrap = bootstrap_variance(data, args.resamples)
+    vectorized_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    refit = refit_ratios(data, args.refits)
+    refit_seconds = (time.perf_counter() - start) * args.resamples / args.refits
+    
+    refit_interval = np.quantile(refit, [0.025, 0.975], axis=0)
+    width_ratio = float(np.median((bootstrap['ratio_interval'][1] - bootstrap['ratio_interval'][0]) /
+                                  (refit_interval[1] - refit_interval[0])))
+    
+    print(f"Block reweighting: {vectorized_seconds:8.3f} s for {args.resamples} resamples ({bootstrap['n_blocks']} blocks)")
+    print(f"Full refits:       {refit_seconds:8.3f} s (extrapolated from {args.refits})")
+    print(f"Speedup: {refit_seconds / vectorized_seconds:.1f}x, median interval width ratio: {width_ratio:.2f}")
+    
+    results = {
+        'rows': args.rows,
+        'features': args.features,
+        'resamples': args.resamples,
+        'n_blocks': bootstrap['n_blocks'],
+        'cpu_count': os.cpu_count(),
+        'vectorized_seconds': vectorized_seconds,
+        'refit_seconds': refit_seconds,
+        'interval_width_ratio': width_ratio,
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+
+DEFAULT_OUTPUT = 'outputs/benchmarks/component_selection.json'
+
+
+def naive_fold_seconds(data: np.ndarray, folds: list, ks: list) -> float:
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+    
+    held_out = folds[0]
+    train = np.ones(len(data), dtype=bool)
+    train[held_out] = False
+    scaler = StandardScaler().fit(data[train])
+    standardized_train = scaler.transform(data[train])
+    standardized_test = scaler.transform(data[held_out])
+    
+    start = time.perf_counter()
+    for k in ks:
+        pca = PCA(n_components=k, svd_solver='full').fit(standardized_train)
+        pca.inverse_transform(pca.transform(standardized_test))
+    return (time.perf_counter() - start) / len(ks)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Time cross-validated component selection against refitting PCA for every k and fold',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/component_selection.py
+  python benchmarks/component_selection.py --rows 100000 --features 2000 --rank 40 --max-components 300
+        """
+    )
+    
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--features', type=int, default=500)
+    parser.add_argument('--rank', type=int, default=20,
+                       help='Rank of the planted signal; the recommended k should match it')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--max-components', '-k', type=int, default=None)
+    parser.add_argument('--refits', type=int, default=3,
+                       help='PCA refits timed for the naive baseline; the cost is extrapolated to every k and fold')
+    parser.add_argument('--output', '-o', type=str, default=DEFAULT_OUTPUT,
+                       help=f'Write results as JSON to this path (default: {DEFAULT_OUTPUT})')
+    
+    args = parser.parse_args()
+    
+    from component_selection import cross_validate_components, fold_indices
+    
+    rng = np.random.default_rng(0)
+    signal = rng.standard_normal((args.rows, args.rank)) @ rng.standard_normal((args.rank, args.features))
+    data = signal + rng.standard_normal((args.rows, args.features)) * rng.uniform(0.5, 2.0, args.features)
+    
+    start = time.perf_counter()
+    selection = cross_validate_components(data, args.max_components, args.folds)
+    sweep_seconds = time.perf_counter() - start
+    
+    max_components = selection['max_components']
+    ks = list(np.linspace(1, max_components, args.refits).astype(int))
+    naive_seconds = naive_fold_seconds(data, fold_indices(len(data), args.folds), ks) * max_components * args.folds
+    
+    print(f"One sweep per fold: {sweep_seconds:8.2f} s for k = 1..{max_components} over {args.folds} folds")
+    print(f"Refit per k:        {naive_seconds:8.2f} s (extrapolated from {args.refits} refits)")
+    print(f"Speedup: {naive_seconds / sweep_seconds:.0f}x, recommended k = {selection['recommended']} "
+          f"(planted rank {args.rank})")
+    
+    results = {
+        'rows': args.rows,
+        'features': args.features,
+        'rank': args.rank,
+        'folds': args.folds,
+        'max_components': max_components,
+        'cpu_count': os.cpu_count(),
+        'sweep_seconds': sweep_seconds,
+        'naive_seconds': naive_seconds,
+        'recommended': selection['recommended'],
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+from create_sample_data import create_synthetic_dataset
+from profiling import peak_rss_mb
+
+
+ENGINES = ('auto', 'c', 'pyarrow')
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+DEFAULT_SIZES = ['100000x50', '500000x100']
+DEFAULT_OUTPUT = 'outputs/benchmarks/csv_engines.json'
+
+
+def parse_size(size: str):
+    rows, _, features = size.lower().partition('x')
+    return int(rows), int(features)
+
+
+def compress(path: str, compression: str) -> str:
+    if compression == 'none':
+        return path
+    if compression == 'gzip':
+        target = path + '.gz'
+        if not os.path.exists(target):
+            with open(path, 'rb') as src, gzip.open(target, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst)
+        return target
+    
+    import zstandard
+    target = path + '.zst'
+    if not os.path.exists(target):
+        with open(path, 'rb') as src, open(target, 'wb') as dst:
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+    return target
+
+
+def available_compressions(requested):
+    compressions = []
+    for compression in requested:
+        if compression == 'zstd':
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                print("Skipping zstd: the zstandard package is not installed")
+                continue
+        compressions.append(compression)
+    return compressions
+
+
+def run_load(path: str, engine: str, dtype: str) -> dict:
+    from data_loader import load_numeric_matrix
+    
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    data, _, _, _ = load_numeric_matrix(path, np.dtype(dtype), engine)
+    return {
+        'seconds': time.perf_counter() - start,
+        'peak_rss_mb': peak_rss_mb() - baseline,
+        'checksum': float(np.asarray(data, dtype=np.float64).sum()),
+    }
+
+
+def measure(path: str, engine: str, dtype: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        command = [sys.executable, __file__, '--run-file', path, '--run-engine', engine, '--dtype', dtype]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    
+    return {
+        'seconds': min(run['seconds'] for run in runs),
+        'peak_rss_mb': max(run['peak_rss_mb'] for run in runs),
+        'checksum': runs[0]['checksum'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare time and peak memory of the CSV parse engines on plain and compressed synthetic datasets',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/csv_engines.py
+  python benchmarks/csv_engines.py --sizes 1000000x100 --compressions none gzip --data-dir data/bench
+  python benchmarks/csv_engines.py --sizes 400000x100 --compressions none --dtype float32
+        """
+    )
+    
+    parser.add_argument('--sizes', type=str, nargs='+', default=DEFAULT_SIZES,
+                       help='ROWSxFEATURES grid (default: %s)' % ' '.join(DEFAULT_SIZES))
+    parser.add_argument('--engines', type=str, nargs='+', choices=ENGINES, default=list(ENGINES))
+    parser.add_argument('--compressions', type=str, nargs='+', choices=COMPRESSIONS, default=list(COMPRESSIONS))
+    parser.add_argument('--dtype', type=str, choices=['float64', 'float32'], default='float64',
+                       help='Matrix dtype passed to the loader (default: float64)')
+    parser.add_argument('--repeat', '-r', type=int, default=1,
+                       help='Runs per case; the fastest time and largest memory are kept')
+    parser.add_argument('--data-dir', type=str, default=None,
+                       help='Keep generated datasets here and reuse them (default: temporary directory)')
+    parser.add_argument('--output', '-o', type=str, default=DEFAULT_OUTPUT,
+                       help=f'Write results as JSON to this path (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--run-file', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--run-engine', type=str, default=None, help=argparse.SUPPRESS)
+    
+    args = parser.parse_args()
+    
+    if args.run_file:
+        print(json.dumps(run_load(args.run_file, args.run_engine, args.dtype)))
+        return
+    
+    compressions = available_compressions(args.compressions)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+        
+        cases = []
+        for size in args.sizes:
+            rows, features = parse_size(size)
+            path = os.path.join(data_dir, f"synthetic_{rows}x{features}.csv")
+            if not os.path.exists(path):
+                create_synthetic_dataset(rows, features, output_path=path)
+            
+            print(f"\n{rows} x {features}")
+            for compression in compressions:
+                source = compress(path, compression)
+                file_mb = os.path.getsize(source) / 1024 ** 2
+                for engine in args.engines:
+                    case = {
+                        'rows': rows,
+                        'features': features,
+                        'compression': compression,
+                        'engine': engine,
+                        'dtype': args.dtype,
+                        'file_mb': file_mb,
+                        **measure(source, engine, args.dtype, args.repeat),
+                    }
+                    cases.append(case)
+                    print(f"  {compression:<5} {file_mb:8.1f} MB  {engine:<8} {case['seconds']:8.3f} s  "
+                          f"+{case['peak_rss_mb']:8.1f} MB")
+                
+                checksums = [case['checksum'] for case in cases[-len(args.engines):]]
+                if not np.allclose(checksums, checksums[0], rtol=1e-9):
+                    print(f"  warning: engines disagree on {os.path.basename(source)}: {checksums}")
+    
+    results = {'cpu_count': os.cpu_count(), 'cases': cases}
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from sharded_scaling import worker_grid
+
+
+DEFAULT_OUTPUT = 'outputs/benchmarks/grouped_scaling.json'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure how per-group PCA fitting scales from 1 to N worker processes',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/grouped_scaling.py
+  python benchmarks/grouped_scaling.py --rows 2000000 --features 100 --groups 200 --max-workers 32
+        """
+    )
+    
+    parser.add_argument('--rows', type=int, default=400_000)
+    parser.add_argument('--features', type=int, default=50)
+    parser.add_argument('--groups', type=int, default=200)
+    parser.add_argument('--components', '-n', type=int, default=None)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+                       help='Runs per worker count; the fastest is kept')
+    parser.add_argument('--output', '-o', type=str, default=DEFAULT_OUTPUT,
+                       help=f'Write results as JSON to this path (default: {DEFAULT_OUTPUT})')
+    
+    args = parser.parse_args()
+    
+    from grouped_pca import compute_pca_grouped
+    
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((args.rows, args.features)) @ rng.standard_normal((args.features, args.features))
+    labels = rng.integers(0, args.groups, args.rows)
+    
+    runs = []
+    for workers in worker_grid(args.max_workers):
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            compute_pca_grouped(data, labels, args.components, workers=workers)
+            best = min(best, time.perf_counter() - start)
+        
+        speedup = runs[0]['seconds'] / best if runs else 1.0
+        runs.append({'workers': workers, 'seconds': best, 'speedup': speedup, 'efficiency': speedup / workers})
+        print(f"{workers:>3} workers: {best:8.3f} s  speedup {speedup:5.2f}x  efficiency {speedup / workers:4.0%}")
+    
+    results = {
+        'rows': args.rows,
+        'features': args.features,
+        'groups': args.groups,
+        'cpu_count': os.cpu_count(),
+        'runs': runs,
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+
+DEFAULT_OUTPUT = 'outputs/benchmarks/kernel_approximation.json'
+
+
+def make_data(n_samples: int, noise_features: int, seed: int = 0) -> np.ndarray:
+    from sklearn.datasets import make_swiss_roll
+    
+    rng = np.random.default_rng(seed)
+    roll, _ = make_swiss_roll(n_samples, noise=0.1, random_state=seed)
+    data = np.hstack([roll, rng.standard_normal((n_samples, noise_features)) * 0.3])
+    return (data - data.mean(axis=0)) / data.std(axis=0)
+
+
+def exact_kernel_pca(data: np.ndarray, n_components: int, kernel: str, gamma: float):
+    from sklearn.metrics.pairwise import pairwise_kernels
+    
+    kernel_matrix = pairwise_kernels(data, metric=kernel, gamma=gamma)
+    row_means = kernel_matrix.mean(axis=0)
+    kernel_matrix -= row_means[None, :]
+    kernel_matrix -= row_means[:, None]
+    kernel_matrix += row_means.mean()
+    
+    eigenvalues, eigenvectors = np.linalg.eigh(kernel_matrix)
+    eigenvalues = np.maximum(eigenvalues[::-1], 0.0)
+    scores = eigenvectors[:, ::-1][:, :n_components] * np.sqrt(eigenvalues[:n_components])
+    return eigenvalues[:n_components] / eigenvalues.sum(), scores
+
+
+def subspace_similarity(scores: np.ndarray, approximate: np.ndarray) -> float:
+    q_exact, _ = np.linalg.qr(scores - scores.mean(axis=0))
+    q_approximate, _ = np.linalg.qr(approximate - approximate.mean(axis=0))
+    return float(np.mean(np.square(np.linalg.svd(q_exact.T @ q_approximate, compute_uv=False))))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare Nystroem and random Fourier kernel PCA against exact kernel PCA on subsamples',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/kernel_approximation.py
+  python benchmarks/kernel_approximation.py --subsamples 2000 8000 --ranks 200 1000 --rows 1000000
+        """
+    )
+    
+    parser.add_argument('--subsamples', type=int, nargs='+', default=[1000, 2000, 4000],
+                       help='Row counts on which exact kernel PCA is run')
+    parser.add_argument('--ranks', type=int, nargs='+', default=[100, 300, 1000])
+    parser.add_argument('--rows', type=int, default=200_000,
+                       help='Row count for the approximation-only timing run')
+    parser.add_argument('--noise-features', type=int, default=7)
+    parser.add_argument('--components', '-n', type=int, default=5)
+    parser.add_argument('--kernel', type=str, default='rbf')
+    parser.add_argument('--output', '-o', type=str, default=DEFAULT_OUTPUT,
+                       help=f'Write results as JSON to this path (default: {DEFAULT_OUTPUT})')
+    
+    args = parser.parse_args()
+    
+    from pca_analyzer import compute_pca_kernel
+    
+    full = make_data(max(args.rows, max(args.subsamples)), args.noise_features)
+    gamma = 1.0 / full.shape[1]
+    methods = ['nystroem', 'fourier'] if args.kernel == 'rbf' else ['nystroem']
+    
+    comparisons = []
+    for n_samples in args.subsamples:
+        data = full[:n_samples]
+        start = time.perf_counter()
+        exact_ratio, exact_scores = exact_kernel_pca(data, args.components, args.kernel, gamma)
+        exact_seconds = time.perf_counter() - start
+        print(f"n={n_samples}: exact {exact_seconds:7.3f} s, kernel matrix {n_samples ** 2 * 8 / 1024 ** 2:7.1f} MB")
+        
+        for method in methods:
+            for rank in args.ranks:
+                start = time.perf_counter()
+                _, pca, transformed = compute_pca_kernel(data, args.components, method, rank, args.kernel, gamma)
+                seconds = time.perf_counter() - start
+                ratio_error = float(np.max(np.abs(pca.explained_variance_ratio_ - exact_ratio)))
+                similarity = subspace_similarity(exact_scores, transformed)
+                comparisons.append({'rows': n_samples, 'method': method, 'rank': rank, 'seconds': seconds,
+                                    'exact_seconds': exact_seconds, 'max_ratio_error': ratio_error,
+                                    'subspace_similarity': similarity})
+                print(f"  {method:>9} rank {rank:5d}: {seconds:7.3f} s  max ratio error {ratio_error:.4f}  "
+                      f"subspace similarity {similarity:.4f}")
+    
+    scaling = []
+    for n_samples in (args.rows // 4, args.rows // 2, args.rows):
+        for method in methods:
+            start = time.perf_counter()
+            compute_pca_kernel(full[:n_samples], args.components, method, max(args.ranks), args.kernel, gamma)
+            seconds = time.perf_counter() - start
+            scaling.append({'rows': n_samples, 'method': method, 'rank': max(args.ranks), 'seconds': seconds})
+            print(f"n={n_samples} {method:>9} rank {max(args.ranks)}: {seconds:7.3f} s "
+                  f"(exact would need {n_samples ** 2 * 8 / 1024 ** 3:,.0f} GB for the kernel matrix)")
+    
+    results = {
+        'kernel': args.kernel,
+        'gamma': gamma,
+        'components': args.components,
+        'cpu_count': os.cpu_count(),
+        'comparisons': comparisons,
+        'scaling': scaling,
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+from create_sample_data import create_synthetic_dataset, spectrum_path
+from profiling import peak_rss_mb
+
+
+STAGES = ('load', 'standardize', 'pca', 'visualize')
+DEFAULT_SIZES = ['10000x50', '100000x50', '100000x200', '300000x100']
+DEFAULT_OUTPUT = 'outputs/benchmarks/pipeline_stages.json'
+
+
+def parse_size(size: str):
+    rows, _, features = size.lower().partition('x')
+    return int(rows), int(features)
+
+
+def environment() -> dict:
+    import pandas
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pandas.__version__,
+        'scikit-learn': sklearn.__version__,
+    }
+
+
+def run_stages(path: str, stages) -> dict:
+    from data_loader import prepare_data
+    from pca_analyzer import standardize_data, compute_pca, get_variance_metrics
+    
+    timings = {}
+    baseline = peak_rss_mb()
+    
+    def timed(stage, func, *args):
+        before = peak_rss_mb()
+        start = time.perf_counter()
+        value = func(*args)
+        after = peak_rss_mb()
+        timings[stage] = {
+            'seconds': time.perf_counter() - start,
+            'peak_rss_mb': after - baseline,
+            'rss_growth_mb': after - before,
+        }
+        return value
+    
+    numeric_df, label_col, df = timed('load', prepare_data, path)
+    standardized_data = timed('standardize', standardize_data, numeric_df)
+    pca, transformed_data = timed('pca', compute_pca, standardized_data)
+    
+    with open(spectrum_path(path)) as f:
+        truth = np.array(json.load(f)['explained_variance_ratio'])
+    explained_variance_ratio, cumulative_variance = get_variance_metrics(pca)
+    
+    if 'visualize' in stages:
+        import matplotlib
+        matplotlib.use('Agg')
+        from visualizer import render_dashboard
+        
+        results = {
+            'transformed_data': transformed_data,
+            'explained_variance_ratio': explained_variance_ratio,
+            'cumulative_variance': cumulative_variance,
+            'n_components': pca.n_components_,
+            'labels': df[label_col].values if label_col else None,
+            'label_column': label_col,
+        }
+        with tempfile.TemporaryDirectory() as save_dir:
+            timed('visualize', render_dashboard, results, save_dir, None, 'auto', None,
+                  100, 'png', 1)
+    
+    return {
+        'stages': {stage: timings[stage] for stage in stages if stage in timings},
+        'max_abs_ratio_error': float(np.abs(explained_variance_ratio - truth).max()),
+    }
+
+
+def ensure_dataset(data_dir: str, rows: int, features: int, classes: int, sparsity: float) -> str:
+    path = os.path.join(data_dir, f"synthetic_{rows}x{features}_c{classes}_s{sparsity:g}.csv")
+    if not (os.path.exists(path) and os.path.exists(spectrum_path(path))):
+        create_synthetic_dataset(rows, features, classes, sparsity=sparsity, output_path=path)
+    return path
+
+
+def measure(path: str, stages, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        command = [sys.executable, __file__, '--run-file', path, '--stages', *stages]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    
+    stage_results = {}
+    for stage in runs[0]['stages']:
+        stage_results[stage] = {
+            'seconds': min(run['stages'][stage]['seconds'] for run in runs),
+            'peak_rss_mb': max(run['stages'][stage]['peak_rss_mb'] for run in runs),
+            'rss_growth_mb': max(run['stages'][stage]['rss_growth_mb'] for run in runs),
+        }
+    return {'stages': stage_results, 'max_abs_ratio_error': runs[0]['max_abs_ratio_error']}
+
+
+def case_key(case: dict) -> tuple:
+    return case['rows'], case['features'], case['classes'], case['sparsity']
+
+
+def find_regressions(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float,
+                     min_seconds: float = 0.05, min_mb: float = 10.0) -> list:
+    reference = {case_key(case): case for case in baseline['cases']}
+    regressions = []
+    
+    for case in results['cases']:
+        previous = reference.get(case_key(case))
+        if previous is None:
+            continue
+        for stage, current in case['stages'].items():
+            before = previous['stages'].get(stage)
+            if before is None:
+                continue
+            checks = [
+                ('seconds', time_tolerance, min_seconds),
+                ('rss_growth_mb', memory_tolerance, min_mb),
+            ]
+            for metric, tolerance, floor in checks:
+                if current[metric] > before[metric] * (1 + tolerance) and current[metric] - before[metric] > floor:
+                    regressions.append({
+                        'rows': case['rows'],
+                        'features': case['features'],
+                        'stage': stage,
+                        'metric': metric,
+                        'baseline': before[metric],
+                        'current': current[metric],
+                        'change': current[metric] / before[metric] - 1 if before[metric] else float('inf'),
+                    })
+    
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Time and memory-profile each pipeline stage over a grid of synthetic dataset sizes',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/pipeline_stages.py --save-baseline benchmarks/baseline.json
+  python benchmarks/pipeline_stages.py --baseline benchmarks/baseline.json
+  python benchmarks/pipeline_stages.py --sizes 1000000x100 2000000x50 --stages load standardize pca --data-dir data/bench
+        """
+    )
+    
+    parser.add_argument('--sizes', type=str, nargs='+', default=DEFAULT_SIZES,
+                       help='ROWSxFEATURES grid (default: %s)' % ' '.join(DEFAULT_SIZES))
+    parser.add_argument('--classes', type=int, default=3)
+    parser.add_argument('--sparsity', type=float, default=0.0)
+    parser.add_argument('--stages', type=str, nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--repeat', '-r', type=int, default=1,
+                       help='Runs per size; the fastest time and largest memory are kept')
+    parser.add_argument('--data-dir', type=str, default=None,
+                       help='Keep generated datasets here and reuse them (default: temporary directory)')
+    parser.add_argument('--output', '-o', type=str, default=DEFAULT_OUTPUT,
+                       help=f'Write results as JSON to this path (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--baseline', type=str, default=None,
+                       help='Compare against a saved results file and exit 1 on regressions')
+    parser.add_argument('--save-baseline', type=str, default=None,
+                       help='Also write the results to this baseline path')
+    parser.add_argument('--time-tolerance', type=float, default=0.25,
+                       help='Allowed relative slowdown per stage (default: 0.25)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.20,
+                       help='Allowed relative memory growth per stage (default: 0.20)')
+    parser.add_argument('--run-file', type=str, default=None, help=argparse.SUPPRESS)
+    
+    args = parser.parse_args()
+    
+    if args.run_file:
+        print(json.dumps(run_stages(args.run_file, args.stages)))
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+        
+        cases = []
+        for size in args.sizes:
+            rows, features = parse_size(size)
+            path = ensure_dataset(data_dir, rows, features, args.classes, args.sparsity)
+            case = {
+                'rows': rows,
+                'features': features,
+                'classes': args.classes,
+                'sparsity': args.sparsity,
+                'file_mb': os.path.getsize(path) / 1024 ** 2,
+                **measure(path, args.stages, args.repeat),
+            }
+            cases.append(case)
+            
+            print(f"\n{rows} x {features} ({case['file_mb']:.1f} MB CSV, "
+                  f"max |ratio error| vs ground truth {case['max_abs_ratio_error']:.1e})")
+            for stage, result in case['stages'].items():
+                print(f"  {stage:<12} {result['seconds']:8.3f} s  +{result['rss_growth_mb']:8.1f} MB  "
+                      f"(peak +{result['peak_rss_mb']:.1f} MB)")
+    
+    results = {'environment': environment(), 'cases': cases}
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.time_tolerance, args.memory_tolerance)
+        
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for r in regressions:
+                print(f"  {r['rows']} x {r['features']} {r['stage']}: {r['metric']} "
+                      f"{r['baseline']:.3f} -> {r['current']:.3f} ({r['change']:+.0%})")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from profiling import peak_rss_mb
+from defaults import CSV_ENGINES
+
+
+MODES = ('baseline', 'float64', 'float32')
+
+
+def write_dataset(path: str, n_rows: int, n_features: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_latent = min(10, n_features)
+    latent = rng.normal(size=(n_rows, n_latent)) * np.linspace(6, 1, n_latent)
+    data = latent @ rng.normal(size=(n_latent, n_features)) + rng.normal(size=(n_rows, n_features)) * 0.5 + 10
+    df = pd.DataFrame(data, columns=[f'feature_{i+1}' for i in range(n_features)])
+    df['category'] = rng.choice(['A', 'B', 'C'], n_rows)
+    df['notes'] = 'free text ' + pd.Series(rng.integers(0, 10 ** 6, n_rows)).astype(str)
+    df.to_csv(path, index=False)
+
+
+def run_mode(mode: str, path: str, engine: str) -> dict:
+    from data_loader import load_data, prepare_data_from_dataframe, load_numeric_matrix
+    from pca_analyzer import standardize_data, fit_standardize, compute_pca
+    
+    baseline = peak_rss_mb()
+    if mode == 'baseline':
+        numeric_df, _, _ = prepare_data_from_dataframe(load_data(path))
+        pca, _ = compute_pca(standardize_data(numeric_df))
+    else:
+        data, _, _, _ = load_numeric_matrix(path, np.dtype(mode), engine)
+        _, standardized_data = fit_standardize(data, copy=False)
+        pca, _ = compute_pca(standardized_data, copy=False)
+    
+    return {
+        'mode': mode,
+        'engine': engine,
+        'peak_rss_over_startup_mb': peak_rss_mb() - baseline,
+        'explained_variance_ratio': pca.explained_variance_ratio_.astype(float).tolist(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare peak memory and explained-variance accuracy of the float64/float32 pipelines'
+    )
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--features', type=int, default=100)
+    parser.add_argument('--data', type=str, default=None,
+                       help='Existing CSV to use instead of generating one')
+    parser.add_argument('--engine', choices=CSV_ENGINES, default='auto',
+                       help='CSV parse engine for the float64/float32 loads (default: auto, as in dashboard.py)')
+    parser.add_argument('--output', '-o', type=str, default=None,
+                       help='Write results as JSON to this path')
+    parser.add_argument('--run-mode', choices=MODES, default=None, help=argparse.SUPPRESS)
+    
+    args = parser.parse_args()
+    
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode, args.data, args.engine)))
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.data
+        if path is None:
+            path = os.path.join(tmp, 'data.csv')
+            print(f"Generating {args.rows} x {args.features} dataset...")
+            write_dataset(path, args.rows, args.features)
+        
+        results = {}
+        for mode in MODES:
+            output = subprocess.run([sys.executable, __file__, '--run-mode', mode, '--data', path,
+                                     '--engine', args.engine],
+                                    check=True, capture_output=True, text=True).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+    
+    reference = np.array(results['baseline']['explained_variance_ratio'])
+    for mode in MODES:
+        ratios = np.array(results[mode]['explained_variance_ratio'])
+        results[mode]['max_abs_ratio_error'] = float(np.abs(ratios - reference).max())
+        results[mode]['max_abs_cumulative_error'] = float(np.abs(np.cumsum(ratios) - np.cumsum(reference)).max())
+        print(f"{mode:>9}: peak RSS +{results[mode]['peak_rss_over_startup_mb']:8.1f} MB  "
+              f"max |ratio error| {results[mode]['max_abs_ratio_error']:.2e}  "
+              f"max |cumulative error| {results[mode]['max_abs_cumulative_error']:.2e}")
+    
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
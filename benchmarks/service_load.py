@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from model_io import load_model
+
+
+async def _request(reader, writer, host: str, method: str, path: str, body: bytes = b''):
+    head = (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+    writer.write(head.encode('latin1') + body)
+    await writer.drain()
+    
+    status = (await reader.readline()).decode('latin1')
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    payload = await reader.readexactly(length)
+    return int(status.split(' ')[1]), payload
+
+
+async def wait_until_ready(host: str, port: int, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            status, _ = await _request(reader, writer, host, 'GET', '/health')
+            writer.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"Service on {host}:{port} did not become ready")
+        await asyncio.sleep(0.1)
+
+
+async def client(host: str, port: int, bodies, latencies: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            status, payload = await _request(reader, writer, host, 'POST', '/project', body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"Request failed with {status}: {payload[:200]!r}")
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, n_features: int, concurrency: int, requests: int,
+                   rows_per_request: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    bodies = [json.dumps({'rows': rng.normal(size=(rows_per_request, n_features)).tolist()}).encode()
+              for _ in range(min(requests, 64))]
+    per_client = [[bodies[(c + i) % len(bodies)] for i in range(requests)] for c in range(concurrency)]
+    
+    await wait_until_ready(host, port)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, work, latencies) for work in per_client))
+    elapsed = time.perf_counter() - start
+    
+    latencies_ms = np.array(latencies) * 1000
+    total_rows = concurrency * requests * rows_per_request
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'rows_per_request': rows_per_request,
+        'seconds': elapsed,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'requests_per_s': len(latencies) / elapsed,
+        'rows_per_s': total_rows / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load generator for "pca_model.py serve": reports p50/p99 latency and rows/s',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/service_load.py --model outputs/model.npz
+  python benchmarks/service_load.py --model outputs/model.npz --concurrency 1 8 64 --rows-per-request 1
+  python benchmarks/service_load.py --model outputs/model.npz --no-spawn --port 8000
+        """
+    )
+    
+    parser.add_argument('--model', '-m', type=str, required=True,
+                       help='Model artifact (used for the feature count and to spawn the service)')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', '-p', type=int, default=8765)
+    parser.add_argument('--no-spawn', action='store_true',
+                       help='Benchmark an already running service instead of starting one')
+    parser.add_argument('--concurrency', '-c', type=int, nargs='+', default=[1, 16, 64],
+                       help='Concurrent keep-alive connections; one run per value')
+    parser.add_argument('--requests', '-r', type=int, default=200,
+                       help='Requests per connection')
+    parser.add_argument('--rows-per-request', type=int, default=1)
+    parser.add_argument('--max-batch-rows', type=int, default=None)
+    parser.add_argument('--max-latency-ms', type=float, default=None)
+    parser.add_argument('--output', '-o', type=str, default=None,
+                       help='Write results as JSON to this path')
+    
+    args = parser.parse_args()
+    n_features = len(load_model(args.model)['feature_names'])
+    
+    server = None
+    if not args.no_spawn:
+        command = [sys.executable, str(ROOT / 'pca_model.py'), 'serve', '--model', args.model,
+                   '--host', args.host, '--port', str(args.port)]
+        if args.max_batch_rows:
+            command += ['--max-batch-rows', str(args.max_batch_rows)]
+        if args.max_latency_ms is not None:
+            command += ['--max-latency-ms', str(args.max_latency_ms)]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    
+    try:
+        results = []
+        for concurrency in args.concurrency:
+            result = asyncio.run(run_load(args.host, args.port, n_features, concurrency,
+                                          args.requests, args.rows_per_request))
+            results.append(result)
+            print(f"concurrency={concurrency:4d}  p50={result['p50_ms']:8.2f} ms  "
+                  f"p99={result['p99_ms']:8.2f} ms  {result['requests_per_s']:10,.0f} req/s  "
+                  f"{result['rows_per_s']:12,.0f} rows/s")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+from create_sample_data import create_synthetic_dataset
+
+
+DEFAULT_OUTPUT = 'outputs/benchmarks/sharded_scaling.json'
+
+
+def worker_grid(max_workers: int):
+    grid = [1]
+    while grid[-1] * 2 <= max_workers:
+        grid.append(grid[-1] * 2)
+    if grid[-1] != max_workers:
+        grid.append(max_workers)
+    return grid
+
+
+def write_shards(data_dir: str, rows: int, features: int, shards: int):
+    paths = []
+    for i in range(shards):
+        path = os.path.join(data_dir, f"shard_{rows}x{features}_{i:03d}.csv")
+        if not os.path.exists(path):
+            create_synthetic_dataset(rows // shards, features, seed=i, output_path=path)
+        paths.append(path)
+    return paths
+
+
+def time_fit(fit, repeat: int):
+    from pca_analyzer import compute_pca_from_covariance
+    
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        covariance = fit()
+        _, pca = compute_pca_from_covariance(covariance)
+        best = min(best, time.perf_counter() - start)
+    return best, pca.explained_variance_ratio_
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure how the sharded statistics fit scales from 1 to N worker processes',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/sharded_scaling.py
+  python benchmarks/sharded_scaling.py --rows 4000000 --features 200 --max-workers 32
+  python benchmarks/sharded_scaling.py --shards 32 --data-dir data/bench
+        """
+    )
+    
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--features', type=int, default=100)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--shards', type=int, default=None,
+                       help='Fit from this many generated shard files instead of one in-memory matrix')
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+                       help='Runs per worker count; the fastest is kept')
+    parser.add_argument('--data-dir', type=str, default=None,
+                       help='Keep generated shard files here and reuse them (default: temporary directory)')
+    parser.add_argument('--output', '-o', type=str, default=DEFAULT_OUTPUT,
+                       help=f'Write results as JSON to this path (default: {DEFAULT_OUTPUT})')
+    
+    args = parser.parse_args()
+    
+    from sharded_pca import fit_covariance_parallel, fit_covariance_shards
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.shards:
+            paths = write_shards(args.data_dir or tmp, args.rows, args.features, args.shards)
+            feature_names = [f'feature_{i+1}' for i in range(args.features)]
+            make_fit = lambda workers: lambda: fit_covariance_shards(paths, feature_names, workers)
+        else:
+            rng = np.random.default_rng(0)
+            data = rng.standard_normal((args.rows, args.features)) @ rng.standard_normal((args.features, args.features))
+            make_fit = lambda workers: lambda: fit_covariance_parallel(data, workers)
+        
+        runs = []
+        reference = None
+        for workers in worker_grid(args.max_workers):
+            seconds, ratios = time_fit(make_fit(workers), args.repeat)
+            reference = ratios if reference is None else reference
+            runs.append({
+                'workers': workers,
+                'seconds': seconds,
+                'speedup': runs[0]['seconds'] / seconds if runs else 1.0,
+                'max_abs_ratio_error': float(np.abs(ratios - reference).max()),
+            })
+            runs[-1]['efficiency'] = runs[-1]['speedup'] / workers
+            print(f"{workers:>3} workers: {seconds:8.3f} s  speedup {runs[-1]['speedup']:5.2f}x  "
+                  f"efficiency {runs[-1]['efficiency']:4.0%}  max |ratio diff| {runs[-1]['max_abs_ratio_error']:.1e}")
+    
+    results = {
+        'rows': args.rows,
+        'features': args.features,
+        'shards': args.shards,
+        'cpu_count': os.cpu_count(),
+        'runs': runs,
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DASHBOARD = str(ROOT / 'dashboard.py')
+DEFAULT_DATA = str(ROOT / 'data' / 'sample_data.csv')
+DEFAULT_OUTPUT = 'outputs/benchmarks/startup_time.json'
+PLOTTING_MODULES = ('matplotlib', 'plotly')
+
+
+def path_commands(data_file: str, save_dir: str) -> dict:
+    common = [DASHBOARD, data_file, '--no-cache']
+    return {
+        'summary_only': common + ['--summary-only'],
+        'full': common + ['--no-display', '--save', save_dir, '--render-workers', '1'],
+    }
+
+
+def imported_modules(command) -> dict:
+    result = subprocess.run([sys.executable, '-X', 'importtime', *command],
+                            check=True, capture_output=True, text=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative_us, name = [field.strip() for field in line[len('import time:'):].split('|')]
+        if cumulative_us.isdigit() and '.' not in name:
+            cumulative[name] = int(cumulative_us) / 1e6
+    return cumulative
+
+
+def time_command(command, repeat: int) -> list:
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *command], check=True, capture_output=True)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare process wall time and top-level imports of the summary-only and full dashboard paths',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/startup_time.py
+  python benchmarks/startup_time.py --data data/small.csv --repeat 20
+        """
+    )
+    parser.add_argument('--data', type=str, default=DEFAULT_DATA,
+                       help='CSV to run the dashboard on (default: the bundled sample)')
+    parser.add_argument('--repeat', '-r', type=int, default=10,
+                       help='Fresh processes per path (default: 10)')
+    parser.add_argument('--output', '-o', type=str, default=DEFAULT_OUTPUT,
+                       help=f'Write results as JSON to this path (default: {DEFAULT_OUTPUT})')
+    
+    args = parser.parse_args()
+    
+    results = {'data': args.data, 'repeat': args.repeat, 'paths': {}}
+    with tempfile.TemporaryDirectory() as save_dir:
+        for name, command in path_commands(args.data, save_dir).items():
+            seconds = time_command(command, args.repeat)
+            modules = imported_modules(command)
+            top_level = dict(sorted(modules.items(), key=lambda item: item[1], reverse=True)[:10])
+            results['paths'][name] = {
+                'min_seconds': min(seconds),
+                'median_seconds': statistics.median(seconds),
+                'plotting_imported': any(module in modules for module in PLOTTING_MODULES),
+                'slowest_imports_seconds': top_level,
+            }
+            
+            entry = results['paths'][name]
+            print(f"{name:>12}: min {entry['min_seconds']:.3f} s  median {entry['median_seconds']:.3f} s  "
+                  f"plotting imported: {'yes' if entry['plotting_imported'] else 'no'}")
+            for module, cumulative in top_level.items():
+                print(f"{'':>14}{module:<20} {cumulative:.3f} s")
+    
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,13 @@
+import argparse
+import json
 import numpy as np
 import pandas as pd
 import os
 
 
+SYNTHETIC_CHUNKSIZE = 50_000
+
+
 def create_sample_dataset(n_samples=200, n_features=10, n_classes=3, output_path='data/sample_data.csv'):
     np.random.seed(42)
     
@@ -46,5 +51,138 @@ def create_sample_dataset(n_samples=200, n_features=10, n_classes=3, output_path
     return df
 
 
+def spectrum_path(output_path: str) -> str:
+    return os.path.splitext(output_path)[0] + '.spectrum.json'
+
+
+def latent_structure(n_features: int, rank: int, signal: float, decay: float, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    loadings, _ = np.linalg.qr(rng.standard_normal((n_features, rank)))
+    latent_scale = signal * decay ** np.arange(rank)
+    return loadings.T, latent_scale
+
+
+def ground_truth_spectrum(loadings: np.ndarray, latent_scale: np.ndarray, noise: float,
+                          n_classes: int, class_separation: float, sparsity: float) -> np.ndarray:
+    latent_variance = latent_scale ** 2
+    latent_variance[0] += class_separation ** 2 * (n_classes ** 2 - 1) / 12
+    latent_mean = np.zeros(len(latent_scale))
+    latent_mean[0] = class_separation * (n_classes - 1) / 2
+    
+    covariance = (loadings.T * latent_variance) @ loadings
+    covariance[np.diag_indices_from(covariance)] += noise ** 2
+    mean = latent_mean @ loadings
+    
+    keep = 1.0 - sparsity
+    masked = keep ** 2 * covariance
+    masked[np.diag_indices_from(masked)] += keep * (1 - keep) * (np.diag(covariance) + mean ** 2)
+    
+    std = np.sqrt(np.diag(masked))
+    eigenvalues = np.linalg.eigvalsh(masked / np.outer(std, std))[::-1]
+    return np.maximum(eigenvalues, 0.0) / len(eigenvalues)
+
+
+def create_synthetic_dataset(n_samples: int, n_features: int, n_classes: int = 3, rank: int = 10,
+                             sparsity: float = 0.0, noise: float = 0.5, signal: float = 5.0,
+                             decay: float = 0.8, class_separation: float = 1.0, seed: int = 0,
+                             output_path: str = 'data/synthetic_data.csv',
+                             chunksize: int = SYNTHETIC_CHUNKSIZE) -> dict:
+    if not 0.0 <= sparsity < 1.0:
+        raise ValueError("sparsity must be in [0, 1)")
+    rank = min(rank, n_features)
+    
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    loadings, latent_scale = latent_structure(n_features, rank, signal, decay, seed)
+    columns = [f'feature_{i+1}' for i in range(n_features)]
+    class_names = np.array([f'Class_{i+1}' for i in range(n_classes)])
+    rng = np.random.default_rng(seed + 1)
+    
+    with open(output_path, 'w', newline='') as f:
+        f.write(','.join(columns + ['category']) + '\n')
+        for start in range(0, n_samples, chunksize):
+            n_rows = min(chunksize, n_samples - start)
+            classes = rng.integers(0, n_classes, n_rows)
+            
+            latent = rng.standard_normal((n_rows, rank)) * latent_scale
+            latent[:, 0] += classes * class_separation
+            block = latent @ loadings
+            block += rng.standard_normal((n_rows, n_features)) * noise
+            if sparsity:
+                block[rng.random((n_rows, n_features)) < sparsity] = 0.0
+            
+            df = pd.DataFrame(block, columns=columns)
+            df['category'] = class_names[classes]
+            df.to_csv(f, header=False, index=False, float_format='%.6g')
+    
+    spectrum = {
+        'file': output_path,
+        'rows': n_samples,
+        'features': n_features,
+        'classes': n_classes,
+        'rank': rank,
+        'sparsity': sparsity,
+        'noise': noise,
+        'signal': signal,
+        'decay': decay,
+        'class_separation': class_separation,
+        'seed': seed,
+        'explained_variance_ratio': ground_truth_spectrum(
+            loadings, latent_scale, noise, n_classes, class_separation, sparsity
+        ).tolist(),
+    }
+    with open(spectrum_path(output_path), 'w') as f:
+        json.dump(spectrum, f, indent=2)
+    
+    print(f"Synthetic dataset created: {output_path}")
+    print(f"  - Samples: {n_samples}")
+    print(f"  - Features: {n_features} (rank {rank} signal, sparsity {sparsity:.0%})")
+    print(f"  - Categories: {n_classes}")
+    print(f"  - Ground-truth spectrum: {spectrum_path(output_path)}")
+    
+    return spectrum
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Create the sample dataset, or a synthetic dataset of any size with a known spectrum',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python create_sample_data.py
+  python create_sample_data.py --rows 1000000 --features 200 --output data/large_data.csv
+  python create_sample_data.py --rows 100000 --features 500 --sparsity 0.9 --classes 50 --rank 20
+        """
+    )
+    
+    parser.add_argument('--rows', type=int, default=None,
+                       help='Generate a synthetic dataset with this many rows (default: the 200-row sample)')
+    parser.add_argument('--features', type=int, default=100,
+                       help='Number of numeric features (default: 100)')
+    parser.add_argument('--classes', type=int, default=3,
+                       help='Label cardinality (default: 3; above 20 the dashboard ignores the label)')
+    parser.add_argument('--rank', type=int, default=10,
+                       help='Number of latent signal directions (default: 10)')
+    parser.add_argument('--sparsity', type=float, default=0.0,
+                       help='Fraction of entries set to zero (default: 0)')
+    parser.add_argument('--noise', type=float, default=0.5,
+                       help='Standard deviation of isotropic noise (default: 0.5)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunksize', type=int, default=SYNTHETIC_CHUNKSIZE,
+                       help=f'Rows generated and written per block (default: {SYNTHETIC_CHUNKSIZE})')
+    parser.add_argument('--output', '-o', type=str, default=None,
+                       help='Output CSV (default: data/sample_data.csv or data/synthetic_data.csv)')
+    
+    args = parser.parse_args()
+    
+    if args.rows is None:
+        create_sample_dataset(output_path=args.output or 'data/sample_data.csv')
+    else:
+        create_synthetic_dataset(args.rows, args.features, args.classes, args.rank, args.sparsity,
+                                 args.noise, seed=args.seed, chunksize=args.chunksize,
+                                 output_path=args.output or 'data/synthetic_data.csv')
+
+
 if __name__ == '__main__':
-    create_sample_dataset()
+    main()
@@ -1,44 +1,339 @@
 import argparse
+import json
 import sys
 import os
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from data_loader import prepare_data
-from pca_analyzer import standardize_data, compute_pca, get_variance_metrics
-from visualizer import create_dashboard
-import matplotlib.pyplot as plt
+from defaults import (DEFAULT_CHUNKSIZE, CSV_ENGINES, SOLVERS, SCATTER_MODES, DEFAULT_DPI, DEFAULT_FORMAT,
+                      DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES, KERNELS, KERNEL_APPROXIMATIONS,
+                      DEFAULT_KERNEL_RANK)
+from profiling import Profiler, NULL_PROFILER
+import numpy as np
 
 
 def print_summary(results: dict):
+    from pca_analyzer import components_for_variance
+    
     print("\n" + "="*60)
     print("PCA ANALYSIS SUMMARY")
     print("="*60)
     print(f"Original features: {len(results['feature_names'])}")
     print(f"Principal components: {results['n_components']}")
+    print(f"PCA solver: {results['solver']}")
     print(f"Label column: {results['label_column'] if results['label_column'] else 'None found'}")
     print("\nTop 10 Components - Explained Variance:")
     print("-" * 60)
     
+    bootstrap = results.get('bootstrap')
+    if bootstrap:
+        print(f"Bootstrap: {bootstrap['n_resamples']} resamples, {bootstrap['confidence']:.0%} percentile intervals")
+    
     top_n = min(10, results['n_components'])
     for i in range(top_n):
         var_pct = results['explained_variance_ratio'][i] * 100
         cum_var_pct = results['cumulative_variance'][i] * 100
-        print(f"PC{i+1:2d}: {var_pct:6.2f}% (Cumulative: {cum_var_pct:6.2f}%)")
+        interval = ""
+        if bootstrap:
+            low, high = bootstrap['ratio_interval'][:, i] * 100
+            interval = f" [{low:6.2f}%, {high:6.2f}%]"
+        print(f"PC{i+1:2d}: {var_pct:6.2f}%{interval} (Cumulative: {cum_var_pct:6.2f}%)")
     
-    cum_var = results['cumulative_variance']
-    idx_80 = next((i for i, v in enumerate(cum_var) if v >= 0.80), None)
-    idx_95 = next((i for i, v in enumerate(cum_var) if v >= 0.95), None)
+    comps_80 = components_for_variance(results['cumulative_variance'], 0.80)
+    comps_95 = components_for_variance(results['cumulative_variance'], 0.95)
     
     print("\n" + "-" * 60)
-    if idx_80 is not None:
-        print(f"Components needed for 80% variance: {idx_80 + 1}")
-    if idx_95 is not None:
-        print(f"Components needed for 95% variance: {idx_95 + 1}")
+    for threshold, comps in ((0.80, comps_80), (0.95, comps_95)):
+        if comps is None:
+            continue
+        interval = ""
+        if bootstrap:
+            low, high = bootstrap['count_intervals'][threshold]
+            interval = f" ({bootstrap['confidence']:.0%} CI: {low}-{high})"
+        print(f"Components needed for {threshold:.0%} variance: {comps}{interval}")
+    
+    selection = results.get('selection')
+    if selection:
+        k = selection['recommended']
+        print(f"Cross-validated components ({selection['n_folds']}-fold PRESS, k <= {selection['max_components']}): {k} "
+              f"(held-out error {selection['press'][k - 1]:.4f})")
     print("="*60 + "\n")
 
 
+def run_out_of_core(data_file: str, chunksize: int, n_components=None, dtype=np.float64,
+                    profiler: Profiler = NULL_PROFILER):
+    from data_loader import sniff_columns, iter_numeric_chunks, surviving_features
+    from pca_analyzer import fit_scaler_streaming, compute_pca_incremental, select_features
+    
+    feature_names, label_col = sniff_columns(data_file)
+    dropped = []
+    
+    def blocks():
+        chunks = iter_numeric_chunks(data_file, chunksize, feature_names, label_col, dtype, dropped)
+        return (block for block, _ in chunks)
+    
+    print("Computing streaming mean/variance (pass 1)...")
+    with profiler.span('moments') as span:
+        scaler = fit_scaler_streaming(blocks())
+        span['rows'] = int(scaler.n_samples_seen_)
+    if dropped:
+        keep = surviving_features(feature_names, dropped)
+        scaler = select_features(scaler, keep)
+        feature_names = [feature_names[j] for j in keep]
+    
+    print(f"Fitting incremental PCA (pass 2){' with ' + str(n_components) + ' components' if n_components else ''}...")
+    with profiler.span('pca', rows=int(scaler.n_samples_seen_)):
+        pca = compute_pca_incremental(blocks(), scaler, n_components)
+    
+    print("Projecting data onto the plotted components (pass 3)...")
+    n_samples = int(scaler.n_samples_seen_)
+    components = pca.components_[:min(2, pca.n_components_)].T
+    offset = pca.mean_ @ components
+    transformed_data = np.empty((n_samples, components.shape[1]), dtype=dtype)
+    labels = None
+    with profiler.span('project', rows=n_samples):
+        start = 0
+        for block, block_labels in iter_numeric_chunks(data_file, chunksize, feature_names, label_col, dtype):
+            stop = start + len(block)
+            transformed_data[start:stop] = scaler.transform(block) @ components - offset
+            if block_labels is not None:
+                if labels is None:
+                    labels = np.empty(n_samples, dtype=block_labels.dtype)
+                labels[start:stop] = block_labels
+            start = stop
+    
+    return scaler, pca, transformed_data, feature_names, label_col, labels
+
+
+def load_mode(args) -> str:
+    return 'chunked' if args.chunksize else 'full'
+
+
+def load_numeric_data(args, file_hash=None, read_only: bool = False):
+    from data_loader import (prepare_data_chunked, collect_chunks, count_rows, drop_columns, load_numeric_matrix,
+                             detect_format)
+    from cache import load_data_cached, store_data, evict_lru
+    
+    dtype = np.dtype(args.dtype)
+    mmap_mode = 'r' if read_only else 'c'
+    loader = load_mode(args)
+    if file_hash:
+        cached = load_data_cached(args.cache_dir, file_hash, dtype, loader, mmap_mode)
+        if cached is not None:
+            data, labels, feature_names, label_col = cached
+            print(f"Loaded {len(data)} rows with {len(feature_names)} numeric features from cache")
+            return data, labels, feature_names, label_col
+    
+    if args.chunksize:
+        dropped = []
+        chunks, label_col, feature_names = prepare_data_chunked(args.data_file, args.chunksize, dtype, dropped)
+        data, labels = collect_chunks(chunks, count_rows(args.data_file))
+        data, feature_names = drop_columns(data, feature_names, dropped)
+    else:
+        data, labels, feature_names, label_col = load_numeric_matrix(args.data_file, dtype, args.engine, mmap_mode)
+    print(f"Loaded {len(data)} rows with {len(feature_names)} numeric features")
+    
+    if file_hash and detect_format(args.data_file) != 'npy':
+        max_bytes = args.cache_max_mb * 1024 ** 2
+        if store_data(args.cache_dir, file_hash, data, labels, feature_names, label_col, loader, max_bytes):
+            evict_lru(args.cache_dir, max_bytes)
+            if read_only:
+                cached = load_data_cached(args.cache_dir, file_hash, dtype, loader, mmap_mode)
+                data = cached[0] if cached is not None else data
+    
+    return data, labels, feature_names, label_col
+
+
+def fit_pipeline(args, file_hash=None, profiler: Profiler = NULL_PROFILER):
+    from data_loader import is_sparse_input, load_sparse
+    from pca_analyzer import fit_standardize, compute_pca, compute_pca_sparse
+    
+    if is_sparse_input(args.data_file):
+        if args.kernel:
+            raise ValueError("--kernel needs a dense input")
+        print("Loading sparse data...")
+        with profiler.span('load') as span:
+            data, feature_names = load_sparse(args.data_file)
+            span['rows'] = data.shape[0]
+        density = data.nnz / max(data.shape[0] * data.shape[1], 1)
+        print(f"Loaded {data.shape[0]} rows with {data.shape[1]} features ({density:.2%} non-zero)")
+        
+        print(f"Applying sparse PCA with implicit standardization{' (' + str(args.components) + ' components)' if args.components else ''}...")
+        with profiler.span('pca', rows=data.shape[0]):
+            scaler, pca, transformed_data = compute_pca_sparse(data, args.components)
+        return scaler, pca, transformed_data, feature_names, None, None, None, 'sparse_arpack'
+    
+    if args.out_of_core:
+        print("Loading data out-of-core...")
+        scaler, pca, transformed_data, feature_names, label_col, labels = run_out_of_core(
+            args.data_file, args.chunksize or DEFAULT_CHUNKSIZE, args.components, np.dtype(args.dtype),
+            profiler
+        )
+        print(f"Processed {int(scaler.n_samples_seen_)} rows with {len(feature_names)} numeric features")
+        return scaler, pca, transformed_data, feature_names, label_col, labels, None, 'incremental'
+    
+    print("Loading data...")
+    with profiler.span('load') as span:
+        data, labels, feature_names, label_col = load_numeric_data(args, file_hash, read_only=bool(args.workers))
+        span['rows'] = len(data)
+    
+    if args.workers:
+        from sharded_pca import compute_pca_sharded
+        
+        print(f"Applying PCA from per-shard statistics over {args.workers} worker processes...")
+        with profiler.span('pca', rows=len(data)):
+            scaler, pca, transformed_data = compute_pca_sharded(data, args.components, args.workers)
+        return scaler, pca, transformed_data, feature_names, label_col, labels, data, 'sharded_eigh'
+    
+    print(f"Standardizing data in place ({data.dtype})...")
+    with profiler.span('standardize', rows=len(data)):
+        scaler, standardized_data = fit_standardize(data, copy=False)
+    
+    if args.kernel:
+        from pca_analyzer import compute_pca_kernel
+        
+        print(f"Applying {args.kernel} kernel PCA on a rank-{args.kernel_rank} {args.kernel_approximation} approximation...")
+        with profiler.span('pca', rows=len(data)):
+            _, pca, transformed_data = compute_pca_kernel(standardized_data, args.components,
+                                                          args.kernel_approximation, args.kernel_rank,
+                                                          args.kernel, args.gamma)
+        return scaler, pca, transformed_data, feature_names, label_col, labels, None, f'kernel_{pca.kernel_approximation_}'
+    
+    print(f"Applying PCA{' with ' + str(args.components) + ' components' if args.components else ''}...")
+    with profiler.span('pca', rows=len(data)):
+        pca, transformed_data = compute_pca(standardized_data, args.components, args.solver, copy=False)
+    
+    return scaler, pca, transformed_data, feature_names, label_col, labels, standardized_data, pca.svd_solver
+
+
+def print_group_summary(group_col: str, groups: list):
+    from pca_analyzer import components_for_variance
+    
+    print("\n" + "="*78)
+    print(f"PER-GROUP PCA SUMMARY ({group_col}, {len(groups)} groups)")
+    print("="*78)
+    print(f"{'Group':<24}{'Rows':>10}{'PC1':>9}{'PC2':>9}{'PC3':>9}{'80%':>6}{'95%':>6}  Solver")
+    print("-" * 78)
+    
+    for group in groups:
+        pca = group['pca']
+        if pca is None:
+            print(f"{str(group['group'])[:23]:<24}{group['rows']:>10}  (too few rows)")
+            continue
+        ratios = [f"{ratio * 100:8.2f}%" for ratio in pca.explained_variance_ratio_[:3]]
+        ratios += [f"{'-':>9}"] * (3 - len(ratios))
+        cumulative_variance = np.cumsum(pca.explained_variance_ratio_)
+        counts = [components_for_variance(cumulative_variance, threshold) for threshold in (0.80, 0.95)]
+        counts = [f"{count if count is not None else '-':>6}" for count in counts]
+        print(f"{str(group['group'])[:23]:<24}{group['rows']:>10}{''.join(ratios)}{''.join(counts)}  {pca.svd_solver}")
+    print("="*78 + "\n")
+
+
+def run_grouped(args, profiler: Profiler = NULL_PROFILER):
+    from data_loader import is_sparse_input, read_column
+    from pca_analyzer import fit_standardize
+    from grouped_pca import compute_pca_grouped
+    
+    if is_sparse_input(args.data_file) or args.out_of_core:
+        raise ValueError("--group-by needs an in-memory dense fit; drop --out-of-core or use a dense input")
+    
+    file_hash = None
+    if not args.no_cache:
+        from cache import hash_file
+        file_hash = hash_file(args.data_file)
+    
+    print("Loading data...")
+    with profiler.span('load') as span:
+        data, labels, feature_names, label_col = load_numeric_data(args, file_hash)
+        span['rows'] = len(data)
+    
+    group_col = args.group_by or label_col
+    if not group_col:
+        raise ValueError("No label column found to group by; pass --group-by COLUMN")
+    if group_col != label_col:
+        labels = read_column(args.data_file, group_col, args.engine).to_numpy()
+    
+    print(f"Standardizing data in place ({data.dtype})...")
+    with profiler.span('standardize', rows=len(data)):
+        _, standardized_data = fit_standardize(data, copy=False)
+    
+    print(f"Fitting one PCA per {group_col} value in parallel...")
+    with profiler.span('grouped_pca', rows=len(data)):
+        groups = compute_pca_grouped(standardized_data, labels, args.components, args.solver, args.workers)
+    
+    print_group_summary(group_col, groups)
+    
+    if args.summary_json:
+        from summary import build_summary
+        
+        summaries = []
+        for group in groups:
+            if group['pca'] is None:
+                summary = {'rows': group['rows'], 'status': 'too_few_rows'}
+            else:
+                summary = build_summary(args.data_file, feature_names, label_col, group['rows'],
+                                        group['pca'], group['pca'].svd_solver)
+            summaries.append({'group': str(group['group']), **summary})
+        
+        write_summary_json(args.summary_json, {'file': args.data_file, 'group_column': group_col,
+                                               'groups': summaries})
+    
+    write_profile(args, profiler)
+    print("Analysis complete!")
+
+
+def write_summary_json(path: str, summary: dict):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"Summary written to {path}")
+
+
+def render_results(args, results: dict, profiler: Profiler):
+    import matplotlib.pyplot as plt
+    from visualizer import create_dashboard, render_dashboard
+    
+    n_show = args.show_components if args.show_components else results['n_components']
+    transformed_data = results['transformed_data']
+    
+    if args.no_display:
+        if args.save:
+            print("Rendering figures...")
+            plt.switch_backend('Agg')
+            with profiler.span('render', rows=len(transformed_data)):
+                render_dashboard(results, args.save, n_components_to_show=n_show,
+                                 scatter_mode=args.scatter_mode, scatter_max_points=args.scatter_sample,
+                                 dpi=args.dpi, fmt=args.format, workers=args.render_workers)
+            print(f"Figures saved to {args.save}/")
+        write_profile(args, profiler)
+        print("Analysis complete!")
+    else:
+        print("Creating visualizations...")
+        with profiler.span('render', rows=len(transformed_data)):
+            figs = create_dashboard(results, n_components_to_show=n_show, save_dir=args.save,
+                                    scatter_mode=args.scatter_mode, scatter_max_points=args.scatter_sample,
+                                    dpi=args.dpi, fmt=args.format)
+        
+        if args.save:
+            print(f"Figures saved to {args.save}/")
+        write_profile(args, profiler)
+        
+        print("Displaying plots...")
+        plt.show()
+
+
+def write_profile(args, profiler: Profiler):
+    if args.profile:
+        profiler.write_json(args.profile)
+        print(f"Stage profile written to {args.profile}")
+    if args.cprofile:
+        stage = profiler.dump_hottest(args.cprofile)
+        if stage:
+            print(f"cProfile of slowest stage ({stage}) written to {args.cprofile}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='PCA Dashboard: Dimensionality Reduction and Variance Analysis',
@@ -48,18 +343,84 @@ Examples:
   python dashboard.py data/sample_data.csv
   python dashboard.py data/sample_data.csv --components 5
   python dashboard.py data/sample_data.csv --components 10 --save outputs/
+  python dashboard.py data/sample_data.csv --components 2 --solver randomized
+  python dashboard.py data/large_data.csv --chunksize 100000 --no-display
+  python dashboard.py data/large_data.csv.gz --engine pyarrow --no-display
+  python dashboard.py data/large_data.csv --out-of-core --components 10 --save outputs/ --no-display
+  python dashboard.py data/sample_data.csv --cache-dir /tmp/pca_cache
+  python dashboard.py data/sample_data.csv --no-cache
+  python dashboard.py data/counts.npz --components 20 --save outputs/ --no-display
+  python dashboard.py data/large_data.csv --workers 16 --components 10 --save outputs/ --no-display
+  python dashboard.py data/large_data.csv --dtype float32 --memory-report --no-display
+  python dashboard.py data/large_data.csv --no-display --profile outputs/profile.json --cprofile outputs/slowest.prof
+  python dashboard.py data/large_data.csv --scatter-mode density --save outputs/ --no-display
+  python dashboard.py data/sample_data.csv --save outputs/ --no-display --format svg --dpi 150
+  python dashboard.py data/sample_data.csv --summary-only --summary-json outputs/summary.json
+  python dashboard.py data/sites.csv --group-by site --workers 32 --components 5
+  python dashboard.py data/daily_sample.csv --bootstrap 500 --confidence 0.9 --summary-only
+  python dashboard.py data/wide.csv --select-components --cv-max-components 200 --no-display
+  python dashboard.py data/sample_data.csv --select-components --no-display
+  python dashboard.py data/sensors.csv --kernel rbf --kernel-rank 1000 --components 5 --no-display --save outputs/
         """
     )
     
     parser.add_argument('data_file', 
                        type=str,
-                       help='Path to CSV file containing numeric features')
+                       help='Path to a CSV (optionally gzip/zstd-compressed), Parquet, Feather/Arrow or .npy file '
+                            'containing numeric features, or a sparse matrix (.npz, .mtx, or a CSV of row,col,value triples)')
     
     parser.add_argument('--components', '-n',
                        type=int,
                        default=None,
                        help='Number of principal components to retain (default: all)')
     
+    parser.add_argument('--select-components',
+                       action='store_true',
+                       help='Pick the number of components by k-fold cross-validation of the held-out '
+                            'reconstruction error (PRESS); used as --components when that is not given')
+    
+    parser.add_argument('--cv-folds',
+                       type=int,
+                       default=5,
+                       help='Folds for --select-components (default: 5)')
+    
+    parser.add_argument('--cv-max-components',
+                       type=int,
+                       default=None,
+                       metavar='K',
+                       help='Evaluate k = 1..K in --select-components (default: every k up to features - 1)')
+    
+    parser.add_argument('--summary-only',
+                       action='store_true',
+                       help='Print the variance summary and exit without importing any plotting library')
+    
+    parser.add_argument('--summary-json',
+                       type=str,
+                       default=None,
+                       metavar='JSON',
+                       help='Also write the variance summary to this JSON file')
+    
+    parser.add_argument('--group-by',
+                       type=str,
+                       nargs='?',
+                       const='',
+                       default=None,
+                       metavar='COLUMN',
+                       help='Fit a separate PCA per value of COLUMN (default: the detected label column) '
+                            'in parallel and print per-group variance metrics instead of the dashboard')
+    
+    parser.add_argument('--bootstrap',
+                       type=int,
+                       default=None,
+                       metavar='N',
+                       help='Estimate percentile confidence intervals for each variance ratio and the 80%%/95%% '
+                            'component counts from N bootstrap resamples')
+    
+    parser.add_argument('--confidence',
+                       type=float,
+                       default=0.95,
+                       help='Confidence level of the bootstrap intervals (default: 0.95)')
+    
     parser.add_argument('--show-components', '-s',
                        type=int,
                        default=None,
@@ -74,58 +435,278 @@ Examples:
                        action='store_true',
                        help='Do not display plots interactively (useful when saving)')
     
+    parser.add_argument('--dpi',
+                       type=int,
+                       default=DEFAULT_DPI,
+                       help=f'Resolution of saved figures (default: {DEFAULT_DPI})')
+    
+    parser.add_argument('--format',
+                       type=str,
+                       choices=['png', 'svg', 'pdf', 'jpg'],
+                       default=DEFAULT_FORMAT,
+                       help=f'File format of saved figures (default: {DEFAULT_FORMAT})')
+    
+    parser.add_argument('--render-workers',
+                       type=int,
+                       default=None,
+                       help='Worker processes for headless figure rendering with --no-display (default: one per figure)')
+    
+    parser.add_argument('--scatter-mode',
+                       type=str,
+                       choices=SCATTER_MODES,
+                       default='auto',
+                       help='Scatter rendering: individual markers, fast rasterized markers, or binned '
+                            'density per label (default: auto, chosen from row count)')
+    
+    parser.add_argument('--scatter-sample',
+                       type=int,
+                       default=None,
+                       help='Plot at most this many points, sampled per label so rare categories are kept')
+    
+    parser.add_argument('--solver',
+                       type=str,
+                       choices=SOLVERS,
+                       default='auto',
+                       help='PCA solver (default: auto, chosen from data shape and --components)')
+    
+    parser.add_argument('--kernel',
+                       type=str,
+                       choices=KERNELS,
+                       default=None,
+                       help='Approximate kernel PCA with this kernel on the standardized features '
+                            '(default: linear PCA; 10 components unless --components is given)')
+    
+    parser.add_argument('--kernel-approximation',
+                       type=str,
+                       choices=KERNEL_APPROXIMATIONS,
+                       default='nystroem',
+                       help='Nystroem landmarks or random Fourier features (rbf only) (default: nystroem)')
+    
+    parser.add_argument('--kernel-rank',
+                       type=int,
+                       default=DEFAULT_KERNEL_RANK,
+                       help=f'Landmarks or random features of the kernel approximation (default: {DEFAULT_KERNEL_RANK})')
+    
+    parser.add_argument('--gamma',
+                       type=float,
+                       default=None,
+                       help='Kernel coefficient for rbf, laplacian and poly (default: 1 / number of features)')
+    
+    parser.add_argument('--workers',
+                       type=int,
+                       default=None,
+                       help='Fit PCA from per-shard mean/cross-product statistics computed by this many '
+                            'processes over shared memory (default: single-process solver); with --group-by, '
+                            'the processes fitting groups (default: one per CPU)')
+    
+    parser.add_argument('--dtype',
+                       type=str,
+                       choices=['float64', 'float32'],
+                       default='float64',
+                       help='Precision used from parsing through PCA (default: float64)')
+    
+    parser.add_argument('--memory-report',
+                       action='store_true',
+                       help='Print wall/CPU time and peak resident memory after each stage')
+    
+    parser.add_argument('--profile',
+                       type=str,
+                       default=None,
+                       metavar='JSON',
+                       help='Write per-stage wall time, CPU time, peak RSS and rows/s to this JSON file')
+    
+    parser.add_argument('--cprofile',
+                       type=str,
+                       default=None,
+                       metavar='PROF',
+                       help='Run every stage under cProfile and dump the slowest one to this .prof file')
+    
+    parser.add_argument('--engine',
+                       type=str,
+                       choices=CSV_ENGINES,
+                       default='auto',
+                       help='CSV parser for full reads: multithreaded pyarrow or the single-threaded C parser '
+                            '(default: auto, pyarrow when installed). gzip/zstd/bz2/xz input is decompressed '
+                            'transparently; --chunksize and --out-of-core always stream with the C parser')
+    
+    parser.add_argument('--chunksize',
+                       type=int,
+                       default=None,
+                       help='Stream the CSV in blocks of this many rows, keeping only numeric and label columns')
+    
+    parser.add_argument('--out-of-core',
+                       action='store_true',
+                       help='Standardize and fit PCA from streamed blocks without holding the full matrix '
+                            f'(default chunksize: {DEFAULT_CHUNKSIZE})')
+    
+    parser.add_argument('--cache-dir',
+                       type=str,
+                       default=DEFAULT_CACHE_DIR,
+                       help=f'Directory for cached parsed data and fitted models (default: {DEFAULT_CACHE_DIR})')
+    
+    parser.add_argument('--cache-max-mb',
+                       type=int,
+                       default=DEFAULT_CACHE_MAX_BYTES // 1024 ** 2,
+                       help='Evict least recently used cache entries beyond this size in MB')
+    
+    parser.add_argument('--no-cache',
+                       action='store_true',
+                       help='Neither read nor write the on-disk cache')
+    
     args = parser.parse_args()
     
     if not os.path.exists(args.data_file):
         print(f"Error: File not found: {args.data_file}")
         sys.exit(1)
     
+    if args.workers is not None and args.workers < 1:
+        print("Error: --workers must be a positive number of processes")
+        sys.exit(1)
+    
+    if args.chunksize is not None and args.chunksize < 1:
+        print("Error: --chunksize must be a positive number of rows")
+        sys.exit(1)
+    
+    if args.bootstrap is not None and args.bootstrap < 2:
+        print("Error: --bootstrap needs at least 2 resamples")
+        sys.exit(1)
+    
+    if args.kernel and (args.out_of_core or args.workers or args.group_by is not None
+                        or args.bootstrap or args.select_components):
+        print("Error: --kernel cannot be combined with --out-of-core, --workers, --group-by, --bootstrap "
+              "or --select-components")
+        sys.exit(1)
+    
+    if args.kernel and args.kernel_approximation == 'fourier' and args.kernel != 'rbf':
+        print("Error: random Fourier features only approximate the rbf kernel; use --kernel-approximation nystroem")
+        sys.exit(1)
+    
+    if args.kernel_rank < 1:
+        print("Error: --kernel-rank must be positive")
+        sys.exit(1)
+    
+    if args.cv_folds < 2:
+        print("Error: --cv-folds must be at least 2")
+        sys.exit(1)
+    
+    if args.summary_only and args.save:
+        print("Error: --summary-only does not render figures; drop --save")
+        sys.exit(1)
+    
     if args.save:
         os.makedirs(args.save, exist_ok=True)
     
+    profiler = Profiler(enabled=bool(args.profile or args.cprofile or args.memory_report),
+                        cprofile=bool(args.cprofile), verbose=args.memory_report)
+    
     try:
-        print("Loading data...")
-        numeric_df, label_col, original_df = prepare_data(args.data_file)
-        print(f"Loaded {len(numeric_df)} rows with {len(numeric_df.columns)} numeric features")
+        if args.group_by is not None:
+            run_grouped(args, profiler)
+            return
+        
+        from data_loader import is_sparse_input
+        from pca_analyzer import get_variance_metrics
+        
+        file_hash = None
+        cached_fit = None
+        if not args.no_cache:
+            from cache import hash_file, fit_key, load_fit_cached, store_fit, evict_lru
+            
+            with profiler.span('cache_lookup'):
+                file_hash = hash_file(args.data_file)
+                key = fit_key(file_hash, components=args.components, solver=args.solver,
+                              out_of_core=args.out_of_core, loader=load_mode(args), dtype=args.dtype,
+                              sharded=bool(args.workers),
+                              kernel=args.kernel and (args.kernel, args.kernel_approximation, args.kernel_rank,
+                                                      args.gamma))
+                cached_fit = load_fit_cached(args.cache_dir, key)
+        
+        if cached_fit is not None:
+            scaler, pca, transformed_data, labels, meta = cached_fit
+            feature_names, label_col, solver = meta['feature_names'], meta['label_column'], meta['solver']
+            fit_data = None
+            print(f"Loaded cached PCA fit for {len(transformed_data)} rows with {len(feature_names)} numeric features")
+        else:
+            scaler, pca, transformed_data, feature_names, label_col, labels, fit_data, solver = fit_pipeline(
+                args, None if args.out_of_core or is_sparse_input(args.data_file) else file_hash, profiler
+            )
+            if file_hash:
+                with profiler.span('cache_store'):
+                    meta = {'feature_names': feature_names, 'label_column': label_col, 'solver': solver}
+                    store_fit(args.cache_dir, key, scaler, pca, transformed_data, labels, meta)
+                    evict_lru(args.cache_dir, args.cache_max_mb * 1024 ** 2)
         
         if label_col:
             print(f"Found label column: {label_col}")
         
-        print("Standardizing data...")
-        standardized_data = standardize_data(numeric_df)
-        
-        print(f"Applying PCA{' with ' + str(args.components) + ' components' if args.components else ''}...")
-        pca, transformed_data = compute_pca(standardized_data, args.components)
+        selection = None
+        if args.select_components:
+            from component_selection import cross_validate_components
+            
+            if is_sparse_input(args.data_file) or args.out_of_core:
+                raise ValueError("--select-components needs an in-memory dense fit; drop --out-of-core or use a dense input")
+            if fit_data is None:
+                fit_data = load_numeric_data(args, file_hash)[0]
+            print(f"Cross-validating the number of components ({args.cv_folds} folds)...")
+            with profiler.span('select_components', rows=len(fit_data)):
+                selection = cross_validate_components(fit_data, args.cv_max_components, args.cv_folds)
+            if args.components is None:
+                from pca_analyzer import truncate_pca
+                
+                plotted = 1 if args.summary_only else 2
+                pca = truncate_pca(pca, max(plotted, selection['recommended']))
+                transformed_data = transformed_data[:, :pca.n_components_]
         
         explained_variance_ratio, cumulative_variance = get_variance_metrics(pca)
         
+        bootstrap = None
+        if args.bootstrap:
+            from bootstrap import bootstrap_variance
+            
+            if is_sparse_input(args.data_file) or args.out_of_core:
+                raise ValueError("--bootstrap needs an in-memory dense fit; drop --out-of-core or use a dense input")
+            if fit_data is None:
+                fit_data = load_numeric_data(args, file_hash)[0]
+            print(f"Bootstrapping explained variance ({args.bootstrap} resamples)...")
+            with profiler.span('bootstrap', rows=len(fit_data)):
+                bootstrap = bootstrap_variance(fit_data, args.bootstrap, args.confidence)
+        
         results = {
             'pca': pca,
+            'scaler': scaler,
             'transformed_data': transformed_data,
             'explained_variance_ratio': explained_variance_ratio,
             'cumulative_variance': cumulative_variance,
             'n_components': pca.n_components_,
-            'feature_names': numeric_df.columns.tolist(),
+            'solver': solver,
+            'feature_names': feature_names,
             'label_column': label_col,
-            'labels': original_df[label_col].values if label_col else None,
-            'original_data': numeric_df
+            'labels': labels,
+            'original_data': None,
+            'bootstrap': bootstrap,
+            'selection': selection
         }
         
         print_summary(results)
         
-        print("Creating visualizations...")
-        n_show = args.show_components if args.show_components else results['n_components']
-        figs = create_dashboard(results, n_components_to_show=n_show, save_dir=args.save)
-        
-        if args.save:
-            print(f"Figures saved to {args.save}/")
+        if args.summary_json:
+            from summary import build_summary
+            
+            summary = build_summary(args.data_file, feature_names, label_col, len(transformed_data), pca, solver,
+                                    {span['stage']: span['wall_s'] for span in profiler.spans})
+            if bootstrap:
+                from bootstrap import interval_summary
+                summary['bootstrap'] = interval_summary(bootstrap, pca.n_components_)
+            if selection:
+                from component_selection import selection_summary
+                summary['component_selection'] = selection_summary(selection)
+            write_summary_json(args.summary_json, summary)
         
-        if not args.no_display:
-            print("Displaying plots...")
-            plt.show()
-        else:
-            plt.close('all')
+        if args.summary_only:
+            write_profile(args, profiler)
             print("Analysis complete!")
+        else:
+            render_results(args, results, profiler)
         
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
@@ -0,0 +1,298 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import numpy as np
+
+from data_loader import (prepare_data, sniff_columns, iter_numeric_chunks, csv_header, complete_rows_end,
+                         iter_csv_range, load_numeric_matrix, surviving_features, DEFAULT_CHUNKSIZE)
+from pca_analyzer import (fit_standardize, compute_pca, fit_scaler_streaming, compute_pca_incremental,
+                          compute_pca_from_covariance, components_for_variance, select_features,
+                          RunningCovariance, SOLVERS)
+from model_io import (save_model, load_model, open_projection_writer, apply_model,
+                      state_path, save_state, load_state)
+from sharded_pca import fit_covariance_parallel, fit_covariance_shards
+from service import serve, DEFAULT_MAX_BATCH_ROWS, DEFAULT_MAX_LATENCY_MS
+
+
+def fit_sharded(args):
+    if len(args.data_files) > 1:
+        feature_names, label_col = sniff_columns(args.data_files[0])
+        print(f"Computing per-shard statistics for {len(args.data_files)} files in parallel...")
+        dropped = []
+        covariance = fit_covariance_shards(args.data_files, feature_names, args.workers,
+                                           args.chunksize or DEFAULT_CHUNKSIZE, dropped=dropped)
+        feature_names = [col for col in feature_names if col not in dropped]
+    else:
+        print("Loading data...")
+        data, _, feature_names, label_col = load_numeric_matrix(args.data_files[0], mmap_mode='r')
+        print(f"Computing per-shard statistics over {args.workers} worker processes...")
+        covariance = fit_covariance_parallel(data, args.workers)
+    
+    print("Merging statistics and applying PCA...")
+    scaler, pca = compute_pca_from_covariance(covariance, args.components)
+    return scaler, pca, feature_names, label_col
+
+
+def fit_command(args):
+    if len(args.data_files) > 1 or args.workers:
+        scaler, pca, feature_names, label_col = fit_sharded(args)
+    elif args.chunksize:
+        data_file = args.data_files[0]
+        feature_names, label_col = sniff_columns(data_file)
+        dropped = []
+        
+        def blocks():
+            chunks = iter_numeric_chunks(data_file, args.chunksize, feature_names, dropped=dropped)
+            return (block for block, _ in chunks)
+        
+        print("Computing streaming mean/variance...")
+        scaler = fit_scaler_streaming(blocks())
+        if dropped:
+            keep = surviving_features(feature_names, dropped)
+            scaler = select_features(scaler, keep)
+            feature_names = [feature_names[j] for j in keep]
+        print("Fitting incremental PCA...")
+        pca = compute_pca_incremental(blocks(), scaler, args.components)
+    else:
+        print("Loading data...")
+        numeric_df, label_col, _ = prepare_data(args.data_files[0])
+        feature_names = numeric_df.columns.tolist()
+        print("Standardizing data...")
+        scaler, standardized_data = fit_standardize(numeric_df)
+        print("Applying PCA...")
+        pca, _ = compute_pca(standardized_data, args.components, args.solver)
+    
+    save_model(args.model, scaler, pca, feature_names, label_col)
+    print(f"Saved model with {pca.n_components_} components over {len(feature_names)} features "
+          f"({int(scaler.n_samples_seen_)} rows) to {args.model}")
+
+
+def apply_command(args):
+    model = load_model(args.model)
+    label_col = model['label_column'] if args.with_labels else None
+    
+    if args.components:
+        model['weights'] = np.ascontiguousarray(model['weights'][:, :args.components])
+        model['offset'] = model['offset'][:args.components]
+    n_columns = len(model['offset'])
+    
+    chunks = iter_numeric_chunks(args.data_file, args.chunksize, model['feature_names'], label_col)
+    writer = open_projection_writer(args.output, n_columns, args.dtype, label_col)
+    
+    start = time.perf_counter()
+    n_rows = apply_model(model, chunks, writer)
+    elapsed = time.perf_counter() - start
+    
+    rate = n_rows / elapsed if elapsed > 0 else float('inf')
+    print(f"Projected {n_rows} rows onto {n_columns} components in {elapsed:.2f}s "
+          f"({rate:,.0f} rows/s) -> {args.output}")
+
+
+def update_command(args):
+    path = args.state or state_path(args.data_file)
+    header, header_end = csv_header(args.data_file)
+    
+    if os.path.exists(path) and not args.rebuild:
+        state = load_state(path)
+        if state['header'] != header:
+            raise ValueError(f"The header of {args.data_file} changed since {path} was written; rerun with --rebuild")
+        if os.path.getsize(args.data_file) < state['offset']:
+            raise ValueError(f"{args.data_file} is shorter than when {path} was written; rerun with --rebuild")
+        covariance, offset = state['covariance'], state['offset']
+        feature_names, label_col = state['feature_names'], state['label_column']
+    else:
+        feature_names, label_col = sniff_columns(args.data_file)
+        covariance, offset = RunningCovariance(len(feature_names)), header_end
+    
+    end = complete_rows_end(args.data_file)
+    seen = covariance.n_samples
+    for block in iter_csv_range(args.data_file, offset, end, args.chunksize, feature_names):
+        covariance.update(block)
+    save_state(path, covariance, feature_names, label_col, header, max(end, offset))
+    print(f"Folded {covariance.n_samples - seen} new rows into {path} ({covariance.n_samples} rows in total)")
+    
+    scaler, pca = compute_pca_from_covariance(covariance, args.components)
+    cumulative_variance = np.cumsum(pca.explained_variance_ratio_)
+    for i in range(min(10, pca.n_components_)):
+        print(f"PC{i+1:2d}: {pca.explained_variance_ratio_[i] * 100:6.2f}% "
+              f"(Cumulative: {cumulative_variance[i] * 100:6.2f}%)")
+    for threshold in (0.80, 0.95):
+        n_needed = components_for_variance(cumulative_variance, threshold)
+        if n_needed is not None:
+            print(f"Components needed for {threshold:.0%} variance: {n_needed}")
+    
+    if args.model:
+        save_model(args.model, scaler, pca, feature_names, label_col)
+        print(f"Saved model with {pca.n_components_} components to {args.model}")
+
+
+def serve_command(args):
+    model = load_model(args.model)
+    print(f"Serving {args.model} ({model['n_components']} components over {len(model['feature_names'])} features) "
+          f"on http://{args.host}:{args.port} "
+          f"(max batch {args.max_batch_rows} rows, max latency {args.max_latency_ms} ms)")
+    
+    try:
+        asyncio.run(serve(model, args.host, args.port, args.max_batch_rows, args.max_latency_ms))
+    except KeyboardInterrupt:
+        print("Stopped.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Fit a reusable PCA model and project new data with it',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python pca_model.py fit data/sample_data.csv --model outputs/model.npz
+  python pca_model.py fit data/large_data.csv --model outputs/model.npz --components 10 --chunksize 100000
+  python pca_model.py fit data/shards/*.csv --model outputs/model.npz --workers 16
+  python pca_model.py apply data/new_data.csv --model outputs/model.npz --output outputs/projections.npy
+  python pca_model.py apply data/new_data.csv --model outputs/model.npz --output outputs/projections.parquet --with-labels
+  python pca_model.py update data/hourly.csv --model outputs/model.npz
+  python pca_model.py serve --model outputs/model.npz --port 8000
+        """
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    fit_parser = subparsers.add_parser('fit', help='Fit scaler and PCA and save them as a model artifact')
+    fit_parser.add_argument('data_files',
+                           type=str,
+                           nargs='+',
+                           help='Path to CSV file containing numeric features, or several shard files '
+                                'with the same columns that are fitted in parallel')
+    fit_parser.add_argument('--model', '-m',
+                           type=str,
+                           required=True,
+                           help='Path of the model artifact to write (.npz)')
+    fit_parser.add_argument('--components', '-n',
+                           type=int,
+                           default=None,
+                           help='Number of principal components to retain (default: all)')
+    fit_parser.add_argument('--solver',
+                           type=str,
+                           choices=SOLVERS,
+                           default='auto',
+                           help='PCA solver for in-memory fits (default: auto)')
+    fit_parser.add_argument('--chunksize',
+                           type=int,
+                           default=None,
+                           help='Fit out-of-core from blocks of this many rows (incremental PCA)')
+    fit_parser.add_argument('--workers',
+                           type=int,
+                           default=None,
+                           help='Processes computing per-shard mean/cross-product statistics, merged into '
+                                'one covariance PCA (default: one per CPU when several files are given)')
+    
+    apply_parser = subparsers.add_parser('apply', help='Stream a CSV through a saved model')
+    apply_parser.add_argument('data_file',
+                             type=str,
+                             help='Path to CSV file with the same feature columns as the fitted data')
+    apply_parser.add_argument('--model', '-m',
+                             type=str,
+                             required=True,
+                             help='Path of a model artifact written by "fit"')
+    apply_parser.add_argument('--output', '-o',
+                             type=str,
+                             required=True,
+                             help='Output file: .npy (rows x components) or .parquet (requires pyarrow)')
+    apply_parser.add_argument('--components', '-n',
+                             type=int,
+                             default=None,
+                             help='Only write the first N components (default: all in the model)')
+    apply_parser.add_argument('--chunksize',
+                             type=int,
+                             default=DEFAULT_CHUNKSIZE,
+                             help=f'Rows per block (default: {DEFAULT_CHUNKSIZE})')
+    apply_parser.add_argument('--dtype',
+                             type=str,
+                             choices=['float32', 'float64'],
+                             default='float32',
+                             help='Precision of written projections (default: float32)')
+    apply_parser.add_argument('--with-labels',
+                             action='store_true',
+                             help='Carry the model\'s label column into Parquet output')
+    
+    update_parser = subparsers.add_parser('update', help='Fold rows appended to a CSV into a persisted state and refit')
+    update_parser.add_argument('data_file',
+                              type=str,
+                              help='Path to an uncompressed CSV file that grows by appending rows')
+    update_parser.add_argument('--state',
+                              type=str,
+                              default=None,
+                              help='Path of the persisted state (default: <data_file>.pcastate.npz)')
+    update_parser.add_argument('--rebuild',
+                              action='store_true',
+                              help='Discard any existing state and fold in the whole file')
+    update_parser.add_argument('--components', '-n',
+                              type=int,
+                              default=None,
+                              help='Number of principal components to retain (default: all)')
+    update_parser.add_argument('--model', '-m',
+                              type=str,
+                              default=None,
+                              help='Also write the refitted model artifact to this path (.npz)')
+    update_parser.add_argument('--chunksize',
+                              type=int,
+                              default=DEFAULT_CHUNKSIZE,
+                              help=f'Rows per block (default: {DEFAULT_CHUNKSIZE})')
+    
+    serve_parser = subparsers.add_parser('serve', help='Serve projections and reconstruction errors over HTTP')
+    serve_parser.add_argument('--model', '-m',
+                             type=str,
+                             required=True,
+                             help='Path of a model artifact written by "fit"')
+    serve_parser.add_argument('--host',
+                             type=str,
+                             default='127.0.0.1',
+                             help='Interface to bind (default: 127.0.0.1)')
+    serve_parser.add_argument('--port', '-p',
+                             type=int,
+                             default=8000,
+                             help='Port to listen on (default: 8000)')
+    serve_parser.add_argument('--max-batch-rows',
+                             type=int,
+                             default=DEFAULT_MAX_BATCH_ROWS,
+                             help=f'Rows coalesced into one vectorized batch (default: {DEFAULT_MAX_BATCH_ROWS})')
+    serve_parser.add_argument('--max-latency-ms',
+                             type=float,
+                             default=DEFAULT_MAX_LATENCY_MS,
+                             help=f'Longest wait for a batch to fill (default: {DEFAULT_MAX_LATENCY_MS})')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'serve':
+        serve_command(args)
+        return
+    
+    for data_file in (args.data_files if args.command == 'fit' else [args.data_file]):
+        if not os.path.exists(data_file):
+            print(f"Error: File not found: {data_file}")
+            sys.exit(1)
+    
+    output_path = args.output if args.command == 'apply' else args.model
+    if output_path and os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    try:
+        if args.command == 'fit':
+            fit_command(args)
+        elif args.command == 'update':
+            update_command(args)
+        else:
+            apply_command(args)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from typing import Tuple, Optional
+
+
+DEFAULT_RESAMPLES = 200
+DEFAULT_CONFIDENCE = 0.95
+THRESHOLDS = (0.80, 0.95)
+MOMENT_BUDGET_BYTES = 256 * 1024 ** 2
+MIN_BLOCKS = 20
+MAX_BLOCKS = 2000
+RESAMPLE_BATCH = 32
+
+
+def n_bootstrap_blocks(n_samples: int, n_features: int) -> int:
+    n_blocks = MOMENT_BUDGET_BYTES // (8 * n_features ** 2)
+    if n_blocks < min(MIN_BLOCKS, n_samples):
+        widest = int(np.sqrt(MOMENT_BUDGET_BYTES // (8 * MIN_BLOCKS)))
+        raise ValueError(f"Bootstrapping {n_features} features needs more than "
+                         f"{MOMENT_BUDGET_BYTES // 1024 ** 2} MB of block moments; at most {widest} features are supported")
+    return int(min(n_samples, MAX_BLOCKS, n_blocks))
+
+
+def resample_batch_size(n_features: int, workers: int) -> int:
+    return int(max(1, min(RESAMPLE_BATCH, MOMENT_BUDGET_BYTES // (16 * n_features ** 2 * workers))))
+
+
+def block_moments(data: np.ndarray, n_blocks: int,
+                  rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n_samples, n_features = data.shape
+    mean = data.mean(axis=0, dtype=np.float64)
+    scale = data.std(axis=0, dtype=np.float64)
+    scale[scale == 0] = 1.0
+    
+    counts = np.empty(n_blocks)
+    sums = np.empty((n_blocks, n_features))
+    products = np.empty((n_blocks, n_features, n_features))
+    
+    for k, rows in enumerate(np.array_split(rng.permutation(n_samples), n_blocks)):
+        block = (data[np.sort(rows)] - mean) / scale
+        counts[k] = len(rows)
+        sums[k] = block.sum(axis=0)
+        products[k] = block.T @ block
+    
+    return counts, sums, products
+
+
+def _resample_spectra(weights: np.ndarray, counts: np.ndarray, sums: np.ndarray,
+                      products: np.ndarray) -> np.ndarray:
+    n_features = sums.shape[1]
+    n = weights @ counts
+    mean = (weights @ sums) / n[:, None]
+    covariance = (weights @ products.reshape(len(products), -1)).reshape(-1, n_features, n_features)
+    covariance /= n[:, None, None]
+    covariance -= mean[:, :, None] * mean[:, None, :]
+    
+    scale = np.sqrt(np.maximum(np.einsum('bii->bi', covariance), 0.0))
+    scale[scale < 1e-12] = 1.0
+    correlation = covariance / (scale[:, :, None] * scale[:, None, :])
+    
+    eigenvalues = np.maximum(np.linalg.eigvalsh(correlation)[:, ::-1], 0.0)
+    return eigenvalues / eigenvalues.sum(axis=1, keepdims=True)
+
+
+def _counts_for(cumulative: np.ndarray, threshold: float) -> np.ndarray:
+    reached = cumulative >= threshold - 1e-12
+    return np.where(reached.any(axis=1), reached.argmax(axis=1) + 1, cumulative.shape[1])
+
+
+def bootstrap_variance(data: np.ndarray, n_resamples: int = DEFAULT_RESAMPLES,
+                       confidence: float = DEFAULT_CONFIDENCE, seed: Optional[int] = 0,
+                       workers: Optional[int] = None) -> dict:
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if n_resamples < 2:
+        raise ValueError("At least two bootstrap resamples are needed")
+    if len(data) < 2:
+        raise ValueError("At least two rows are needed to bootstrap")
+    
+    rng = np.random.default_rng(seed)
+    n_blocks = n_bootstrap_blocks(*data.shape)
+    counts, sums, products = block_moments(data, n_blocks, rng)
+    weights = rng.multinomial(n_blocks, np.full(n_blocks, 1.0 / n_blocks), size=n_resamples).astype(np.float64)
+    
+    workers = min(workers or os.cpu_count() or 1, n_resamples)
+    batch_size = resample_batch_size(data.shape[1], workers)
+    batches = [weights[start:start + batch_size] for start in range(0, n_resamples, batch_size)]
+    with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+        ratios = np.concatenate(list(executor.map(
+            lambda batch: _resample_spectra(batch, counts, sums, products), batches
+        )))
+    ratios = ratios[:, :min(data.shape)]
+    cumulative = np.cumsum(ratios, axis=1)
+    
+    alpha = (1 - confidence) / 2
+    count_intervals = {}
+    for threshold in THRESHOLDS:
+        needed = _counts_for(cumulative, threshold)
+        count_intervals[threshold] = (int(np.quantile(needed, alpha, method='lower')),
+                                      int(np.quantile(needed, 1 - alpha, method='higher')))
+    
+    return {
+        'n_resamples': n_resamples,
+        'confidence': confidence,
+        'n_blocks': n_blocks,
+        'ratio_interval': np.quantile(ratios, [alpha, 1 - alpha], axis=0),
+        'cumulative_interval': np.quantile(cumulative, [alpha, 1 - alpha], axis=0),
+        'count_intervals': count_intervals,
+    }
+
+
+def interval_summary(bootstrap: dict, n_components: int) -> dict:
+    return {
+        'n_resamples': bootstrap['n_resamples'],
+        'confidence': bootstrap['confidence'],
+        'explained_variance_ratio_interval': bootstrap['ratio_interval'][:, :n_components].T.tolist(),
+        'cumulative_variance_interval': bootstrap['cumulative_interval'][:, :n_components].T.tolist(),
+        'components_for_80_interval': list(bootstrap['count_intervals'][0.80]),
+        'components_for_95_interval': list(bootstrap['count_intervals'][0.95]),
+    }
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+from pathlib import Path
+from typing import Tuple, Optional, List
+
+from defaults import DEFAULT_CACHE_MAX_BYTES
+
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fit_key(file_hash: str, **options) -> str:
+    payload = json.dumps({'file': file_hash, **options}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _entry_path(cache_dir: str, kind: str, key: str) -> Path:
+    return Path(cache_dir) / f"{kind}-{key}"
+
+
+def _touch(path: Path):
+    os.utime(path, None)
+
+
+def _write_entry(cache_dir: str, kind: str, key: str, arrays: dict, objects: dict, meta: dict) -> Path:
+    os.makedirs(cache_dir, exist_ok=True)
+    target = _entry_path(cache_dir, kind, key)
+    staging = Path(tempfile.mkdtemp(prefix=f".{kind}-", dir=cache_dir))
+    
+    try:
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", array, allow_pickle=False)
+        for name, obj in objects.items():
+            with open(staging / f"{name}.pkl", 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(staging / 'meta.json', 'w') as f:
+            json.dump(meta, f)
+        
+        if target.exists():
+            shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    return target
+
+
+def _read_entry(cache_dir: str, kind: str, key: str, arrays: List[str], objects: List[str],
+                mmap_mode: str = 'r') -> Optional[Tuple[dict, dict, dict]]:
+    path = _entry_path(cache_dir, kind, key)
+    if not (path / 'meta.json').exists():
+        return None
+    
+    try:
+        with open(path / 'meta.json') as f:
+            meta = json.load(f)
+        loaded_arrays = {}
+        for name in arrays:
+            array_path = path / f"{name}.npy"
+            loaded_arrays[name] = np.load(array_path, mmap_mode=mmap_mode) if array_path.exists() else None
+        loaded_objects = {}
+        for name in objects:
+            with open(path / f"{name}.pkl", 'rb') as f:
+                loaded_objects[name] = pickle.load(f)
+    except Exception:
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+    
+    _touch(path)
+    return loaded_arrays, loaded_objects, meta
+
+
+def _labels_array(labels: Optional[np.ndarray]) -> dict:
+    return {'labels': np.asarray(labels).astype(str)} if labels is not None else {}
+
+
+def _data_key(file_hash: str, dtype, loader: str) -> str:
+    return f"{file_hash}-{loader}-{np.dtype(dtype).name}"
+
+
+def store_data(cache_dir: str, file_hash: str, data: np.ndarray, labels: Optional[np.ndarray],
+               feature_names: List[str], label_col: Optional[str], loader: str = 'full',
+               max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> Optional[Path]:
+    if data.nbytes > max_bytes:
+        return None
+    
+    arrays = {'data': np.asarray(data), **_labels_array(labels)}
+    meta = {'feature_names': feature_names, 'label_column': label_col}
+    return _write_entry(cache_dir, 'data', _data_key(file_hash, arrays['data'].dtype, loader), arrays, {}, meta)
+
+
+def load_data_cached(cache_dir: str, file_hash: str, dtype=np.float64, loader: str = 'full',
+                     mmap_mode: str = 'c') -> Optional[Tuple[np.ndarray, Optional[np.ndarray], List[str], Optional[str]]]:
+    entry = _read_entry(cache_dir, 'data', _data_key(file_hash, dtype, loader), ['data', 'labels'], [], mmap_mode=mmap_mode)
+    if entry is None:
+        return None
+    
+    arrays, _, meta = entry
+    return arrays['data'], arrays['labels'], meta['feature_names'], meta['label_column']
+
+
+def store_fit(cache_dir: str, key: str, scaler, pca, transformed_data: np.ndarray,
+              labels: Optional[np.ndarray], meta: dict) -> Path:
+    arrays = {'transformed': np.ascontiguousarray(transformed_data), **_labels_array(labels)}
+    objects = {'scaler': scaler, 'pca': pca}
+    return _write_entry(cache_dir, 'fit', key, arrays, objects, meta)
+
+
+def load_fit_cached(cache_dir: str, key: str) -> Optional[Tuple[object, object, np.ndarray, Optional[np.ndarray], dict]]:
+    entry = _read_entry(cache_dir, 'fit', key, ['transformed', 'labels'], ['scaler', 'pca'])
+    if entry is None:
+        return None
+    
+    arrays, objects, meta = entry
+    return objects['scaler'], objects['pca'], arrays['transformed'], arrays['labels'], meta
+
+
+def _entry_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+
+
+def evict_lru(cache_dir: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> List[Path]:
+    root = Path(cache_dir)
+    if not root.is_dir():
+        return []
+    
+    entries = [p for p in root.iterdir() if p.is_dir() and not p.name.startswith('.')]
+    entries.sort(key=lambda p: p.stat().st_mtime)
+    sizes = {p: _entry_size(p) for p in entries}
+    total = sum(sizes.values())
+    
+    evicted = []
+    for path in entries:
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= sizes[path]
+        evicted.append(path)
+    
+    return evicted
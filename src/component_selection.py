@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from typing import Tuple, Optional, List
+
+from pca_analyzer import RunningCovariance
+
+
+DEFAULT_FOLDS = 5
+STATS_BLOCK_ROWS = 65_536
+LEVERAGE_FLOOR = 1e-6
+
+
+def fold_indices(n_samples: int, n_folds: int, seed: Optional[int] = 0) -> List[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return [np.sort(rows) for rows in np.array_split(rng.permutation(n_samples), n_folds)]
+
+
+def _fold_covariance(data: np.ndarray, rows: np.ndarray) -> RunningCovariance:
+    covariance = RunningCovariance(data.shape[1])
+    for start in range(0, len(rows), STATS_BLOCK_ROWS):
+        covariance.update(data[rows[start:start + STATS_BLOCK_ROWS]].astype(np.float64, copy=False))
+    return covariance
+
+
+def _training_spectrum(train: RunningCovariance, max_components: int) -> Tuple[np.ndarray, np.ndarray, float]:
+    from scipy.linalg import eigh
+    
+    n_features = len(train.mean)
+    scale = train.to_scaler().scale_
+    covariance = train.scatter / (train.n_samples - 1) / np.outer(scale, scale)
+    
+    eigenvalues, eigenvectors = eigh(covariance, subset_by_index=[n_features - max_components, n_features - 1])
+    return eigenvalues[::-1], eigenvectors[:, ::-1], float(np.trace(covariance))
+
+
+def _held_out_scatter(fold: RunningCovariance, train: RunningCovariance, scale: np.ndarray) -> np.ndarray:
+    shift = fold.mean - train.mean
+    scatter = fold.scatter + np.outer(shift, shift) * fold.n_samples
+    return scatter / np.outer(scale, scale)
+
+
+def _fold_curves(fold: RunningCovariance, train: RunningCovariance,
+                 max_components: int) -> Tuple[np.ndarray, np.ndarray]:
+    n_features = len(train.mean)
+    eigenvalues, loadings, total_variance = _training_spectrum(train, max_components)
+    held_out = _held_out_scatter(fold, train, train.to_scaler().scale_)
+    
+    cross = held_out @ loadings
+    projected = loadings.T @ cross
+    projected_variance = np.diag(projected)
+    
+    leverage = np.cumsum(np.square(loadings), axis=1)
+    fitted = np.cumsum(cross * loadings, axis=1)
+    fitted_square = np.cumsum(2 * loadings * (loadings @ np.triu(projected, 1))
+                              + np.square(loadings) * projected_variance, axis=1)
+    residual_square = np.diag(held_out)[:, None] - 2 * fitted + fitted_square
+    press = (residual_square / np.square(np.maximum(1 - leverage, LEVERAGE_FLOOR))).sum(axis=0)
+    
+    k = np.arange(1, max_components + 1)
+    captured = np.cumsum(projected_variance)
+    residual = np.trace(held_out) - captured
+    noise_variance = np.maximum((total_variance - np.cumsum(eigenvalues)) / (n_features - k),
+                                np.finfo(np.float64).tiny)
+    log_likelihood = -0.5 * (n_features * np.log(2 * np.pi)
+                             + np.cumsum(np.log(eigenvalues))
+                             + (n_features - k) * np.log(noise_variance)
+                             + (np.cumsum(projected_variance / eigenvalues) + residual / noise_variance)
+                             / fold.n_samples)
+    return press, log_likelihood
+
+
+def cross_validate_components(data: np.ndarray, max_components: Optional[int] = None,
+                              n_folds: int = DEFAULT_FOLDS, seed: Optional[int] = 0,
+                              workers: Optional[int] = None) -> dict:
+    n_samples, n_features = data.shape
+    if n_folds < 2:
+        raise ValueError("At least two folds are needed")
+    if n_samples < 2 * n_folds:
+        raise ValueError(f"Need at least {2 * n_folds} rows for {n_folds}-fold cross-validation")
+    
+    folds = fold_indices(n_samples, n_folds, seed)
+    limit = min(n_features - 1, n_samples - len(folds[0]) - 2)
+    if limit < 1:
+        raise ValueError("Need at least two features to cross-validate the number of components")
+    max_components = min(max_components or limit, limit)
+    
+    def evaluate(i: int) -> Tuple[np.ndarray, np.ndarray]:
+        train = RunningCovariance(n_features)
+        for j, covariance in enumerate(fold_covariances):
+            if j != i:
+                train.merge(covariance)
+        return _fold_curves(fold_covariances[i], train, max_components)
+    
+    with ThreadPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, n_folds)) as executor:
+        fold_covariances = list(executor.map(lambda rows: _fold_covariance(data, rows), folds))
+        curves = list(executor.map(evaluate, range(n_folds)))
+    
+    press = np.sum([curve[0] for curve in curves], axis=0) / (n_samples * n_features)
+    log_likelihood = np.mean([curve[1] for curve in curves], axis=0)
+    
+    return {
+        'n_folds': n_folds,
+        'max_components': max_components,
+        'press': press,
+        'log_likelihood': log_likelihood,
+        'recommended': int(np.argmin(press)) + 1,
+    }
+
+
+def selection_summary(selection: dict) -> dict:
+    return {
+        'n_folds': selection['n_folds'],
+        'max_components': selection['max_components'],
+        'recommended_components': selection['recommended'],
+        'press': selection['press'].tolist(),
+        'held_out_log_likelihood': selection['log_likelihood'].tolist(),
+    }
@@ -1,14 +1,161 @@
+import io
+import os
+import warnings
+from io import BytesIO
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional
+from typing import TYPE_CHECKING, Tuple, Optional, List, Iterator
+from pandas.io.common import get_handle
 
+from defaults import DEFAULT_CHUNKSIZE, CSV_ENGINES
 
-def load_data(filepath: str) -> pd.DataFrame:
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+
+
+SNIFF_ROWS = 1000
+MAX_LABEL_CARDINALITY = 20
+CARDINALITY_BLOCK_ROWS = 65_536
+COUNT_BLOCK_SIZE = 1024 * 1024
+SPARSE_EXTENSIONS = ('.npz', '.mtx', '.mtx.gz')
+TRIPLE_COLUMNS = ['row', 'col', 'value']
+FORMAT_EXTENSIONS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.ipc': 'feather',
+    '.npy': 'npy',
+}
+FORMAT_MAGIC = [
+    (b'PAR1', 'parquet'),
+    (b'ARROW1', 'feather'),
+    (b'FEA1', 'feather'),
+    (b'\x93NUMPY', 'npy'),
+]
+UPLOAD_TYPES = ['csv', 'gz', 'zst', 'bz2', 'xz', 'parquet', 'pq', 'feather', 'arrow', 'ipc', 'npy']
+ARROW_CSV_COMPRESSIONS = ('gzip', 'bz2', 'zstd')
+COMPRESSION_MAGIC = [
+    (b'\x1f\x8b', 'gzip'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+]
+
+
+def detect_format(filepath: str, header: Optional[bytes] = None) -> str:
+    if header is None:
+        try:
+            with open(filepath, 'rb') as f:
+                header = f.read(8)
+        except OSError:
+            header = b''
+    
+    for magic, fmt in FORMAT_MAGIC:
+        if header.startswith(magic):
+            return fmt
+    
+    lower = str(filepath).lower()
+    for extension, fmt in FORMAT_EXTENSIONS.items():
+        if lower.endswith(extension):
+            return fmt
+    return 'csv'
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet and Feather input require pyarrow (pip install pyarrow)")
+    return pa, feather, pq
+
+
+def detect_compression(filepath: str, header: Optional[bytes] = None) -> str:
+    if header is None:
+        try:
+            with open(filepath, 'rb') as f:
+                header = f.read(6)
+        except OSError:
+            return 'infer'
+    
+    for magic, compression in COMPRESSION_MAGIC:
+        if header.startswith(magic):
+            return compression
+    return 'infer'
+
+
+def has_pyarrow() -> bool:
+    try:
+        _import_pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_engine(engine: str = 'auto') -> str:
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine '{engine}', expected one of {CSV_ENGINES}")
+    if engine == 'auto':
+        return 'pyarrow' if has_pyarrow() else 'c'
+    if engine == 'pyarrow':
+        _import_pyarrow()
+    return engine
+
+
+def read_csv(source, engine: str = 'c', compression: Optional[str] = None, **kwargs) -> pd.DataFrame:
+    if compression is None:
+        compression = detect_compression(source)
+    return pd.read_csv(source, engine=resolve_engine(engine), compression=compression, **kwargs)
+
+
+def npy_feature_names(n_features: int) -> List[str]:
+    return [f'feature_{i+1}' for i in range(n_features)]
+
+
+def _load_npy(source, mmap_mode: Optional[str] = 'r') -> np.ndarray:
+    data = np.load(source, mmap_mode=mmap_mode, allow_pickle=False)
+    if data.ndim != 2 or data.dtype.kind not in 'iuf':
+        raise ValueError(f"Expected a 2-D numeric array, got shape {data.shape} and dtype {data.dtype}")
+    return data
+
+
+def read_bytes(file_bytes: bytes, filename: str = '', engine: str = 'auto') -> pd.DataFrame:
+    fmt = detect_format(filename, file_bytes[:8])
+    source = BytesIO(file_bytes)
+    
+    if fmt == 'parquet':
+        _import_pyarrow()
+        return pd.read_parquet(source)
+    if fmt == 'feather':
+        _import_pyarrow()
+        return pd.read_feather(source)
+    if fmt == 'npy':
+        data = _load_npy(source, mmap_mode=None)
+        return pd.DataFrame(data, columns=npy_feature_names(data.shape[1]))
+    return read_csv(source, engine, compression=detect_compression(filename, file_bytes[:6]))
+
+
+def load_data(filepath: str, engine: str = 'c') -> pd.DataFrame:
     try:
-        df = pd.read_csv(filepath)
+        fmt = detect_format(filepath)
+        if fmt == 'parquet':
+            _import_pyarrow()
+            return pd.read_parquet(filepath)
+        if fmt == 'feather':
+            _import_pyarrow()
+            return pd.read_feather(filepath)
+        if fmt == 'npy':
+            data = _load_npy(filepath)
+            return pd.DataFrame(data, columns=npy_feature_names(data.shape[1]))
+        
+        df = read_csv(filepath, engine)
         return df
     except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {filepath}")
+    except (ImportError, ValueError):
+        raise
     except Exception as e:
         raise Exception(f"Error loading file: {str(e)}")
 
@@ -18,14 +165,54 @@ def extract_numeric_features(df: pd.DataFrame) -> pd.DataFrame:
     return numeric_df
 
 
-def identify_label_column(df: pd.DataFrame, numeric_df: pd.DataFrame) -> Optional[str]:
-    non_numeric_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
+def has_few_unique(values: pd.Series, limit: int = MAX_LABEL_CARDINALITY,
+                   block_rows: int = CARDINALITY_BLOCK_ROWS) -> bool:
+    seen = set()
+    for start in range(0, len(values), block_rows):
+        seen.update(values.iloc[start:start + block_rows].dropna().unique())
+        if len(seen) > limit:
+            return False
     
-    for col in non_numeric_cols:
-        if df[col].nunique() <= 20:
-            return col
+    return True
+
+
+def warn_dropped_columns(columns: List[str]):
+    if columns:
+        warnings.warn(f"Dropped {len(columns)} column(s) holding non-numeric values beyond the first "
+                      f"{SNIFF_ROWS} rows: {', '.join(columns)}", stacklevel=2)
+
+
+def surviving_features(feature_names: List[str], dropped: List[str]) -> List[int]:
+    warn_dropped_columns(dropped)
+    keep = [j for j, col in enumerate(feature_names) if col not in dropped]
+    if not keep:
+        raise ValueError("No numeric columns found in the dataset")
+    return keep
+
+
+def drop_columns(data: np.ndarray, feature_names: List[str],
+                 dropped: List[str]) -> Tuple[np.ndarray, List[str]]:
+    if not dropped:
+        return data, feature_names
     
-    return None
+    keep = surviving_features(feature_names, dropped)
+    if data.flags.f_contiguous:
+        for target, j in enumerate(keep):
+            data[:, target] = data[:, j]
+        data = data[:, :len(keep)]
+    else:
+        data = data[:, keep]
+    return data, [feature_names[j] for j in keep]
+
+
+def label_candidates(df: pd.DataFrame) -> List[str]:
+    non_numeric_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
+    return [col for col in non_numeric_cols if has_few_unique(df[col])]
+
+
+def identify_label_column(df: pd.DataFrame, numeric_df: pd.DataFrame) -> Optional[str]:
+    candidates = label_candidates(df)
+    return candidates[0] if candidates else None
 
 
 def prepare_data_from_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[str], pd.DataFrame]:
@@ -39,7 +226,437 @@ def prepare_data_from_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, Optiona
     return numeric_df, label_col, df
 
 
-def prepare_data(filepath: str) -> Tuple[pd.DataFrame, Optional[str], pd.DataFrame]:
-    df = load_data(filepath)
+def prepare_data(filepath: str, engine: str = 'c') -> Tuple[pd.DataFrame, Optional[str], pd.DataFrame]:
+    df, feature_names, label_col = read_sniffed(filepath, engine=engine)
+    
+    return df[feature_names], label_col, df
+
+
+def _arrow_schema(filepath: str, fmt: str):
+    pa, feather, pq = _import_pyarrow()
+    if fmt == 'parquet':
+        return pq.read_schema(filepath)
+    try:
+        with pa.ipc.open_file(pa.memory_map(filepath)) as reader:
+            return reader.schema
+    except pa.ArrowInvalid:
+        return feather.read_table(filepath, memory_map=True).schema
+
+
+def _columnar_schema(filepath: str, fmt: str) -> Tuple[List[str], List[str]]:
+    if fmt == 'npy':
+        return npy_feature_names(_load_npy(filepath).shape[1]), []
+    
+    pa, _, _ = _import_pyarrow()
+    schema = _arrow_schema(filepath, fmt)
+    is_numeric = [pa.types.is_integer(field.type) or pa.types.is_floating(field.type) for field in schema]
+    feature_names = [field.name for field, numeric in zip(schema, is_numeric) if numeric]
+    candidates = [field.name for field, numeric in zip(schema, is_numeric) if not numeric]
+    return feature_names, candidates
+
+
+def sniff_schema(filepath: str, nrows: int = SNIFF_ROWS) -> Tuple[List[str], List[str]]:
+    fmt = detect_format(filepath)
+    if fmt != 'csv':
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File not found: {filepath}")
+        feature_names, candidates = _columnar_schema(filepath, fmt)
+        if not feature_names:
+            raise ValueError("No numeric columns found in the dataset")
+        return feature_names, candidates
+    
+    try:
+        sample = read_csv(filepath, nrows=nrows)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}")
+    except Exception as e:
+        raise Exception(f"Error loading file: {str(e)}")
+    
+    numeric_df = extract_numeric_features(sample)
+    if numeric_df.empty:
+        raise ValueError("No numeric columns found in the dataset")
+    
+    return numeric_df.columns.tolist(), label_candidates(sample)
+
+
+def sniff_columns(filepath: str, nrows: int = SNIFF_ROWS) -> Tuple[List[str], Optional[str]]:
+    feature_names, candidates = sniff_schema(filepath, nrows)
+    
+    return feature_names, candidates[0] if candidates else None
+
+
+def read_column(filepath: str, col: str, engine: str = 'c') -> pd.Series:
+    fmt = detect_format(filepath)
+    if fmt == 'csv':
+        return read_csv(filepath, engine, usecols=[col])[col]
+    return _read_arrow_table(filepath, fmt, [col]).column(col).to_pandas()
+
+
+def _verified_label(filepath: str, df: pd.DataFrame, candidates: List[str],
+                    engine: str = 'c') -> Optional[str]:
+    for col in candidates:
+        if col not in df.columns:
+            df[col] = read_column(filepath, col, engine)
+        if has_few_unique(df[col]):
+            return col
+        del df[col]
+    
+    return None
+
+
+def _read_arrow_table(filepath: str, fmt: str, columns: List[str]):
+    _, feather, pq = _import_pyarrow()
+    if fmt == 'parquet':
+        return pq.read_table(filepath, columns=columns, memory_map=True)
+    return feather.read_table(filepath, columns=columns, memory_map=True)
+
+
+def arrow_to_matrix(table, feature_names: List[str], dtype=np.float64) -> np.ndarray:
+    data = np.empty((table.num_rows, len(feature_names)), dtype=dtype, order='F')
+    
+    for j, col in enumerate(feature_names):
+        column = table.column(col)
+        start = 0
+        for chunk in getattr(column, 'chunks', [column]):
+            data[start:start + len(chunk), j] = chunk.to_numpy(zero_copy_only=False)
+            start += len(chunk)
+    
+    return data
+
+
+def _first_label(filepath: str, candidates: List[str], loaded: Optional[dict] = None,
+                 engine: str = 'c') -> Tuple[Optional[str], Optional[np.ndarray]]:
+    loaded = loaded or {}
+    for col in candidates:
+        values = loaded[col] if col in loaded else read_column(filepath, col, engine)
+        if has_few_unique(values):
+            return col, values.to_numpy()
+    
+    return None, None
+
+
+def read_csv_arrow(filepath: str, feature_names: List[str], label_cols: List[str], dtype=np.float64):
+    pa, _, _ = _import_pyarrow()
+    import pyarrow.csv as pa_csv
+    
+    compression = detect_compression(filepath)
+    source = pa.input_stream(filepath, compression=None if compression == 'infer' else compression)
+    column_types = {col: pa.from_numpy_dtype(np.dtype(dtype)) for col in feature_names}
+    column_types.update({col: pa.dictionary(pa.int32(), pa.string()) for col in label_cols})
+    options = pa_csv.ConvertOptions(include_columns=feature_names + label_cols, column_types=column_types)
+    return pa_csv.read_csv(source, convert_options=options)
+
+
+def _load_csv_arrow(filepath: str, dtype=np.float64) -> Tuple[np.ndarray, Optional[np.ndarray], List[str], Optional[str]]:
+    feature_names, candidates = sniff_schema(filepath)
+    table = read_csv_arrow(filepath, feature_names, candidates[:1], dtype)
+    data = arrow_to_matrix(table, feature_names, dtype)
+    loaded = {col: table.column(col).to_pandas() for col in candidates[:1]}
+    del table
+    _import_pyarrow()[0].default_memory_pool().release_unused()
+    
+    label_col, labels = _first_label(filepath, candidates, loaded)
+    return data, labels, feature_names, label_col
+
+
+def _arrow_labels(table, label_col: Optional[str]) -> Optional[np.ndarray]:
+    if not label_col:
+        return None
+    return table.column(label_col).to_numpy(zero_copy_only=False)
+
+
+def read_sniffed(filepath: str, dtype=np.float64,
+                 engine: str = 'c') -> Tuple[pd.DataFrame, List[str], Optional[str]]:
+    feature_names, candidates = sniff_schema(filepath)
+    usecols = feature_names + candidates[:1]
+    fmt = detect_format(filepath)
+    
+    if fmt == 'npy':
+        data = _load_npy(filepath)
+        df = pd.DataFrame(data if data.dtype == dtype else data.astype(dtype), columns=feature_names)
+        return df, feature_names, None
+    if fmt != 'csv':
+        df = _read_arrow_table(filepath, fmt, usecols).to_pandas()
+        df[feature_names] = df[feature_names].astype(dtype)
+        label_col = _verified_label(filepath, df, candidates)
+        return df, feature_names, label_col
+    
+    try:
+        df = read_csv(filepath, engine, usecols=usecols, dtype={col: dtype for col in feature_names})
+    except ValueError:
+        df = load_data(filepath, engine)
+        numeric_df = extract_numeric_features(df)
+        if numeric_df.empty:
+            raise ValueError("No numeric columns found in the dataset")
+        warn_dropped_columns([col for col in feature_names if col not in numeric_df.columns])
+        feature_names = numeric_df.columns.tolist()
+        candidates = df.select_dtypes(exclude=[np.number]).columns.tolist()
+        df = df[feature_names + candidates]
+        del numeric_df
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}")
+    except Exception as e:
+        raise Exception(f"Error loading file: {str(e)}")
+    
+    label_col = _verified_label(filepath, df, candidates, engine)
+    used = feature_names + ([label_col] if label_col else [])
+    if len(df.columns) != len(used):
+        df = df[used]
+    
+    return df, feature_names, label_col
+
+
+def frame_to_matrix(df: pd.DataFrame, feature_names: List[str], dtype=np.float64) -> np.ndarray:
+    return df[feature_names].to_numpy(dtype=dtype, copy=False)
+
+
+def load_numeric_matrix(filepath: str, dtype=np.float64, engine: str = 'c',
+                        mmap_mode: str = 'c') -> Tuple[np.ndarray, Optional[np.ndarray], List[str], Optional[str]]:
+    fmt = detect_format(filepath)
+    if fmt == 'npy':
+        data = _load_npy(filepath, mmap_mode=mmap_mode)
+        if data.dtype != dtype:
+            data = data.astype(dtype, order='F')
+        return data, None, npy_feature_names(data.shape[1]), None
+    
+    if fmt != 'csv':
+        feature_names, candidates = sniff_schema(filepath)
+        label_col, labels = _first_label(filepath, candidates)
+        table = _read_arrow_table(filepath, fmt, feature_names)
+        return arrow_to_matrix(table, feature_names, dtype), labels, feature_names, label_col
+    
+    if resolve_engine(engine) == 'pyarrow' and detect_compression(filepath) in ('infer',) + ARROW_CSV_COMPRESSIONS:
+        try:
+            return _load_csv_arrow(filepath, dtype)
+        except ValueError:
+            engine = 'c'
+    
+    df, feature_names, label_col = read_sniffed(filepath, dtype, engine)
+    labels = df[label_col].to_numpy() if label_col else None
+    data = frame_to_matrix(df, feature_names, dtype)
+    
+    return data, labels, feature_names, label_col
+
+
+def iter_numeric_chunks(filepath: str, chunksize: int, feature_names: List[str],
+                        label_col: Optional[str] = None, dtype=np.float64,
+                        dropped: Optional[List[str]] = None) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    if chunksize < 1:
+        raise ValueError("chunksize must be a positive number of rows")
+    
+    usecols = feature_names + ([label_col] if label_col else [])
+    dtypes = {col: dtype for col in feature_names}
+    fmt = detect_format(filepath)
+    
+    if fmt == 'npy':
+        data = _load_npy(filepath)
+        for start in range(0, len(data), chunksize):
+            yield np.array(data[start:start + chunksize], dtype=dtype), None
+        return
+    if fmt == 'parquet':
+        _, _, pq = _import_pyarrow()
+        for batch in pq.ParquetFile(filepath, memory_map=True).iter_batches(batch_size=chunksize, columns=usecols):
+            yield arrow_to_matrix(batch, feature_names, dtype), _arrow_labels(batch, label_col)
+        return
+    if fmt == 'feather':
+        for batch in _read_arrow_table(filepath, fmt, usecols).to_batches(max_chunksize=chunksize):
+            yield arrow_to_matrix(batch, feature_names, dtype), _arrow_labels(batch, label_col)
+        return
+    
+    try:
+        reader = read_csv(filepath, usecols=usecols, dtype=dtypes, chunksize=chunksize)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}")
+    except Exception as e:
+        raise Exception(f"Error loading file: {str(e)}")
+    
+    consumed = 0
+    try:
+        with reader:
+            for chunk in reader:
+                block = chunk[feature_names].to_numpy(dtype=dtype)
+                labels = chunk[label_col].to_numpy() if label_col else None
+                consumed += len(chunk)
+                yield block, labels
+    except ValueError:
+        reader = read_csv(filepath, usecols=usecols, chunksize=chunksize, skiprows=range(1, consumed + 1))
+        with reader:
+            for chunk in reader:
+                features = chunk[feature_names]
+                coerced = features.apply(pd.to_numeric, errors='coerce')
+                text = (coerced.isna() & features.notna()).any(axis=0)
+                for col in text.index[text.to_numpy()]:
+                    if dropped is None:
+                        raise ValueError(f"Column '{col}' holds non-numeric values beyond the first {SNIFF_ROWS} rows")
+                    if col not in dropped:
+                        dropped.append(col)
+                labels = chunk[label_col].to_numpy() if label_col else None
+                yield coerced.to_numpy(dtype=dtype), labels
+
+
+class _ByteRange(io.RawIOBase):
+    def __init__(self, f, end: int):
+        self._f = f
+        self._remaining = end - f.tell()
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer)[:max(self._remaining, 0)]
+        n = self._f.readinto(view)
+        self._remaining -= n
+        return n
+
+
+def csv_header(filepath: str) -> Tuple[bytes, int]:
+    with open(filepath, 'rb') as f:
+        header = f.readline()
+    if not header.endswith(b'\n'):
+        raise ValueError("CSV header must end with a newline")
+    return header, len(header)
+
+
+def complete_rows_end(filepath: str) -> int:
+    with open(filepath, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - 65_536)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+def iter_csv_range(filepath: str, start: int, end: int, chunksize: int, feature_names: List[str],
+                   dtype=np.float64) -> Iterator[np.ndarray]:
+    if detect_compression(filepath) != 'infer' or detect_format(filepath) != 'csv':
+        raise ValueError("Appending needs an uncompressed CSV file")
+    if end <= start:
+        return
+    
+    header, _ = csv_header(filepath)
+    columns = pd.read_csv(BytesIO(header), nrows=0).columns.tolist()
+    
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        source = io.BufferedReader(_ByteRange(f, end))
+        reader = pd.read_csv(source, header=None, names=columns, usecols=feature_names,
+                             dtype={col: dtype for col in feature_names}, chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                yield chunk[feature_names].to_numpy(dtype=dtype)
+
+
+def prepare_data_chunked(filepath: str, chunksize: int, dtype=np.float64,
+                         dropped: Optional[List[str]] = None) -> Tuple[Iterator[Tuple[np.ndarray, Optional[np.ndarray]]], Optional[str], List[str]]:
+    feature_names, label_col = sniff_columns(filepath)
+    chunks = iter_numeric_chunks(filepath, chunksize, feature_names, label_col, dtype, dropped)
+    
+    return chunks, label_col, feature_names
+
+
+def count_rows(filepath: str) -> int:
+    fmt = detect_format(filepath)
+    if fmt == 'npy':
+        return len(_load_npy(filepath))
+    if fmt in ('parquet', 'feather'):
+        return _read_arrow_table(filepath, fmt, []).num_rows
+    
+    compression = detect_compression(filepath)
+    newlines = 0
+    last = b'\n'
+    with get_handle(filepath, 'rb', compression=None if compression == 'infer' else compression,
+                    is_text=False) as handles:
+        for block in iter(lambda: handles.handle.read(COUNT_BLOCK_SIZE), b''):
+            newlines += block.count(b'\n')
+            last = block[-1:]
+    return newlines - (last == b'\n')
+
+
+def collect_chunks(chunks: Iterator[Tuple[np.ndarray, Optional[np.ndarray]]],
+                   max_rows: int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    data = None
+    labels = None
+    stop = 0
+    
+    for block, block_labels in chunks:
+        start, stop = stop, stop + len(block)
+        if data is None:
+            data = np.empty((max(max_rows, stop), block.shape[1]), dtype=block.dtype)
+        elif stop > len(data):
+            data = np.concatenate([data, np.empty((stop - len(data), data.shape[1]), dtype=data.dtype)])
+        data[start:stop] = block
+        if block_labels is not None:
+            if labels is None:
+                labels = np.empty(len(data), dtype=block_labels.dtype)
+            elif stop > len(labels):
+                labels = np.concatenate([labels, np.empty(stop - len(labels), dtype=labels.dtype)])
+            labels[start:stop] = block_labels
+    
+    if not stop:
+        raise ValueError("No rows found in the dataset")
+    
+    return data[:stop], labels[:stop] if labels is not None else None
+
+
+def _has_triple_header(filepath: str) -> bool:
+    try:
+        header = read_csv(filepath, nrows=0).columns
+    except Exception:
+        return False
+    return [str(col).strip().lower() for col in header] == TRIPLE_COLUMNS
+
+
+def is_sparse_input(filepath: str) -> bool:
+    if filepath.lower().endswith(SPARSE_EXTENSIONS):
+        return True
+    return filepath.lower().endswith('.csv') and _has_triple_header(filepath)
+
+
+def load_triples(filepath: str, chunksize: int = DEFAULT_CHUNKSIZE) -> 'sp.csr_matrix':
+    import scipy.sparse as sp
+    
+    rows, cols, values = [], [], []
+    reader = read_csv(filepath, dtype={0: np.int64, 1: np.int64, 2: np.float64}, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            rows.append(chunk.iloc[:, 0].to_numpy())
+            cols.append(chunk.iloc[:, 1].to_numpy())
+            values.append(chunk.iloc[:, 2].to_numpy())
+    
+    if not rows:
+        raise ValueError("No entries found in the sparse dataset")
+    
+    rows, cols, values = np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+    shape = (int(rows.max()) + 1, int(cols.max()) + 1)
+    return sp.coo_matrix((values, (rows, cols)), shape=shape).tocsr()
+
+
+def load_sparse(filepath: str) -> Tuple['sp.csr_matrix', List[str]]:
+    import scipy.io
+    import scipy.sparse as sp
+    
+    try:
+        lower = filepath.lower()
+        if lower.endswith('.npz'):
+            data = sp.load_npz(filepath)
+        elif lower.endswith(('.mtx', '.mtx.gz')):
+            data = scipy.io.mmread(filepath)
+        else:
+            data = load_triples(filepath)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}")
+    except ValueError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error loading file: {str(e)}")
+    
+    data = sp.csr_matrix(data, dtype=np.float64)
+    if data.shape[1] == 0:
+        raise ValueError("No numeric columns found in the dataset")
     
-    return prepare_data_from_dataframe(df)
+    feature_names = [f'feature_{i+1}' for i in range(data.shape[1])]
+    return data, feature_names
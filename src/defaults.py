@@ -0,0 +1,14 @@
+import os
+
+
+DEFAULT_CHUNKSIZE = 100_000
+CSV_ENGINES = ['auto', 'c', 'pyarrow']
+SOLVERS = ('auto', 'covariance_eigh', 'randomized', 'full')
+KERNELS = ('rbf', 'laplacian', 'poly', 'cosine')
+KERNEL_APPROXIMATIONS = ('nystroem', 'fourier')
+DEFAULT_KERNEL_RANK = 500
+SCATTER_MODES = ('auto', 'markers', 'webgl', 'density')
+DEFAULT_DPI = 300
+DEFAULT_FORMAT = 'png'
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'pca_dashboard')
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
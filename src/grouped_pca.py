@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+from typing import Tuple, Optional, List
+
+from pca_analyzer import compute_pca
+from sharded_pca import attach_shared, create_shared, default_workers
+
+
+GROUP_COPY_BLOCK_ROWS = 65_536
+MIN_GROUP_ROWS = 2
+
+_shared = {}
+
+
+def _init_worker(name: str, shape: Tuple[int, int], dtype: str):
+    threadpool_limits(1)
+    _shared['shm'], _shared['data'] = attach_shared(name, shape, dtype)
+
+
+def _fit_group(start: int, stop: int, n_components: Optional[int], solver: str):
+    block = _shared['data'][start:stop]
+    if n_components is not None:
+        n_components = min(n_components, *block.shape)
+    if solver == 'randomized' and n_components is None:
+        solver = 'auto'
+    
+    pca, _ = compute_pca(block, n_components, solver, copy=False)
+    pca.n_samples_ = stop - start
+    return pca
+
+
+def group_rows(labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    codes, groups = pd.factorize(pd.Series(labels), sort=True)
+    order = np.argsort(codes, kind='stable')
+    order = order[codes[order] >= 0]
+    bounds = np.searchsorted(codes[order], np.arange(len(groups) + 1))
+    return order, np.asarray(groups), bounds
+
+
+def compute_pca_grouped(data: np.ndarray, labels: np.ndarray, n_components: Optional[int] = None,
+                        solver: str = 'auto', workers: Optional[int] = None) -> List[dict]:
+    order, groups, bounds = group_rows(labels)
+    jobs = [(i, int(bounds[i]), int(bounds[i + 1])) for i in range(len(groups))]
+    jobs.sort(key=lambda job: job[2] - job[1], reverse=True)
+    
+    results = [{'group': groups[i], 'rows': stop - start, 'pca': None} for i, start, stop in sorted(jobs)]
+    fit_jobs = [job for job in jobs if job[2] - job[1] >= MIN_GROUP_ROWS]
+    if not fit_jobs:
+        return results
+    
+    shm, shared = create_shared((len(order), data.shape[1]), data.dtype)
+    try:
+        for start in range(0, len(order), GROUP_COPY_BLOCK_ROWS):
+            shared[start:start + GROUP_COPY_BLOCK_ROWS] = data[order[start:start + GROUP_COPY_BLOCK_ROWS]]
+        
+        max_workers = min(workers or default_workers(), len(fit_jobs))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shm.name, shared.shape, shared.dtype.str)) as executor:
+            futures = {i: executor.submit(_fit_group, start, stop, n_components, solver)
+                       for i, start, stop in fit_jobs}
+            for i, future in futures.items():
+                results[i]['pca'] = future.result()
+    finally:
+        del shared
+        shm.close()
+        shm.unlink()
+    
+    return results
@@ -0,0 +1,177 @@
+import json
+import os
+import struct
+import numpy as np
+from typing import Tuple, Optional, List, Iterable
+
+
+MODEL_FORMAT_VERSION = 1
+STATE_FORMAT_VERSION = 1
+STATE_SUFFIX = '.pcastate.npz'
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+NPY_HEADER_SIZE = 128
+
+
+def save_model(path: str, scaler, pca, feature_names: List[str], label_col: Optional[str] = None):
+    np.savez(
+        path,
+        format_version=MODEL_FORMAT_VERSION,
+        mean=np.asarray(scaler.mean_, dtype=np.float64),
+        scale=np.asarray(scaler.scale_, dtype=np.float64),
+        pca_mean=np.asarray(pca.mean_, dtype=np.float64),
+        components=np.asarray(pca.components_, dtype=np.float64),
+        explained_variance=np.asarray(pca.explained_variance_, dtype=np.float64),
+        explained_variance_ratio=np.asarray(pca.explained_variance_ratio_, dtype=np.float64),
+        n_samples=int(scaler.n_samples_seen_),
+        metadata=json.dumps({'feature_names': list(feature_names), 'label_column': label_col}),
+    )
+
+
+def load_model(path: str) -> dict:
+    with np.load(path, allow_pickle=False) as artifact:
+        if int(artifact['format_version']) != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported model format version: {int(artifact['format_version'])}")
+        
+        model = {name: artifact[name] for name in artifact.files if name != 'metadata'}
+        model.update(json.loads(str(artifact['metadata'])))
+    
+    model['n_samples'] = int(model['n_samples'])
+    model['n_components'] = len(model['components'])
+    model['weights'], model['offset'] = projection_affine(model)
+    return model
+
+
+def state_path(data_file: str) -> str:
+    return data_file + STATE_SUFFIX
+
+
+def save_state(path: str, covariance, feature_names: List[str], label_col: Optional[str],
+               header: bytes, offset: int):
+    tmp_path = path + '.tmp.npz'
+    np.savez(
+        tmp_path,
+        format_version=STATE_FORMAT_VERSION,
+        n_samples=int(covariance.n_samples),
+        mean=np.asarray(covariance.mean, dtype=np.float64),
+        scatter=np.asarray(covariance.scatter, dtype=np.float64),
+        header=np.frombuffer(header, dtype=np.uint8),
+        offset=int(offset),
+        metadata=json.dumps({'feature_names': list(feature_names), 'label_column': label_col}),
+    )
+    os.replace(tmp_path, path)
+
+
+def load_state(path: str) -> dict:
+    from pca_analyzer import RunningCovariance
+    
+    with np.load(path, allow_pickle=False) as artifact:
+        if int(artifact['format_version']) != STATE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported state format version: {int(artifact['format_version'])}")
+        
+        state = json.loads(str(artifact['metadata']))
+        covariance = RunningCovariance(len(artifact['mean']))
+        covariance.n_samples = int(artifact['n_samples'])
+        covariance.mean = artifact['mean']
+        covariance.scatter = artifact['scatter']
+        state['covariance'] = covariance
+        state['header'] = artifact['header'].tobytes()
+        state['offset'] = int(artifact['offset'])
+    
+    return state
+
+
+def projection_affine(model: dict) -> Tuple[np.ndarray, np.ndarray]:
+    components = model['components']
+    weights = (components / model['scale']).T
+    offset = -(model['mean'] / model['scale'] + model['pca_mean']) @ components.T
+    return np.ascontiguousarray(weights), offset
+
+
+def project(model: dict, block: np.ndarray) -> np.ndarray:
+    projected = block @ model['weights']
+    projected += model['offset']
+    return projected
+
+
+def project_with_error(model: dict, block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    centered = (block - model['mean']) / model['scale'] - model['pca_mean']
+    projected = centered @ model['components'].T
+    residual = np.einsum('ij,ij->i', centered, centered) - np.einsum('ij,ij->i', projected, projected)
+    return projected, np.maximum(residual, 0.0) / centered.shape[1]
+
+
+def _npy_header(shape: Tuple[int, int], dtype: np.dtype) -> bytes:
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%20d, %d), }" % (
+        np.lib.format.dtype_to_descr(dtype), shape[0], shape[1]
+    )
+    header = header.ljust(NPY_HEADER_SIZE - len(NPY_MAGIC) - 3) + '\n'
+    return NPY_MAGIC + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+class NpyStreamWriter:
+    def __init__(self, path: str, n_columns: int, dtype=np.float32):
+        self.path = path
+        self.n_columns = n_columns
+        self.dtype = np.dtype(dtype)
+        self.n_rows = 0
+        self._file = open(path, 'wb')
+        self._file.write(_npy_header((0, n_columns), self.dtype))
+    
+    def write(self, block: np.ndarray, labels: Optional[np.ndarray] = None):
+        np.ascontiguousarray(block, dtype=self.dtype).tofile(self._file)
+        self.n_rows += len(block)
+    
+    def close(self):
+        self._file.seek(0)
+        self._file.write(_npy_header((self.n_rows, self.n_columns), self.dtype))
+        self._file.close()
+
+
+class ParquetStreamWriter:
+    def __init__(self, path: str, n_columns: int, dtype=np.float32, label_col: Optional[str] = None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        
+        self._pa = pa
+        self.columns = [f'PC{i+1}' for i in range(n_columns)]
+        self.label_col = label_col
+        self.dtype = np.dtype(dtype)
+        self.n_rows = 0
+        
+        fields = [pa.field(name, pa.from_numpy_dtype(self.dtype)) for name in self.columns]
+        if label_col:
+            fields.append(pa.field(label_col, pa.string()))
+        self._writer = pq.ParquetWriter(path, pa.schema(fields))
+    
+    def write(self, block: np.ndarray, labels: Optional[np.ndarray] = None):
+        block = np.asarray(block, dtype=self.dtype)
+        arrays = [self._pa.array(block[:, i]) for i in range(block.shape[1])]
+        if self.label_col:
+            arrays.append(self._pa.array(labels.astype(str) if labels is not None else [None] * len(block),
+                                         type=self._pa.string()))
+        self._writer.write_batch(self._pa.record_batch(arrays, schema=self._writer.schema))
+        self.n_rows += len(block)
+    
+    def close(self):
+        self._writer.close()
+
+
+def open_projection_writer(path: str, n_columns: int, dtype=np.float32, label_col: Optional[str] = None):
+    if path.endswith('.npy'):
+        return NpyStreamWriter(path, n_columns, dtype)
+    if path.endswith('.parquet'):
+        return ParquetStreamWriter(path, n_columns, dtype, label_col)
+    raise ValueError(f"Unsupported output format for {path}, expected .npy or .parquet")
+
+
+def apply_model(model: dict, chunks: Iterable[Tuple[np.ndarray, Optional[np.ndarray]]], writer) -> int:
+    try:
+        for block, labels in chunks:
+            writer.write(project(model, block), labels)
+    finally:
+        writer.close()
+    
+    return writer.n_rows
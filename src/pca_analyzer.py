@@ -1,23 +1,432 @@
+import copy
 import numpy as np
 import pandas as pd
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 from sklearn.preprocessing import StandardScaler
-from typing import Tuple, Optional
+from typing import TYPE_CHECKING, List, Tuple, Optional, Iterable, Iterator
 
+from defaults import SOLVERS, KERNELS, KERNEL_APPROXIMATIONS, DEFAULT_KERNEL_RANK
 
-def standardize_data(data: pd.DataFrame) -> np.ndarray:
-    scaler = StandardScaler()
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+    from scipy.sparse.linalg import LinearOperator
+
+
+TALL_RATIO = 10
+MAX_EIGH_FEATURES = 2000
+RANDOMIZED_FRACTION = 0.8
+MIN_RANDOMIZED_DIM = 500
+SPARSE_DEFAULT_COMPONENTS = 10
+KERNEL_DEFAULT_COMPONENTS = 10
+KERNEL_BLOCK_ROWS = 16_384
+STANDARDIZE_BLOCK_BYTES = 16 * 1024 ** 2
+
+
+class RunningMoments:
+    def __init__(self, n_features: int):
+        self.n_samples = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+    
+    def update(self, block: np.ndarray) -> 'RunningMoments':
+        if len(block) == 0:
+            return self
+        
+        other = RunningMoments(block.shape[1])
+        other.n_samples = len(block)
+        other.mean = block.mean(axis=0)
+        other.m2 = ((block - other.mean) ** 2).sum(axis=0)
+        return self.merge(other)
+    
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        if other.n_samples == 0:
+            return self
+        if self.n_samples == 0:
+            self.n_samples = other.n_samples
+            self.mean = other.mean.copy()
+            self.m2 = other.m2.copy()
+            return self
+        
+        n = self.n_samples + other.n_samples
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.n_samples / n)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.n_samples * other.n_samples / n)
+        self.n_samples = n
+        return self
+    
+    @property
+    def variance(self) -> np.ndarray:
+        if self.n_samples == 0:
+            return np.zeros_like(self.m2)
+        return self.m2 / self.n_samples
+    
+    def to_scaler(self) -> StandardScaler:
+        if self.n_samples == 0:
+            raise ValueError("No rows found in the dataset")
+        
+        variance = self.variance
+        scale = np.sqrt(variance)
+        scale[scale < 10 * np.finfo(scale.dtype).eps * np.maximum(np.abs(self.mean), 1.0)] = 1.0
+        
+        scaler = StandardScaler()
+        scaler.mean_ = self.mean.copy()
+        scaler.var_ = variance
+        scaler.scale_ = scale
+        scaler.n_samples_seen_ = self.n_samples
+        scaler.n_features_in_ = len(self.mean)
+        return scaler
+
+
+class RunningCovariance:
+    def __init__(self, n_features: int):
+        self.n_samples = 0
+        self.mean = np.zeros(n_features)
+        self.scatter = np.zeros((n_features, n_features))
+    
+    def update(self, block: np.ndarray) -> 'RunningCovariance':
+        if len(block) == 0:
+            return self
+        
+        other = RunningCovariance(block.shape[1])
+        other.n_samples = len(block)
+        other.mean = block.mean(axis=0, dtype=np.float64)
+        centered = block - other.mean
+        other.scatter = centered.T @ centered
+        return self.merge(other)
+    
+    def merge(self, other: 'RunningCovariance') -> 'RunningCovariance':
+        if other.n_samples == 0:
+            return self
+        if self.n_samples == 0:
+            self.n_samples = other.n_samples
+            self.mean = other.mean.copy()
+            self.scatter = other.scatter.copy()
+            return self
+        
+        n = self.n_samples + other.n_samples
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.n_samples / n)
+        self.scatter = self.scatter + other.scatter + np.outer(delta, delta) * (self.n_samples * other.n_samples / n)
+        self.n_samples = n
+        return self
+    
+    def select(self, columns: List[int]) -> 'RunningCovariance':
+        selected = RunningCovariance(len(columns))
+        selected.n_samples = self.n_samples
+        selected.mean = self.mean[columns]
+        selected.scatter = self.scatter[np.ix_(columns, columns)]
+        return selected
+    
+    def to_moments(self) -> RunningMoments:
+        moments = RunningMoments(len(self.mean))
+        moments.n_samples = self.n_samples
+        moments.mean = self.mean.copy()
+        moments.m2 = np.diag(self.scatter).copy()
+        return moments
+    
+    def to_scaler(self) -> StandardScaler:
+        return self.to_moments().to_scaler()
+
+
+def standardize_inplace(data: np.ndarray) -> StandardScaler:
+    moments = RunningMoments(data.shape[1])
+    moments.n_samples = data.shape[0]
+    step = max(1, STANDARDIZE_BLOCK_BYTES // (8 * max(data.shape[0], 1)))
+    
+    for start in range(0, data.shape[1], step):
+        block = data[:, start:start + step]
+        moments.mean[start:start + block.shape[1]] = block.mean(axis=0, dtype=np.float64)
+        moments.m2[start:start + block.shape[1]] = block.var(axis=0, dtype=np.float64) * data.shape[0]
+    
+    scaler = moments.to_scaler()
+    for start in range(0, data.shape[1], step):
+        block = data[:, start:start + step]
+        block -= scaler.mean_[start:start + block.shape[1]].astype(data.dtype)
+        block /= scaler.scale_[start:start + block.shape[1]].astype(data.dtype)
+    
+    return scaler
+
+
+def fit_standardize(data: pd.DataFrame, copy: bool = True) -> Tuple[StandardScaler, np.ndarray]:
+    if (not copy and isinstance(data, np.ndarray) and data.flags.writeable
+            and data.dtype in (np.float32, np.float64)):
+        return standardize_inplace(data), data
+    
+    scaler = StandardScaler(copy=copy)
     standardized_data = scaler.fit_transform(data)
+    return scaler, standardized_data
+
+
+def standardize_data(data: pd.DataFrame) -> np.ndarray:
+    _, standardized_data = fit_standardize(data)
     return standardized_data
 
 
-def compute_pca(data: np.ndarray, n_components: Optional[int] = None) -> Tuple[PCA, np.ndarray]:
-    pca = PCA(n_components=n_components)
+def select_solver(n_samples: int, n_features: int, n_components: Optional[int] = None) -> str:
+    if n_features <= MAX_EIGH_FEATURES and n_samples >= TALL_RATIO * n_features:
+        return 'covariance_eigh'
+    
+    if (n_components is not None
+            and max(n_samples, n_features) >= MIN_RANDOMIZED_DIM
+            and n_components < RANDOMIZED_FRACTION * min(n_samples, n_features)):
+        return 'randomized'
+    
+    return 'full'
+
+
+def compute_pca(data: np.ndarray, n_components: Optional[int] = None,
+                solver: str = 'auto', copy: bool = True) -> Tuple[PCA, np.ndarray]:
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown PCA solver '{solver}', expected one of: {', '.join(SOLVERS)}")
+    
+    if solver == 'auto':
+        solver = select_solver(data.shape[0], data.shape[1], n_components)
+    
+    if solver == 'randomized' and n_components is None:
+        raise ValueError("The randomized solver requires an explicit number of components")
+    
+    pca = PCA(n_components=n_components, svd_solver=solver, copy=copy,
+              random_state=0 if solver == 'randomized' else None)
     transformed_data = pca.fit_transform(data)
     return pca, transformed_data
 
 
+def truncate_pca(pca: PCA, n_components: Optional[int] = None) -> PCA:
+    if n_components is None or n_components >= pca.n_components_:
+        return pca
+    
+    truncated = copy.copy(pca)
+    truncated.components_ = pca.components_[:n_components]
+    truncated.explained_variance_ = pca.explained_variance_[:n_components]
+    truncated.explained_variance_ratio_ = pca.explained_variance_ratio_[:n_components]
+    truncated.singular_values_ = pca.singular_values_[:n_components]
+    truncated.n_components_ = n_components
+    truncated.n_components = n_components
+    return truncated
+
+
 def get_variance_metrics(pca: PCA) -> Tuple[np.ndarray, np.ndarray]:
     explained_variance_ratio = pca.explained_variance_ratio_
     cumulative_variance = np.cumsum(explained_variance_ratio)
     return explained_variance_ratio, cumulative_variance
+
+
+def components_for_variance(cumulative_variance: np.ndarray, threshold: float) -> Optional[int]:
+    reached = np.nonzero(np.asarray(cumulative_variance) >= threshold)[0]
+    return int(reached[0]) + 1 if len(reached) else None
+
+
+def fit_scaler_streaming(blocks: Iterable[np.ndarray]) -> StandardScaler:
+    moments = None
+    
+    for block in blocks:
+        if moments is None:
+            moments = RunningMoments(block.shape[1])
+        moments.update(block)
+    
+    if moments is None:
+        raise ValueError("No rows found in the dataset")
+    
+    return moments.to_scaler()
+
+
+def select_features(scaler: StandardScaler, columns: List[int]) -> StandardScaler:
+    selected = copy.copy(scaler)
+    selected.mean_ = scaler.mean_[columns]
+    selected.var_ = scaler.var_[columns]
+    selected.scale_ = scaler.scale_[columns]
+    selected.n_features_in_ = len(columns)
+    return selected
+
+
+def _rebatch(blocks: Iterable[np.ndarray], min_rows: int) -> Iterator[np.ndarray]:
+    pending = []
+    pending_rows = 0
+    ready = None
+    
+    for block in blocks:
+        pending.append(block)
+        pending_rows += len(block)
+        if pending_rows >= min_rows:
+            if ready is not None:
+                yield ready
+            ready = np.concatenate(pending) if len(pending) > 1 else pending[0]
+            pending = []
+            pending_rows = 0
+    
+    if pending:
+        tail = np.concatenate(pending) if len(pending) > 1 else pending[0]
+        ready = tail if ready is None else np.concatenate([ready, tail])
+    
+    if ready is not None:
+        yield ready
+
+
+def compute_pca_incremental(blocks: Iterable[np.ndarray], scaler: StandardScaler,
+                            n_components: Optional[int] = None) -> IncrementalPCA:
+    if n_components is None:
+        n_components = scaler.n_features_in_
+    
+    pca = IncrementalPCA(n_components=n_components)
+    
+    for batch in _rebatch(blocks, n_components):
+        pca.partial_fit(scaler.transform(batch))
+    
+    if not hasattr(pca, 'components_'):
+        raise ValueError("No rows found in the dataset")
+    
+    return pca
+
+
+def _pca_from_spectrum(components: np.ndarray, explained_variance: np.ndarray, total_variance: float,
+                       n_samples: int, svd_solver: str) -> Tuple[PCA, np.ndarray]:
+    n_components, n_features = components.shape
+    
+    signs = np.sign(components[np.arange(n_components), np.argmax(np.abs(components), axis=1)])
+    signs[signs == 0] = 1.0
+    
+    pca = PCA(n_components=n_components, svd_solver=svd_solver)
+    pca.components_ = components * signs[:, None]
+    pca.explained_variance_ = explained_variance
+    pca.explained_variance_ratio_ = explained_variance / total_variance
+    pca.singular_values_ = np.sqrt(explained_variance * (n_samples - 1))
+    pca.mean_ = np.zeros(n_features)
+    pca.n_components_ = n_components
+    pca.n_samples_ = n_samples
+    pca.n_features_in_ = n_features
+    pca.noise_variance_ = max((total_variance - explained_variance.sum()) / max(n_features - n_components, 1), 0.0)
+    return pca, signs
+
+
+def compute_pca_from_covariance(covariance: RunningCovariance,
+                                n_components: Optional[int] = None) -> Tuple[StandardScaler, PCA]:
+    n_samples, n_features = covariance.n_samples, len(covariance.mean)
+    if n_samples < 2:
+        raise ValueError("At least two rows are needed to compute PCA")
+    if n_components is None:
+        n_components = min(n_samples, n_features)
+    if not 1 <= n_components <= min(n_samples, n_features):
+        raise ValueError(f"n_components must be between 1 and {min(n_samples, n_features)}, got {n_components}")
+    
+    scaler = covariance.to_scaler()
+    correlation = covariance.scatter / np.outer(scaler.scale_, scaler.scale_) / (n_samples - 1)
+    eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+    eigenvalues = np.maximum(eigenvalues[::-1], 0.0)
+    
+    pca, _ = _pca_from_spectrum(eigenvectors[:, ::-1][:, :n_components].T, eigenvalues[:n_components],
+                                eigenvalues.sum(), n_samples, 'covariance_eigh')
+    return scaler, pca
+
+
+def sparse_column_moments(data: 'sp.spmatrix') -> RunningMoments:
+    import scipy.sparse as sp
+    
+    data = sp.csr_matrix(data)
+    n_samples = data.shape[0]
+    mean = np.asarray(data.mean(axis=0)).ravel()
+    mean_sq = np.asarray(data.multiply(data).mean(axis=0)).ravel()
+    
+    moments = RunningMoments(data.shape[1])
+    moments.n_samples = n_samples
+    moments.mean = mean
+    moments.m2 = np.maximum(mean_sq - mean ** 2, 0.0) * n_samples
+    return moments
+
+
+def _standardized_operator(data: 'sp.csr_matrix', mean: np.ndarray, scale: np.ndarray) -> 'LinearOperator':
+    from scipy.sparse.linalg import LinearOperator
+    
+    data_t = data.T.tocsr()
+    
+    def matvec(v):
+        v = np.asarray(v).reshape(data.shape[1], -1) / scale[:, None]
+        return data @ v - (mean @ v)[None, :]
+    
+    def rmatvec(u):
+        u = np.asarray(u).reshape(data.shape[0], -1)
+        return (data_t @ u - np.outer(mean, u.sum(axis=0))) / scale[:, None]
+    
+    return LinearOperator(data.shape, matvec=matvec, rmatvec=rmatvec,
+                          matmat=matvec, rmatmat=rmatvec, dtype=np.float64)
+
+
+def compute_pca_sparse(data: 'sp.spmatrix', n_components: Optional[int] = None,
+                       scaler: Optional[StandardScaler] = None) -> Tuple[StandardScaler, PCA, np.ndarray]:
+    import scipy.sparse as sp
+    from scipy.sparse.linalg import svds
+    
+    data = sp.csr_matrix(data, dtype=np.float64)
+    n_samples, n_features = data.shape
+    max_components = min(n_samples, n_features) - 1
+    if n_components is None:
+        n_components = min(SPARSE_DEFAULT_COMPONENTS, max_components)
+    if not 1 <= n_components <= max_components:
+        raise ValueError(f"Sparse PCA needs 1 <= n_components <= {max_components}, got {n_components}")
+    
+    if scaler is None:
+        scaler = sparse_column_moments(data).to_scaler()
+    operator = _standardized_operator(data, scaler.mean_, scaler.scale_)
+    
+    v0 = np.full(min(n_samples, n_features), 1.0 / np.sqrt(min(n_samples, n_features)))
+    u, s, vt = svds(operator, k=n_components, v0=v0)
+    order = np.argsort(s)[::-1]
+    u, s, vt = u[:, order], s[order], vt[order]
+    
+    total_variance = (scaler.var_ / scaler.scale_ ** 2).sum() * n_samples / (n_samples - 1)
+    explained_variance = s ** 2 / (n_samples - 1)
+    
+    pca, signs = _pca_from_spectrum(vt, explained_variance, total_variance, n_samples, 'arpack')
+    pca.singular_values_ = s
+    
+    return scaler, pca, u * (s * signs)
+
+
+def kernel_feature_map(data: np.ndarray, method: str = 'nystroem', rank: int = DEFAULT_KERNEL_RANK,
+                       kernel: str = 'rbf', gamma: Optional[float] = None, seed: Optional[int] = 0):
+    from sklearn.kernel_approximation import Nystroem, RBFSampler
+    
+    if method not in KERNEL_APPROXIMATIONS:
+        raise ValueError(f"Unknown kernel approximation '{method}', expected one of: {', '.join(KERNEL_APPROXIMATIONS)}")
+    if kernel not in KERNELS:
+        raise ValueError(f"Unknown kernel '{kernel}', expected one of: {', '.join(KERNELS)}")
+    if gamma is None:
+        gamma = 1.0 / data.shape[1]
+    
+    if method == 'fourier':
+        if kernel != 'rbf':
+            raise ValueError("Random Fourier features only approximate the rbf kernel; use the nystroem method")
+        return RBFSampler(gamma=gamma, n_components=rank, random_state=seed).fit(data)
+    return Nystroem(kernel=kernel, gamma=gamma, n_components=min(rank, len(data)), random_state=seed).fit(data)
+
+
+def compute_pca_kernel(data: np.ndarray, n_components: Optional[int] = None, method: str = 'nystroem',
+                       rank: int = DEFAULT_KERNEL_RANK, kernel: str = 'rbf', gamma: Optional[float] = None,
+                       seed: Optional[int] = 0) -> Tuple[object, PCA, np.ndarray]:
+    n_samples = len(data)
+    if n_samples < 2:
+        raise ValueError("At least two rows are needed to compute PCA")
+    
+    feature_map = kernel_feature_map(data, method, rank, kernel, gamma, seed)
+    covariance = RunningCovariance(min(rank, n_samples) if method == 'nystroem' else rank)
+    for start in range(0, n_samples, KERNEL_BLOCK_ROWS):
+        covariance.update(feature_map.transform(data[start:start + KERNEL_BLOCK_ROWS]))
+    
+    n_features = len(covariance.mean)
+    if n_components is None:
+        n_components = min(KERNEL_DEFAULT_COMPONENTS, n_features)
+    if not 1 <= n_components <= n_features:
+        raise ValueError(f"Kernel PCA needs 1 <= n_components <= {n_features}, got {n_components}")
+    
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance.scatter / (n_samples - 1))
+    eigenvalues = np.maximum(eigenvalues[::-1], 0.0)
+    pca, _ = _pca_from_spectrum(eigenvectors[:, ::-1][:, :n_components].T, eigenvalues[:n_components],
+                                eigenvalues.sum(), n_samples, 'covariance_eigh')
+    pca.mean_ = covariance.mean
+    pca.kernel_approximation_ = method
+    
+    transformed_data = np.empty((n_samples, n_components))
+    for start in range(0, n_samples, KERNEL_BLOCK_ROWS):
+        features = feature_map.transform(data[start:start + KERNEL_BLOCK_ROWS])
+        transformed_data[start:start + len(features)] = (features - pca.mean_) @ pca.components_.T
+    
+    return feature_map, pca, transformed_data
@@ -0,0 +1,94 @@
+import cProfile
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Optional, List
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss survives execve, so a benchmark subprocess would start at its parent's peak
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+class Profiler:
+    def __init__(self, enabled: bool = True, cprofile: bool = False, verbose: bool = False):
+        self.enabled = enabled
+        self.cprofile = cprofile
+        self.verbose = verbose
+        self.spans: List[dict] = []
+        self._profiles = {}
+        self.start_rss = peak_rss_mb() if enabled else 0.0
+        self._start = time.perf_counter()
+    
+    def span(self, name: str, rows: Optional[int] = None):
+        if not self.enabled:
+            return nullcontext({})
+        return self._span(name, rows)
+    
+    @contextmanager
+    def _span(self, name: str, rows: Optional[int]):
+        record = {'stage': name, 'rows': rows}
+        profile = cProfile.Profile() if self.cprofile else None
+        rss_before = peak_rss_mb()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if profile is not None:
+            profile.enable()
+        
+        try:
+            yield record
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._profiles[len(self.spans)] = profile
+            
+            record['wall_s'] = time.perf_counter() - wall
+            record['cpu_s'] = time.process_time() - cpu
+            peak = peak_rss_mb()
+            record['peak_rss_mb'] = peak
+            record['rss_growth_mb'] = peak - rss_before
+            if record['rows']:
+                record['rows_per_s'] = record['rows'] / record['wall_s'] if record['wall_s'] > 0 else None
+            self.spans.append(record)
+            
+            if self.verbose:
+                print(f"  [profile] {name}: {record['wall_s']:.3f}s wall, {record['cpu_s']:.3f}s CPU, "
+                      f"peak RSS {peak:.1f} MB ({peak - self.start_rss:+.1f} MB over startup)")
+    
+    def hottest(self) -> Optional[dict]:
+        return max(self.spans, key=lambda record: record['wall_s'], default=None)
+    
+    def dump_hottest(self, path: str) -> Optional[str]:
+        hottest = self.hottest()
+        if hottest is None:
+            return None
+        profile = self._profiles.get(self.spans.index(hottest))
+        if profile is None:
+            return None
+        profile.dump_stats(path)
+        return hottest['stage']
+    
+    def to_dict(self) -> dict:
+        return {
+            'spans': self.spans,
+            'total_wall_s': time.perf_counter() - self._start,
+            'startup_rss_mb': self.start_rss,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+    
+    def write_json(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+NULL_PROFILER = Profiler(enabled=False)
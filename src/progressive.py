@@ -0,0 +1,62 @@
+import copy
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+from sklearn.preprocessing import StandardScaler
+from typing import Tuple, Optional, List
+
+from pca_analyzer import fit_standardize, compute_pca
+
+
+PROGRESSIVE_MIN_ROWS = 20_000
+FIRST_SAMPLE_ROWS = 2_000
+SAMPLE_GROWTH = 4
+CONVERGENCE_TOLERANCE = 0.005
+
+
+def sample_schedule(n_samples: int, first: int = FIRST_SAMPLE_ROWS, growth: int = SAMPLE_GROWTH,
+                    min_rows: int = PROGRESSIVE_MIN_ROWS) -> List[int]:
+    if n_samples < min_rows:
+        return [n_samples]
+    
+    sizes = []
+    size = first
+    while size < n_samples:
+        sizes.append(size)
+        size *= growth
+    return sizes + [n_samples]
+
+
+def sample_order(n_samples: int, seed: Optional[int] = 0) -> np.ndarray:
+    return np.random.default_rng(seed).permutation(n_samples)
+
+
+def fit_sample(numeric_df: pd.DataFrame, rows: np.ndarray,
+               solver: str = 'auto') -> Tuple[StandardScaler, PCA, np.ndarray, np.ndarray]:
+    data = numeric_df.iloc[rows].to_numpy(dtype=np.float64)
+    scaler, standardized_data = fit_standardize(data, copy=False)
+    pca, transformed_data = compute_pca(standardized_data, solver=solver)
+    return scaler, pca, transformed_data, standardized_data
+
+
+def align_signs(pca: PCA, transformed_data: np.ndarray,
+                reference: Optional[np.ndarray]) -> Tuple[PCA, np.ndarray]:
+    if reference is None:
+        return pca, transformed_data
+    
+    k = min(len(reference), pca.n_components_)
+    signs = np.ones(pca.n_components_)
+    signs[:k] = np.where(np.einsum('ij,ij->i', pca.components_[:k], reference[:k]) < 0, -1.0, 1.0)
+    if np.all(signs > 0):
+        return pca, transformed_data
+    
+    aligned = copy.copy(pca)
+    aligned.components_ = pca.components_ * signs[:, None]
+    return aligned, transformed_data * signs
+
+
+def variance_change(previous: Optional[np.ndarray], current: np.ndarray) -> Optional[float]:
+    if previous is None:
+        return None
+    k = min(len(previous), len(current))
+    return float(np.max(np.abs(current[:k] - previous[:k])))
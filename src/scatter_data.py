@@ -0,0 +1,79 @@
+import numpy as np
+from typing import Tuple, Optional
+
+from defaults import SCATTER_MODES
+
+
+WEBGL_THRESHOLD = 10_000
+DENSITY_THRESHOLD = 250_000
+DEFAULT_BINS = 300
+MIN_POINTS_PER_LABEL = 1_000
+
+
+def select_scatter_mode(n_points: int, mode: str = 'auto') -> str:
+    if mode not in SCATTER_MODES:
+        raise ValueError(f"Unknown scatter mode '{mode}', expected one of: {', '.join(SCATTER_MODES)}")
+    
+    if mode != 'auto':
+        return mode
+    if n_points <= WEBGL_THRESHOLD:
+        return 'markers'
+    if n_points <= DENSITY_THRESHOLD:
+        return 'webgl'
+    return 'density'
+
+
+def stratified_sample(n_points: int, max_points: int, labels: Optional[np.ndarray] = None,
+                      min_per_label: int = MIN_POINTS_PER_LABEL, seed: int = 0) -> np.ndarray:
+    if n_points <= max_points:
+        return np.arange(n_points)
+    
+    rng = np.random.default_rng(seed)
+    if labels is None:
+        return np.sort(rng.choice(n_points, max_points, replace=False))
+    
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    quotas = np.maximum(np.minimum(counts, min_per_label),
+                        np.floor(counts * (max_points / n_points))).astype(int)
+    quotas = np.minimum(quotas, counts)
+    
+    order = np.argsort(inverse, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    
+    chosen = [rng.choice(order[start:start + count], quota, replace=False)
+              for start, count, quota in zip(starts, counts, quotas)]
+    return np.sort(np.concatenate(chosen))
+
+
+def bin_density(pc1: np.ndarray, pc2: np.ndarray, labels: Optional[np.ndarray] = None,
+                bins: int = DEFAULT_BINS) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    x_edges = np.histogram_bin_edges(pc1, bins=bins)
+    y_edges = np.histogram_bin_edges(pc2, bins=bins)
+    
+    if labels is None:
+        unique_labels = np.array([None])
+        codes = np.zeros(len(pc1), dtype=np.intp)
+    else:
+        unique_labels, codes = np.unique(labels, return_inverse=True)
+    
+    x_idx = np.clip(np.searchsorted(x_edges, pc1, side='right') - 1, 0, bins - 1)
+    y_idx = np.clip(np.searchsorted(y_edges, pc2, side='right') - 1, 0, bins - 1)
+    flat = (codes * bins + x_idx) * bins + y_idx
+    counts = np.bincount(flat, minlength=len(unique_labels) * bins * bins)
+    
+    return counts.reshape(len(unique_labels), bins, bins), x_edges, y_edges, unique_labels
+
+
+def shade_density(counts: np.ndarray, colors: np.ndarray) -> np.ndarray:
+    totals = counts.sum(axis=0)
+    occupied = totals > 0
+    
+    weights = counts / np.where(occupied, totals, 1)
+    rgb = np.tensordot(weights, colors[:, :3], axes=([0], [0]))
+    
+    alpha = np.zeros(totals.shape)
+    if occupied.any():
+        log_totals = np.log1p(totals)
+        alpha[occupied] = 0.25 + 0.75 * log_totals[occupied] / log_totals.max()
+    
+    return np.dstack([rgb, alpha]).transpose(1, 0, 2)
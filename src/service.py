@@ -0,0 +1,198 @@
+import asyncio
+import json
+import numpy as np
+from typing import Tuple, List, Optional
+
+from model_io import project_with_error
+
+
+DEFAULT_MAX_BATCH_ROWS = 4096
+DEFAULT_MAX_LATENCY_MS = 2.0
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class MicroBatcher:
+    def __init__(self, model: dict, max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+                 max_latency_ms: float = DEFAULT_MAX_LATENCY_MS):
+        self.model = model
+        self.max_batch_rows = max_batch_rows
+        self.max_latency = max_latency_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+        self._worker = None
+    
+    def start(self):
+        self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+    
+    async def submit(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+    
+    async def _collect(self) -> List[Tuple[np.ndarray, asyncio.Future]]:
+        pending = [await self.queue.get()]
+        n_rows = len(pending[0][0])
+        deadline = asyncio.get_running_loop().time() + self.max_latency
+        
+        while n_rows < self.max_batch_rows:
+            try:
+                item = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            pending.append(item)
+            n_rows += len(item[0])
+        
+        return pending
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = await self._collect()
+            block = np.concatenate([rows for rows, _ in pending]) if len(pending) > 1 else pending[0][0]
+            
+            try:
+                projected, errors = await loop.run_in_executor(None, project_with_error, self.model, block)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            self.batches += 1
+            self.rows += len(block)
+            
+            start = 0
+            for rows, future in pending:
+                stop = start + len(rows)
+                if not future.done():
+                    future.set_result((projected[start:stop], errors[start:stop]))
+                start = stop
+
+
+def parse_rows(payload: dict, feature_names: List[str]) -> np.ndarray:
+    if 'rows' in payload:
+        rows = np.asarray(payload['rows'], dtype=np.float64)
+    elif 'records' in payload:
+        rows = np.array([[record[name] for name in feature_names] for record in payload['records']],
+                        dtype=np.float64)
+    else:
+        raise ValueError("Request body must contain 'rows' or 'records'")
+    
+    if rows.ndim == 1:
+        rows = rows.reshape(1, -1)
+    if rows.ndim != 2 or rows.shape[1] != len(feature_names):
+        raise ValueError(f"Expected rows with {len(feature_names)} features, got shape {rows.shape}")
+    
+    return rows
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, dict, bytes]]:
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    
+    method, path, _ = request_line.decode('latin1').split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY_BYTES:
+        raise ValueError("Request body too large")
+    body = await reader.readexactly(length) if length else b''
+    
+    return method, path, headers, body
+
+
+def _response(status: str, payload: dict, keep_alive: bool) -> bytes:
+    body = json.dumps(payload).encode()
+    headers = [
+        f"HTTP/1.1 {status}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin1') + body
+
+
+def make_handler(batcher: MicroBatcher):
+    model = batcher.model
+    
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError) as e:
+                    writer.write(_response('400 Bad Request', {'error': str(e)}, False))
+                    break
+                if request is None:
+                    break
+                
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                
+                if method == 'GET' and path == '/health':
+                    status, payload = '200 OK', {
+                        'status': 'ok',
+                        'features': model['feature_names'],
+                        'n_components': model['n_components'],
+                        'batches': batcher.batches,
+                        'rows': batcher.rows,
+                    }
+                elif method == 'POST' and path == '/project':
+                    try:
+                        rows = parse_rows(json.loads(body), model['feature_names'])
+                        projected, errors = await batcher.submit(rows)
+                        status, payload = '200 OK', {
+                            'projections': projected.tolist(),
+                            'reconstruction_error': errors.tolist(),
+                        }
+                    except (ValueError, KeyError, TypeError) as e:
+                        status, payload = '400 Bad Request', {'error': str(e)}
+                else:
+                    status, payload = '404 Not Found', {'error': f"No route for {method} {path}"}
+                
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    return handle
+
+
+async def serve(model: dict, host: str = '127.0.0.1', port: int = 8000,
+                max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+                max_latency_ms: float = DEFAULT_MAX_LATENCY_MS):
+    batcher = MicroBatcher(model, max_batch_rows, max_latency_ms)
+    batcher.start()
+    server = await asyncio.start_server(make_handler(batcher), host, port)
+    
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
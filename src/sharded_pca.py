@@ -0,0 +1,197 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from sklearn.decomposition import PCA
+from sklearn.preprocessing import StandardScaler
+from typing import Tuple, Optional, List
+
+from data_loader import iter_numeric_chunks, surviving_features, DEFAULT_CHUNKSIZE, SNIFF_ROWS
+from pca_analyzer import RunningCovariance, compute_pca_from_covariance
+
+
+STATS_BLOCK_ROWS = 65_536
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def attach_shared(name: str, shape: Tuple[int, ...], dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def create_shared(shape: Tuple[int, ...], dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+    shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _write_slot(slot: np.ndarray, covariance: RunningCovariance):
+    d = len(covariance.mean)
+    slot[0] = covariance.n_samples
+    slot[1:1 + d] = covariance.mean
+    slot[1 + d:] = covariance.scatter.ravel()
+
+
+def _read_slot(slot: np.ndarray, n_features: int) -> RunningCovariance:
+    covariance = RunningCovariance(n_features)
+    covariance.n_samples = int(slot[0])
+    covariance.mean = slot[1:1 + n_features].copy()
+    covariance.scatter = slot[1 + n_features:].reshape(n_features, n_features).copy()
+    return covariance
+
+
+def _range_covariance(data: np.ndarray, start: int, stop: int) -> RunningCovariance:
+    covariance = RunningCovariance(data.shape[1])
+    for block_start in range(start, stop, STATS_BLOCK_ROWS):
+        covariance.update(data[block_start:min(block_start + STATS_BLOCK_ROWS, stop)])
+    return covariance
+
+
+def _row_range_statistics(data_name: str, data_shape: Tuple[int, int], dtype: str, start: int, stop: int,
+                          out_name: str, out_shape: Tuple[int, int], slot: int):
+    data_shm, data = attach_shared(data_name, data_shape, dtype)
+    out_shm, out = attach_shared(out_name, out_shape, np.float64)
+    try:
+        _write_slot(out[slot], _range_covariance(data, start, stop))
+    finally:
+        del data, out
+        data_shm.close()
+        out_shm.close()
+
+
+def _mapped_row_range_statistics(source: Tuple[str, int, str], data_shape: Tuple[int, int], dtype: str,
+                                 start: int, stop: int, out_name: str, out_shape: Tuple[int, int], slot: int):
+    filename, offset, order = source
+    data = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=data_shape, order=order)
+    out_shm, out = attach_shared(out_name, out_shape, np.float64)
+    try:
+        _write_slot(out[slot], _range_covariance(data, start, stop))
+    finally:
+        del data, out
+        out_shm.close()
+
+
+def file_source(data: np.ndarray) -> Optional[Tuple[str, int, str]]:
+    if not isinstance(data, np.memmap) or not isinstance(data.base, mmap.mmap) or data.mode not in ('r', 'r+'):
+        return None
+    if data.flags.c_contiguous:
+        return data.filename, data.offset, 'C'
+    if data.flags.f_contiguous:
+        return data.filename, data.offset, 'F'
+    return None
+
+
+def _file_statistics(filepath: str, feature_names: List[str], chunksize: int, dtype: str,
+                     out_name: str, out_shape: Tuple[int, int], slot: int) -> List[str]:
+    out_shm, out = attach_shared(out_name, out_shape, np.float64)
+    try:
+        covariance = RunningCovariance(len(feature_names))
+        dropped = []
+        for block, _ in iter_numeric_chunks(filepath, chunksize, feature_names, dtype=np.dtype(dtype),
+                                            dropped=dropped):
+            covariance.update(block)
+        _write_slot(out[slot], covariance)
+        return dropped
+    finally:
+        del out
+        out_shm.close()
+
+
+def merge_covariances(parts: List[RunningCovariance]) -> RunningCovariance:
+    if not parts:
+        raise ValueError("No shards to merge")
+    
+    while len(parts) > 1:
+        merged = [parts[i].merge(parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+        if len(parts) % 2:
+            merged.append(parts[-1])
+        parts = merged
+    return parts[0]
+
+
+def _gather(out: np.ndarray, n_features: int) -> RunningCovariance:
+    return merge_covariances([_read_slot(slot, n_features) for slot in out])
+
+
+def fit_covariance_parallel(data: np.ndarray, workers: Optional[int] = None) -> RunningCovariance:
+    workers = min(workers or default_workers(), max(len(data), 1))
+    n_samples, n_features = data.shape
+    if workers == 1:
+        covariance = RunningCovariance(n_features)
+        for start in range(0, n_samples, STATS_BLOCK_ROWS):
+            covariance.update(data[start:start + STATS_BLOCK_ROWS])
+        return covariance
+    
+    bounds = np.linspace(0, n_samples, workers + 1).astype(int)
+    out_shape = (workers, 1 + n_features + n_features ** 2)
+    task, handle, data_shm = _mapped_row_range_statistics, file_source(data), None
+    if handle is None:
+        data_shm, shared = create_shared(data.shape, data.dtype)
+        shared[:] = data
+        del shared
+        task, handle = _row_range_statistics, data_shm.name
+    out_shm, out = create_shared(out_shape, np.float64)
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(task, handle, data.shape, data.dtype.str,
+                                int(bounds[i]), int(bounds[i + 1]), out_shm.name, out_shape, i)
+                for i in range(workers)
+            ]
+            for future in futures:
+                future.result()
+        return _gather(out, n_features)
+    finally:
+        del out
+        if data_shm is not None:
+            data_shm.close()
+            data_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+
+
+def fit_covariance_shards(files: List[str], feature_names: List[str], workers: Optional[int] = None,
+                          chunksize: int = DEFAULT_CHUNKSIZE, dtype=np.float64,
+                          dropped: Optional[List[str]] = None) -> RunningCovariance:
+    n_features = len(feature_names)
+    out_shape = (len(files), 1 + n_features + n_features ** 2)
+    out_shm, out = create_shared(out_shape, np.float64)
+    found = []
+    
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers or default_workers(), len(files))) as executor:
+            futures = [
+                executor.submit(_file_statistics, filepath, feature_names, chunksize, np.dtype(dtype).str,
+                                out_shm.name, out_shape, i)
+                for i, filepath in enumerate(files)
+            ]
+            for future in futures:
+                found += [col for col in future.result() if col not in found]
+        covariance = _gather(out, n_features)
+    finally:
+        del out
+        out_shm.close()
+        out_shm.unlink()
+    
+    if not found:
+        return covariance
+    if dropped is None:
+        raise ValueError(f"Column '{found[0]}' holds non-numeric values beyond the first {SNIFF_ROWS} rows")
+    dropped.extend(found)
+    return covariance.select(surviving_features(feature_names, found))
+
+
+def compute_pca_sharded(data: np.ndarray, n_components: Optional[int] = None,
+                        workers: Optional[int] = None) -> Tuple[StandardScaler, PCA, np.ndarray]:
+    covariance = fit_covariance_parallel(data, workers)
+    scaler, pca = compute_pca_from_covariance(covariance, n_components)
+    
+    weights = (pca.components_ / scaler.scale_).T
+    transformed_data = data @ weights
+    transformed_data -= (scaler.mean_ / scaler.scale_) @ pca.components_.T
+    return scaler, pca, transformed_data
@@ -0,0 +1,27 @@
+from typing import Optional, List
+
+from pca_analyzer import get_variance_metrics, components_for_variance
+
+
+SUMMARY_TOP_N = 10
+
+
+def build_summary(filepath: str, feature_names: List[str], label_col: Optional[str], n_rows: int, pca,
+                  solver: str, timings: Optional[dict] = None) -> dict:
+    explained_variance_ratio, cumulative_variance = get_variance_metrics(pca)
+    top_n = min(SUMMARY_TOP_N, pca.n_components_)
+    
+    return {
+        'file': filepath,
+        'status': 'ok',
+        'rows': n_rows,
+        'original_features': len(feature_names),
+        'principal_components': int(pca.n_components_),
+        'solver': solver,
+        'label_column': label_col,
+        'explained_variance_ratio': explained_variance_ratio[:top_n].tolist(),
+        'cumulative_variance': cumulative_variance[:top_n].tolist(),
+        'components_for_80': components_for_variance(cumulative_variance, 0.80),
+        'components_for_95': components_for_variance(cumulative_variance, 0.95),
+        'timings': timings or {},
+    }
@@ -1,11 +1,42 @@
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Patch
+from matplotlib.ticker import MaxNLocator
 import numpy as np
-from typing import Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List
+
+from defaults import DEFAULT_DPI, DEFAULT_FORMAT
+from scatter_data import select_scatter_mode, stratified_sample, bin_density, shade_density, DEFAULT_BINS
+
+
+MAX_ANNOTATIONS = 30
+MAX_TICKS = 30
+MAX_MARKERS = 100
+MAX_BARS = 500
+
+
+def _annotation_indices(n: int) -> np.ndarray:
+    step = max(1, int(np.ceil(n / MAX_ANNOTATIONS)))
+    indices = np.arange(0, n, step)
+    if n and indices[-1] != n - 1:
+        indices = np.append(indices, n - 1)
+    return indices
+
+
+def _set_component_ticks(ax, component_numbers: np.ndarray):
+    if len(component_numbers) <= MAX_TICKS:
+        ax.set_xticks(component_numbers)
+    else:
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=MAX_TICKS // 2, integer=True))
 
 
 def plot_explained_variance_bar(explained_variance_ratio: np.ndarray, 
                                 n_components_to_show: Optional[int] = None,
-                                save_path: Optional[str] = None):
+                                save_path: Optional[str] = None,
+                                dpi: int = DEFAULT_DPI,
+                                interval: Optional[np.ndarray] = None):
     if n_components_to_show is None:
         n_components_to_show = len(explained_variance_ratio)
     
@@ -15,33 +46,49 @@ def plot_explained_variance_bar(explained_variance_ratio: np.ndarray,
     fig, ax = plt.subplots(figsize=(12, 6))
     component_numbers = np.arange(1, components_to_show + 1)
     
-    bars = ax.bar(component_numbers, variance_to_show * 100, 
-                  color='steelblue', alpha=0.7, edgecolor='black')
+    if interval is not None:
+        low, high = interval[:, :components_to_show] * 100
+    
+    if components_to_show <= MAX_BARS:
+        yerr = None
+        if interval is not None:
+            yerr = np.maximum([variance_to_show * 100 - low, high - variance_to_show * 100], 0)
+        ax.bar(component_numbers, variance_to_show * 100, 
+               color='steelblue', alpha=0.7,
+               edgecolor='black' if components_to_show <= MAX_MARKERS else 'none',
+               yerr=yerr, capsize=3 if components_to_show <= MAX_MARKERS else 0, ecolor='dimgray')
+    else:
+        ax.stairs(variance_to_show * 100, np.arange(0.5, components_to_show + 1),
+                  fill=True, color='steelblue', alpha=0.7)
+        if interval is not None:
+            ax.stairs(high, np.arange(0.5, components_to_show + 1), baseline=low,
+                      fill=True, color='dimgray', alpha=0.3)
     
-    for i, (bar, var) in enumerate(zip(bars, variance_to_show)):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{var*100:.1f}%',
+    for i in _annotation_indices(components_to_show):
+        ax.text(component_numbers[i], variance_to_show[i] * 100,
+                f'{variance_to_show[i]*100:.1f}%',
                 ha='center', va='bottom', fontsize=9)
     
     ax.set_xlabel('Principal Component', fontsize=12, fontweight='bold')
     ax.set_ylabel('Explained Variance (%)', fontsize=12, fontweight='bold')
     ax.set_title('Explained Variance by Principal Component', 
                  fontsize=14, fontweight='bold', pad=20)
-    ax.set_xticks(component_numbers)
+    _set_component_ticks(ax, component_numbers)
     ax.grid(axis='y', alpha=0.3, linestyle='--')
     
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
     
     return fig
 
 
 def plot_cumulative_variance(cumulative_variance: np.ndarray,
                             n_components_to_show: Optional[int] = None,
-                            save_path: Optional[str] = None):
+                            save_path: Optional[str] = None,
+                            dpi: int = DEFAULT_DPI,
+                            interval: Optional[np.ndarray] = None):
     if n_components_to_show is None:
         n_components_to_show = len(cumulative_variance)
     
@@ -52,7 +99,13 @@ def plot_cumulative_variance(cumulative_variance: np.ndarray,
     component_numbers = np.arange(1, components_to_show + 1)
     
     ax.plot(component_numbers, variance_to_show * 100, 
-            marker='o', linewidth=2, markersize=8, color='darkgreen')
+            marker='o' if components_to_show <= MAX_MARKERS else None,
+            linewidth=2, markersize=8, color='darkgreen')
+    
+    if interval is not None:
+        low, high = interval[:, :components_to_show] * 100
+        ax.fill_between(component_numbers, low, high, color='darkgreen', alpha=0.15,
+                        label='Bootstrap interval')
     
     for i, var in enumerate(variance_to_show):
         if i == 0 or i == len(variance_to_show) - 1 or i % max(1, len(variance_to_show) // 10) == 0:
@@ -67,7 +120,7 @@ def plot_cumulative_variance(cumulative_variance: np.ndarray,
     ax.set_ylabel('Cumulative Explained Variance (%)', fontsize=12, fontweight='bold')
     ax.set_title('Cumulative Explained Variance', 
                  fontsize=14, fontweight='bold', pad=20)
-    ax.set_xticks(component_numbers)
+    _set_component_ticks(ax, component_numbers)
     ax.grid(alpha=0.3, linestyle='--')
     ax.legend()
     ax.set_ylim([0, 105])
@@ -75,7 +128,7 @@ def plot_cumulative_variance(cumulative_variance: np.ndarray,
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
     
     return fig
 
@@ -83,7 +136,11 @@ def plot_cumulative_variance(cumulative_variance: np.ndarray,
 def plot_pca_scatter(transformed_data: np.ndarray,
                     labels: Optional[np.ndarray] = None,
                     label_column_name: Optional[str] = None,
-                    save_path: Optional[str] = None):
+                    save_path: Optional[str] = None,
+                    mode: str = 'auto',
+                    max_points: Optional[int] = None,
+                    bins: int = DEFAULT_BINS,
+                    dpi: int = DEFAULT_DPI):
     if transformed_data.shape[1] < 2:
         raise ValueError("Need at least 2 principal components for scatter plot")
     
@@ -92,21 +149,47 @@ def plot_pca_scatter(transformed_data: np.ndarray,
     pc1 = transformed_data[:, 0]
     pc2 = transformed_data[:, 1]
     
-    if labels is not None:
-        unique_labels = np.unique(labels)
-        colors = plt.cm.tab10(np.linspace(0, 1, len(unique_labels)))
+    if max_points is not None and len(pc1) > max_points:
+        sample = stratified_sample(len(pc1), max_points, labels)
+        pc1, pc2 = pc1[sample], pc2[sample]
+        labels = labels[sample] if labels is not None else None
+    
+    mode = select_scatter_mode(len(pc1), mode)
+    legend_title = label_column_name if label_column_name else 'Category'
+    
+    if mode == 'density':
+        counts, x_edges, y_edges, unique_labels = bin_density(pc1, pc2, labels, bins)
+        if labels is not None:
+            colors = plt.cm.tab10(np.linspace(0, 1, len(unique_labels)))
+        else:
+            colors = np.array([to_rgba('steelblue')])
         
-        for i, label in enumerate(unique_labels):
-            mask = labels == label
-            ax.scatter(pc1[mask], pc2[mask], 
-                      c=[colors[i]], label=str(label),
-                      alpha=0.6, s=50, edgecolors='black', linewidth=0.5)
+        ax.imshow(shade_density(counts, colors), origin='lower', aspect='auto', interpolation='nearest',
+                  extent=[x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]])
         
-        ax.legend(title=label_column_name if label_column_name else 'Category',
-                 fontsize=10, title_fontsize=11, loc='best')
+        if labels is not None:
+            handles = [Patch(color=colors[i], label=str(label)) for i, label in enumerate(unique_labels)]
+            ax.legend(handles=handles, title=legend_title,
+                     fontsize=10, title_fontsize=11, loc='best')
     else:
-        ax.scatter(pc1, pc2, alpha=0.6, s=50, 
-                  c='steelblue', edgecolors='black', linewidth=0.5)
+        if mode == 'markers':
+            style = dict(alpha=0.6, s=50, edgecolors='black', linewidth=0.5)
+        else:
+            style = dict(alpha=0.4, s=4, linewidth=0, rasterized=True)
+        
+        if labels is not None:
+            unique_labels = np.unique(labels)
+            colors = plt.cm.tab10(np.linspace(0, 1, len(unique_labels)))
+            
+            for i, label in enumerate(unique_labels):
+                mask = labels == label
+                ax.scatter(pc1[mask], pc2[mask], 
+                          c=[colors[i]], label=str(label), **style)
+            
+            ax.legend(title=legend_title,
+                     fontsize=10, title_fontsize=11, loc='best', markerscale=1 if mode == 'markers' else 4)
+        else:
+            ax.scatter(pc1, pc2, c='steelblue', **style)
     
     ax.set_xlabel(f'First Principal Component (PC1)', 
                  fontsize=12, fontweight='bold')
@@ -119,33 +202,89 @@ def plot_pca_scatter(transformed_data: np.ndarray,
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
     
     return fig
 
 
 def create_dashboard(results: dict, n_components_to_show: Optional[int] = None,
-                    save_dir: Optional[str] = None):
+                    save_dir: Optional[str] = None, scatter_mode: str = 'auto',
+                    scatter_max_points: Optional[int] = None,
+                    dpi: int = DEFAULT_DPI, fmt: str = DEFAULT_FORMAT):
     if n_components_to_show is None:
         n_components_to_show = results['n_components']
+    bootstrap = results.get('bootstrap')
     
     fig1 = plot_explained_variance_bar(
         results['explained_variance_ratio'],
         n_components_to_show,
-        save_path=f"{save_dir}/explained_variance_bar.png" if save_dir else None
+        save_path=f"{save_dir}/explained_variance_bar.{fmt}" if save_dir else None,
+        dpi=dpi,
+        interval=bootstrap['ratio_interval'] if bootstrap else None
     )
     
     fig2 = plot_cumulative_variance(
         results['cumulative_variance'],
         n_components_to_show,
-        save_path=f"{save_dir}/cumulative_variance.png" if save_dir else None
+        save_path=f"{save_dir}/cumulative_variance.{fmt}" if save_dir else None,
+        dpi=dpi,
+        interval=bootstrap['cumulative_interval'] if bootstrap else None
     )
     
     fig3 = plot_pca_scatter(
         results['transformed_data'],
         results['labels'],
         results['label_column'],
-        save_path=f"{save_dir}/pca_scatter.png" if save_dir else None
+        save_path=f"{save_dir}/pca_scatter.{fmt}" if save_dir else None,
+        mode=scatter_mode,
+        max_points=scatter_max_points,
+        dpi=dpi
     )
     
     return fig1, fig2, fig3
+
+
+def _render_to_file(plot_name: str, args: tuple, kwargs: dict) -> str:
+    plt.switch_backend('Agg')
+    plot_function = {
+        'bar': plot_explained_variance_bar,
+        'cumulative': plot_cumulative_variance,
+        'scatter': plot_pca_scatter,
+    }[plot_name]
+    fig = plot_function(*args, **kwargs)
+    plt.close(fig)
+    return kwargs['save_path']
+
+
+def render_dashboard(results: dict, save_dir: str, n_components_to_show: Optional[int] = None,
+                     scatter_mode: str = 'auto', scatter_max_points: Optional[int] = None,
+                     dpi: int = DEFAULT_DPI, fmt: str = DEFAULT_FORMAT,
+                     workers: Optional[int] = None) -> List[str]:
+    if n_components_to_show is None:
+        n_components_to_show = results['n_components']
+    
+    transformed_data = results['transformed_data']
+    if transformed_data.shape[1] > 2:
+        transformed_data = np.ascontiguousarray(transformed_data[:, :2])
+    else:
+        transformed_data = np.asarray(transformed_data)
+    bootstrap = results.get('bootstrap')
+    
+    jobs = [
+        ('bar', (np.asarray(results['explained_variance_ratio']), n_components_to_show),
+         dict(save_path=os.path.join(save_dir, f"explained_variance_bar.{fmt}"), dpi=dpi,
+              interval=bootstrap['ratio_interval'] if bootstrap else None)),
+        ('cumulative', (np.asarray(results['cumulative_variance']), n_components_to_show),
+         dict(save_path=os.path.join(save_dir, f"cumulative_variance.{fmt}"), dpi=dpi,
+              interval=bootstrap['cumulative_interval'] if bootstrap else None)),
+        ('scatter', (transformed_data, results['labels'], results['label_column']),
+         dict(save_path=os.path.join(save_dir, f"pca_scatter.{fmt}"), mode=scatter_mode,
+              max_points=scatter_max_points, dpi=dpi)),
+    ]
+    
+    if workers == 1:
+        return [_render_to_file(*job) for job in jobs]
+    
+    with ProcessPoolExecutor(max_workers=min(workers or len(jobs), len(jobs))) as executor:
+        futures = [executor.submit(_render_to_file, *job) for job in jobs]
+        return [future.result() for future in futures]
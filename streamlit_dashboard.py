@@ -4,13 +4,20 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from io import StringIO
+import hashlib
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from data_loader import prepare_data_from_dataframe
-from pca_analyzer import standardize_data, compute_pca, get_variance_metrics
+from data_loader import prepare_data_from_dataframe, read_bytes, UPLOAD_TYPES
+from pca_analyzer import standardize_data, compute_pca, get_variance_metrics, truncate_pca
+from scatter_data import (select_scatter_mode, stratified_sample, bin_density,
+                          SCATTER_MODES, DEFAULT_BINS)
+from profiling import Profiler
+from bootstrap import bootstrap_variance, DEFAULT_RESAMPLES
+from progressive import (sample_schedule, sample_order, fit_sample, align_signs, variance_change,
+                         CONVERGENCE_TOLERANCE)
 
 
 st.set_page_config(
@@ -36,11 +43,68 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def create_interactive_variance_bar(explained_variance_ratio, n_components_to_show):
+def file_content_hash(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_uploaded_file(file_hash, _file_bytes, filename):
+    return read_bytes(_file_bytes, filename)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def prepare_uploaded(file_hash, _df):
+    numeric_df, label_col, original_df = prepare_data_from_dataframe(_df)
+    return numeric_df, label_col
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def standardize_uploaded(file_hash, _numeric_df):
+    return standardize_data(_numeric_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def fit_full_pca(file_hash, _standardized_data):
+    return compute_pca(_standardized_data)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def fit_sample_pca(file_hash, n_rows, _numeric_df):
+    rows = np.sort(sample_order(len(_numeric_df))[:n_rows])
+    _, pca, transformed_data, standardized_data = fit_sample(_numeric_df, rows)
+    return pca, transformed_data, standardized_data, rows
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def bootstrap_uploaded(file_hash, n_rows, n_resamples, confidence, _standardized_data):
+    return bootstrap_variance(_standardized_data, n_resamples, confidence)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def transformed_to_csv(file_hash, n_components, _transformed_data, label_col, _labels):
+    transformed_df = pd.DataFrame(
+        _transformed_data,
+        columns=[f'PC{i+1}' for i in range(_transformed_data.shape[1])]
+    )
+    
+    if label_col:
+        transformed_df[label_col] = _labels
+    
+    return transformed_df.to_csv(index=False)
+
+
+def create_interactive_variance_bar(explained_variance_ratio, n_components_to_show, interval=None):
     components_to_show = min(n_components_to_show, len(explained_variance_ratio))
     variance_to_show = explained_variance_ratio[:components_to_show]
     component_numbers = list(range(1, components_to_show + 1))
     
+    error_y = None
+    if interval is not None:
+        low, high = interval[:, :components_to_show] * 100
+        error_y = dict(type='data', symmetric=False, color='dimgray',
+                       array=np.maximum(high - variance_to_show * 100, 0),
+                       arrayminus=np.maximum(variance_to_show * 100 - low, 0))
+    
     fig = go.Figure(data=[
         go.Bar(
             x=component_numbers,
@@ -48,6 +112,7 @@ def create_interactive_variance_bar(explained_variance_ratio, n_components_to_sh
             text=[f'{v*100:.2f}%' for v in variance_to_show],
             textposition='outside',
             marker=dict(color='steelblue', line=dict(color='black', width=1)),
+            error_y=error_y,
             hovertemplate='PC%{x}: %{y:.2f}% variance<extra></extra>'
         )
     ])
@@ -64,13 +129,25 @@ def create_interactive_variance_bar(explained_variance_ratio, n_components_to_sh
     return fig
 
 
-def create_interactive_cumulative_variance(cumulative_variance, n_components_to_show):
+def create_interactive_cumulative_variance(cumulative_variance, n_components_to_show, interval=None):
     components_to_show = min(n_components_to_show, len(cumulative_variance))
     variance_to_show = cumulative_variance[:components_to_show]
     component_numbers = list(range(1, components_to_show + 1))
     
     fig = go.Figure()
     
+    if interval is not None:
+        low, high = interval[:, :components_to_show] * 100
+        fig.add_trace(go.Scatter(
+            x=component_numbers + component_numbers[::-1],
+            y=np.concatenate([high, low[::-1]]),
+            fill='toself',
+            fillcolor='rgba(0, 100, 0, 0.15)',
+            line=dict(width=0),
+            name='Bootstrap Interval',
+            hoverinfo='skip'
+        ))
+    
     fig.add_trace(go.Scatter(
         x=component_numbers,
         y=variance_to_show * 100,
@@ -99,10 +176,62 @@ def create_interactive_cumulative_variance(cumulative_variance, n_components_to_
     return fig
 
 
-def create_interactive_scatter(transformed_data, labels, label_column_name):
+def create_density_scatter(pc1, pc2, labels, label_column_name, bins=DEFAULT_BINS):
+    counts, x_edges, y_edges, unique_labels = bin_density(pc1, pc2, labels, bins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    
+    fig = go.Figure()
+    
+    if labels is None:
+        fig.add_trace(go.Heatmap(
+            x=x_centers, y=y_centers, z=np.log1p(counts[0].T),
+            customdata=counts[0].T,
+            colorscale='Blues', showscale=False,
+            hovertemplate='PC1: %{x:.3f}<br>PC2: %{y:.3f}<br>Points: %{customdata}<extra></extra>'
+        ))
+    else:
+        log_max = np.log1p(counts.max())
+        palette = px.colors.qualitative.Plotly
+        for i, label in enumerate(unique_labels):
+            x_idx, y_idx = np.nonzero(counts[i])
+            label_counts = counts[i][x_idx, y_idx]
+            fig.add_trace(go.Scattergl(
+                x=x_centers[x_idx], y=y_centers[y_idx],
+                mode='markers', name=str(label),
+                customdata=label_counts,
+                marker=dict(size=4, symbol='square', color=palette[i % len(palette)],
+                            opacity=0.25 + 0.75 * np.log1p(label_counts) / log_max),
+                hovertemplate='PC1: %{x:.3f}<br>PC2: %{y:.3f}<br>Points: %{customdata}<extra>%{fullData.name}</extra>'
+            ))
+        fig.update_layout(legend_title_text=label_column_name if label_column_name else 'Category')
+    
+    fig.update_layout(
+        title='2D Projection: First Two Principal Components (binned density)',
+        xaxis_title='First Principal Component (PC1)',
+        yaxis_title='Second Principal Component (PC2)',
+        width=800, height=600,
+        template='plotly_white'
+    )
+    
+    return fig
+
+
+def create_interactive_scatter(transformed_data, labels, label_column_name, mode='auto', max_points=None):
     pc1 = transformed_data[:, 0]
     pc2 = transformed_data[:, 1]
     
+    if max_points is not None and len(pc1) > max_points:
+        sample = stratified_sample(len(pc1), max_points, labels)
+        pc1, pc2 = pc1[sample], pc2[sample]
+        labels = labels[sample] if labels is not None else None
+    
+    mode = select_scatter_mode(len(pc1), mode)
+    if mode == 'density':
+        return create_density_scatter(pc1, pc2, labels, label_column_name)
+    
+    render_mode = 'webgl' if mode == 'webgl' else 'svg'
+    
     if labels is not None:
         df_plot = pd.DataFrame({
             'PC1': pc1,
@@ -116,7 +245,8 @@ def create_interactive_scatter(transformed_data, labels, label_column_name):
                    'PC2': 'Second Principal Component (PC2)',
                    'Label': label_column_name if label_column_name else 'Category'},
             hover_data={'PC1': ':.3f', 'PC2': ':.3f'},
-            width=800, height=600
+            width=800, height=600,
+            render_mode=render_mode
         )
     else:
         df_plot = pd.DataFrame({'PC1': pc1, 'PC2': pc2})
@@ -126,26 +256,165 @@ def create_interactive_scatter(transformed_data, labels, label_column_name):
             labels={'PC1': 'First Principal Component (PC1)',
                    'PC2': 'Second Principal Component (PC2)'},
             width=800, height=600,
-            color_discrete_sequence=['steelblue']
+            color_discrete_sequence=['steelblue'],
+            render_mode=render_mode
         )
     
-    fig.update_traces(marker=dict(size=8, line=dict(width=1, color='black')))
+    if mode == 'markers':
+        fig.update_traces(marker=dict(size=8, line=dict(width=1, color='black')))
+    else:
+        fig.update_traces(marker=dict(size=3, opacity=0.5, line=dict(width=0)))
     fig.update_layout(template='plotly_white')
     
     return fig
 
 
+def stop_refinement(file_hash, n_rows):
+    st.session_state.setdefault('refinement_stop', {})[file_hash] = n_rows
+
+
+def resume_refinement(file_hash):
+    st.session_state.setdefault('refinement_stop', {}).pop(file_hash, None)
+
+
+def show_refinement_status(file_hash, n_rows, total_rows, change, final, stopped):
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        source = "Full data" if final else "Row sample"
+        st.progress(n_rows / total_rows, text=f"{source}: {n_rows:,} of {total_rows:,} rows")
+    with col2:
+        if change is None:
+            st.metric("Variance Change", "-", help="Largest change of any explained-variance ratio since the previous fit")
+        else:
+            st.metric("Variance Change", f"{change * 100:.2f} pp",
+                      help="Largest change of any explained-variance ratio since the previous fit")
+            if change < CONVERGENCE_TOLERANCE:
+                st.caption(f"Stable (below {CONVERGENCE_TOLERANCE * 100:.1f} pp)")
+            else:
+                st.caption("Still changing")
+    with col3:
+        if final:
+            st.success("Refinement complete")
+        elif stopped:
+            st.button("Resume Refinement", key=f"resume-refinement-{n_rows}",
+                      on_click=resume_refinement, args=(file_hash,))
+        else:
+            st.button("Stop Refinement", key=f"stop-refinement-{n_rows}",
+                      on_click=stop_refinement, args=(file_hash, n_rows))
+
+
+def render_results(file_hash, stage, final, pca, transformed_data, labels, label_col, n_features,
+                   components_to_show, scatter_mode, scatter_max_points, bootstrap, profiler: Profiler):
+    explained_variance_ratio, cumulative_variance = get_variance_metrics(pca)
+    
+    st.markdown("---")
+    st.header("Analysis Results")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Original Features", n_features)
+    with col2:
+        st.metric("Principal Components", pca.n_components_)
+    with col3:
+        idx_80 = next((i for i, v in enumerate(cumulative_variance) if v >= 0.80), None)
+        comps_80 = (idx_80 + 1) if idx_80 is not None else "N/A"
+        st.metric("Components for 80% Variance", comps_80)
+    with col4:
+        idx_95 = next((i for i, v in enumerate(cumulative_variance) if v >= 0.95), None)
+        comps_95 = (idx_95 + 1) if idx_95 is not None else "N/A"
+        st.metric("Components for 95% Variance", comps_95)
+    
+    if bootstrap:
+        low_80, high_80 = bootstrap['count_intervals'][0.80]
+        low_95, high_95 = bootstrap['count_intervals'][0.95]
+        st.caption(f"{bootstrap['confidence']:.0%} bootstrap intervals ({bootstrap['n_resamples']} resamples): "
+                   f"{low_80}-{high_80} components for 80% variance, {low_95}-{high_95} for 95%")
+    
+    with st.expander("Detailed Variance Breakdown"):
+        variance_df = pd.DataFrame({
+            'Component': [f'PC{i+1}' for i in range(len(explained_variance_ratio))],
+            'Explained Variance (%)': [f'{v*100:.2f}%' for v in explained_variance_ratio],
+            'Cumulative Variance (%)': [f'{v*100:.2f}%' for v in cumulative_variance]
+        })
+        if bootstrap:
+            n = len(explained_variance_ratio)
+            for column, interval in (('Explained Variance CI', bootstrap['ratio_interval']),
+                                     ('Cumulative Variance CI', bootstrap['cumulative_interval'])):
+                variance_df[column] = [f'{low*100:.2f}% - {high*100:.2f}%' for low, high in interval[:, :n].T]
+        st.dataframe(variance_df, use_container_width=True, hide_index=True)
+    
+    st.markdown("---")
+    st.header("Visualizations")
+    
+    n_show = components_to_show if components_to_show else pca.n_components_
+    
+    st.subheader("Explained Variance by Component")
+    with profiler.span('variance_plots'):
+        fig_bar = create_interactive_variance_bar(
+            explained_variance_ratio, n_show,
+            interval=bootstrap['ratio_interval'] if bootstrap else None
+        )
+        st.plotly_chart(fig_bar, use_container_width=True, key=f"variance-bar-{stage}")
+        
+        st.subheader("Cumulative Explained Variance")
+        fig_line = create_interactive_cumulative_variance(
+            cumulative_variance, n_show,
+            interval=bootstrap['cumulative_interval'] if bootstrap else None
+        )
+        st.plotly_chart(fig_line, use_container_width=True, key=f"cumulative-variance-{stage}")
+    
+    if transformed_data.shape[1] >= 2:
+        st.subheader("2D Projection (First Two Components)")
+        with profiler.span('scatter_plot', rows=len(transformed_data)):
+            fig_scatter = create_interactive_scatter(
+                transformed_data, labels, label_col,
+                mode=scatter_mode, max_points=scatter_max_points
+            )
+            st.plotly_chart(fig_scatter, use_container_width=True, key=f"scatter-{stage}")
+    else:
+        st.warning("Need at least 2 principal components for scatter plot.")
+    
+    st.markdown("---")
+    st.header("Download Results")
+    
+    if not final:
+        st.caption("Resume refinement to download the projection of every row.")
+        return
+    
+    csv = transformed_to_csv(
+        file_hash, pca.n_components_, transformed_data,
+        label_col, labels
+    )
+    st.download_button(
+        label="Download Transformed Data (CSV)",
+        data=csv,
+        file_name="pca_transformed_data.csv",
+        mime="text/csv",
+        key=f"download-{stage}"
+    )
+
+
+def show_timing_panel(profiler: Profiler):
+    with st.expander("Stage Timings"):
+        timing_df = pd.DataFrame(profiler.spans, columns=['stage', 'rows', 'wall_s', 'cpu_s',
+                                                          'rows_per_s', 'peak_rss_mb', 'rss_growth_mb'])
+        timing_df['rows'] = timing_df['rows'].astype('Int64')
+        timing_df.columns = ['Stage', 'Rows', 'Wall (s)', 'CPU (s)', 'Rows/s', 'Peak RSS (MB)', 'RSS Growth (MB)']
+        st.dataframe(timing_df, use_container_width=True, hide_index=True)
+        st.caption("Cached stages show the cost of the cache lookup, not of the original computation.")
+
+
 def main():
     st.markdown('<div class="main-header">PCA Dashboard</div>', unsafe_allow_html=True)
-    st.markdown("Upload a CSV file to perform Principal Component Analysis (PCA) on your data.")
+    st.markdown("Upload a CSV, Parquet, Feather/Arrow or .npy file to perform Principal Component Analysis (PCA) on your data.")
     
     with st.sidebar:
         st.header("Data Input")
         
         uploaded_file = st.file_uploader(
-            "Choose a CSV file",
-            type=['csv'],
-            help="Upload a CSV file with numeric features. Optionally include categorical columns for labeling."
+            "Choose a data file",
+            type=UPLOAD_TYPES,
+            help="Upload a CSV, Parquet, Feather/Arrow or .npy file with numeric features. Optionally include categorical columns for labeling."
         )
         
         st.caption("Tip: Use `data/sample_data.csv` to try with sample data")
@@ -173,11 +442,42 @@ def main():
             if components_to_show == 0:
                 components_to_show = None
             
+            scatter_mode = st.selectbox(
+                "Scatter Rendering",
+                SCATTER_MODES,
+                help="auto picks individual markers, WebGL markers or binned density from the row count"
+            )
+            
+            scatter_max_points = st.number_input(
+                "Max Points in Scatter",
+                min_value=1,
+                value=None,
+                help="Sample at most this many points per label-stratified draw, keeping rare categories (leave empty for all)"
+            )
+            
+            show_intervals = st.checkbox(
+                "Bootstrap Confidence Intervals",
+                value=False,
+                help="Estimate 95% intervals for each variance ratio and the 80%/95% component counts"
+            )
+            
+            n_resamples = st.number_input(
+                "Bootstrap Resamples",
+                min_value=2,
+                value=DEFAULT_RESAMPLES,
+                disabled=not show_intervals
+            )
+            
             st.markdown("---")
     
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
+            profiler = Profiler()
+            file_bytes = uploaded_file.getvalue()
+            with profiler.span('load') as span:
+                file_hash = file_content_hash(file_bytes)
+                df = load_uploaded_file(file_hash, file_bytes, uploaded_file.name)
+                span['rows'] = len(df)
             
             with st.expander("Data Preview", expanded=True):
                 col1, col2, col3 = st.columns(3)
@@ -192,85 +492,63 @@ def main():
                 st.dataframe(df.head(10), use_container_width=True)
             
             try:
-                numeric_df, label_col, original_df = prepare_data_from_dataframe(df)
+                with profiler.span('prepare', rows=len(df)):
+                    numeric_df, label_col = prepare_uploaded(file_hash, df)
                 
                 if label_col:
                     st.info(f"Label column detected: **{label_col}** (will be used for coloring points)")
                 
-                with st.spinner("Performing PCA analysis..."):
-                    standardized_data = standardize_data(numeric_df)
-                    
-                    n_components = max_components if max_components else None
-                    pca, transformed_data = compute_pca(standardized_data, n_components)
-                    
-                    explained_variance_ratio, cumulative_variance = get_variance_metrics(pca)
-                
-                st.markdown("---")
-                st.header("Analysis Results")
-                
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Original Features", len(numeric_df.columns))
-                with col2:
-                    st.metric("Principal Components", pca.n_components_)
-                with col3:
-                    idx_80 = next((i for i, v in enumerate(cumulative_variance) if v >= 0.80), None)
-                    comps_80 = (idx_80 + 1) if idx_80 is not None else "N/A"
-                    st.metric("Components for 80% Variance", comps_80)
-                with col4:
-                    idx_95 = next((i for i, v in enumerate(cumulative_variance) if v >= 0.95), None)
-                    comps_95 = (idx_95 + 1) if idx_95 is not None else "N/A"
-                    st.metric("Components for 95% Variance", comps_95)
-                
-                with st.expander("Detailed Variance Breakdown"):
-                    variance_df = pd.DataFrame({
-                        'Component': [f'PC{i+1}' for i in range(len(explained_variance_ratio))],
-                        'Explained Variance (%)': [f'{v*100:.2f}%' for v in explained_variance_ratio],
-                        'Cumulative Variance (%)': [f'{v*100:.2f}%' for v in cumulative_variance]
-                    })
-                    st.dataframe(variance_df, use_container_width=True, hide_index=True)
-                
-                st.markdown("---")
-                st.header("Visualizations")
+                labels_array = df[label_col].values if label_col else None
+                n_components = max_components if max_components else None
+                schedule = sample_schedule(len(df))
+                stop_size = st.session_state.setdefault('refinement_stop', {}).get(file_hash)
                 
-                n_show = components_to_show if components_to_show else pca.n_components_
+                status_area = st.empty()
+                results_area = st.empty()
+                previous_ratio, reference = None, None
                 
-                st.subheader("Explained Variance by Component")
-                fig_bar = create_interactive_variance_bar(explained_variance_ratio, n_show)
-                st.plotly_chart(fig_bar, use_container_width=True)
-                
-                st.subheader("Cumulative Explained Variance")
-                fig_line = create_interactive_cumulative_variance(cumulative_variance, n_show)
-                st.plotly_chart(fig_line, use_container_width=True)
-                
-                if transformed_data.shape[1] >= 2:
-                    st.subheader("2D Projection (First Two Components)")
-                    labels_array = original_df[label_col].values if label_col else None
-                    fig_scatter = create_interactive_scatter(
-                        transformed_data, labels_array, label_col
-                    )
-                    st.plotly_chart(fig_scatter, use_container_width=True)
-                else:
-                    st.warning("Need at least 2 principal components for scatter plot.")
-                
-                st.markdown("---")
-                st.header("Download Results")
-                
-                transformed_df = pd.DataFrame(
-                    transformed_data,
-                    columns=[f'PC{i+1}' for i in range(transformed_data.shape[1])]
-                )
-                
-                if label_col:
-                    transformed_df[label_col] = original_df[label_col].values
+                for size in schedule:
+                    final = size == len(df)
+                    if final:
+                        with profiler.span('standardize', rows=len(df)):
+                            standardized_data = standardize_uploaded(file_hash, numeric_df)
+                        with st.spinner("Performing PCA analysis..."), profiler.span('pca', rows=len(df)):
+                            full_pca, full_transformed_data = fit_full_pca(file_hash, standardized_data)
+                        labels = labels_array
+                    else:
+                        with profiler.span('pca_sample', rows=size):
+                            full_pca, full_transformed_data, standardized_data, rows = fit_sample_pca(
+                                file_hash, size, numeric_df
+                            )
+                        labels = labels_array[rows] if label_col else None
+                    
+                    pca = truncate_pca(full_pca, n_components)
+                    pca, transformed_data = align_signs(pca, full_transformed_data[:, :pca.n_components_], reference)
+                    change = variance_change(previous_ratio, pca.explained_variance_ratio_)
+                    previous_ratio, reference = pca.explained_variance_ratio_, pca.components_
+                    
+                    last = final or (stop_size is not None and size >= stop_size)
+                    if not last and stop_size is not None:
+                        continue
+                    
+                    bootstrap = None
+                    if show_intervals and last:
+                        with st.spinner("Bootstrapping explained variance..."), profiler.span('bootstrap', rows=size):
+                            bootstrap = bootstrap_uploaded(file_hash, size, int(n_resamples), 0.95, standardized_data)
+                    
+                    if len(schedule) > 1:
+                        with status_area.container():
+                            show_refinement_status(file_hash, size, len(df), change, final, stopped=last and not final)
+                    
+                    with results_area.container():
+                        render_results(file_hash, size, final, pca, transformed_data, labels, label_col,
+                                       len(numeric_df.columns), components_to_show, scatter_mode,
+                                       scatter_max_points, bootstrap, profiler)
+                    
+                    if last:
+                        break
                 
-                csv = transformed_df.to_csv(index=False)
-                st.download_button(
-                    label="Download Transformed Data (CSV)",
-                    data=csv,
-                    file_name="pca_transformed_data.csv",
-                    mime="text/csv"
-                )
+                show_timing_panel(profiler)
                 
             except ValueError as e:
                 st.error(f"Error: {str(e)}")
@@ -281,10 +559,10 @@ def main():
         
         except Exception as e:
             st.error(f"Error loading file: {str(e)}")
-            st.info("Please make sure you've uploaded a valid CSV file.")
+            st.info("Please make sure you've uploaded a valid CSV, Parquet, Feather/Arrow or .npy file.")
     
     else:
-        st.info("Please upload a CSV file using the sidebar to get started.")
+        st.info("Please upload a data file using the sidebar to get started.")
         
         with st.expander("How to use this dashboard"):
             st.markdown("""